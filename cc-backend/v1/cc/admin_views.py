@@ -1,9 +1,14 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse
-from .models import Team, Player, Event, CustomEvent, Season
+from django.http import FileResponse, StreamingHttpResponse
+from PIL import UnidentifiedImageError
+from .models import Team, Player, Event, CustomEvent, Season, Job
+from . import http_client
+from .image_cache import VARIANT_FORMATS, ImageTooLarge, get_image_cache
 from .middleware import firebase_auth_required
+from .public_cache import cache_stats
+from .jobs import cancel_job, serialize_job
 import logging
 import requests
 from decimal import Decimal
@@ -12,6 +17,9 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Largest width/height the image proxy will resize to
+MAX_IMAGE_PROXY_SIZE = 2048
+
 
 @api_view(["PUT"])
 @firebase_auth_required(min_role="admin")
@@ -33,6 +41,9 @@ def update_team(request, team_id):
             picture_url = request.data["picture"]
             if picture_url and "&token=" in picture_url:
                 picture_url = picture_url.split("&token=")[0]
+            if picture_url != team.picture:
+                # Variants belong to the previously uploaded picture
+                team.picture_variants = {}
             team.picture = picture_url
 
         team.save()
@@ -111,6 +122,9 @@ def update_player(request, player_id):
             picture_url = request.data["picture"]
             if picture_url and "&token=" in picture_url:
                 picture_url = picture_url.split("&token=")[0]
+            if picture_url != player.picture:
+                # Variants belong to the previously uploaded picture
+                player.picture_variants = {}
             player.picture = picture_url
 
         player.save()
@@ -152,10 +166,30 @@ def update_player(request, player_id):
         )
 
 
+def parse_image_size(value):
+    """Parse a w/h query parameter; None if absent, ValueError if invalid."""
+    if value in (None, ""):
+        return None
+    size = int(value)
+    if not 1 <= size <= MAX_IMAGE_PROXY_SIZE:
+        raise ValueError(f"size must be between 1 and {MAX_IMAGE_PROXY_SIZE}")
+    return size
+
+
 @api_view(["GET"])
 def proxy_image(request):
     """
     Proxy external images to avoid CORS issues in screenshot generation
+
+    Query parameters:
+        url: image to fetch (required)
+        w, h: optional bounding box to resize into, keeping the aspect ratio
+        format: "webp" (default) or "png" for resized variants
+
+    Originals are streamed through and kept in the on-disk image cache
+    (cc.image_cache); cached copies are revalidated with the origin after
+    IMAGE_PROXY_REVALIDATE_SECONDS, and served as-is while the origin is failing.
+    X-Cache reports HIT, MISS, REVALIDATED or STALE.
     """
     image_url = request.GET.get("url")
 
@@ -165,32 +199,76 @@ def proxy_image(request):
         )
 
     try:
-        # Set headers to match browser requests for better compatibility
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:144.0) Gecko/20100101 Firefox/144.0",
-            "Accept": "image/avif,image/webp,image/png,image/svg+xml,image/*;q=0.8,*/*;q=0.5",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Referer": request.META.get("HTTP_REFERER", "http://localhost:5173/"),
-        }
-
-        # Fetch the image
-        response = requests.get(image_url, headers=headers, timeout=10, stream=True)
-        response.raise_for_status()
+        width = parse_image_size(request.GET.get("w"))
+        height = parse_image_size(request.GET.get("h"))
+    except ValueError as e:
+        return Response(
+            {"error": f"Invalid w/h parameter: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    image_format = request.GET.get("format", "webp").lower()
+    if image_format not in VARIANT_FORMATS:
+        return Response(
+            {"error": "format must be webp or png"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    resize = width is not None or height is not None
 
-        # Create HTTP response with the image data
-        content_type = response.headers.get("Content-Type", "image/jpeg")
-        django_response = HttpResponse(response.content, content_type=content_type)
+    try:
+        cache = get_image_cache()
+        meta = cache.lookup(image_url)
+        cache_state = "HIT"
+
+        if meta is None or not cache.is_fresh(meta):
+            # Set headers to match browser requests for better compatibility
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:144.0) Gecko/20100101 Firefox/144.0",
+                "Accept": "image/avif,image/webp,image/png,image/svg+xml,image/*;q=0.8,*/*;q=0.5",
+                "Accept-Language": "en-US,en;q=0.5",
+                "Referer": request.META.get("HTTP_REFERER", "http://localhost:5173/"),
+            }
+            if meta is not None:
+                headers.update(cache.validators(meta))
 
-        # Add CORS headers to allow frontend access
-        django_response["Access-Control-Allow-Origin"] = "*"
-        django_response["Access-Control-Allow-Methods"] = "GET"
-        django_response["Access-Control-Allow-Headers"] = "*"
+            # Fetch the image
+            try:
+                response = http_client.get(
+                    image_url, headers=headers, timeout=10, stream=True
+                )
+                if not (meta is not None and response.status_code == 304):
+                    response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                if meta is None:
+                    raise
+                # Keep serving the cached copy while the origin is failing
+                logger.warning(f"Serving cached image for {image_url}: {str(e)}")
+                response = None
+                cache_state = "STALE"
+
+            if response is not None and response.status_code == 304:
+                response.close()
+                cache.mark_checked(image_url, meta)
+                cache_state = "REVALIDATED"
+            elif response is not None:
+                cache_state = "MISS"
+                cache.check_size(response)
+                if not resize:
+                    # Pass the bytes through while they are written to disk
+                    content_type = response.headers.get("Content-Type", "image/jpeg")
+                    django_response = StreamingHttpResponse(
+                        cache.stream_and_store(image_url, response),
+                        content_type=content_type,
+                    )
+                    return image_proxy_headers(django_response, cache_state)
+                meta = cache.store(image_url, response)
 
-        # Cache headers for better performance
-        django_response["Cache-Control"] = "public, max-age=3600"
+        if resize:
+            path, content_type = cache.variant(meta, width, height, image_format)
+        else:
+            path, content_type = cache.body_path(meta), meta["content_type"]
 
-        return django_response
+        django_response = FileResponse(open(path, "rb"), content_type=content_type)
+        return image_proxy_headers(django_response, cache_state)
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching image from {image_url}: {str(e)}")
@@ -198,6 +276,17 @@ def proxy_image(request):
             {"error": f"Failed to fetch image: {str(e)}"},
             status=status.HTTP_502_BAD_GATEWAY,
         )
+    except ImageTooLarge as e:
+        logger.warning(f"Refusing image from {image_url}: {str(e)}")
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+    except UnidentifiedImageError:
+        return Response(
+            {"error": "Image cannot be resized"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
     except Exception as e:
         logger.error(f"Unexpected error in proxy_image: {str(e)}")
         return Response(
@@ -206,6 +295,19 @@ def proxy_image(request):
         )
 
 
+def image_proxy_headers(django_response, cache_state):
+    # Add CORS headers to allow frontend access
+    django_response["Access-Control-Allow-Origin"] = "*"
+    django_response["Access-Control-Allow-Methods"] = "GET"
+    django_response["Access-Control-Allow-Headers"] = "*"
+
+    # Cache headers for better performance
+    django_response["Cache-Control"] = "public, max-age=3600"
+    django_response["X-Cache"] = cache_state
+
+    return django_response
+
+
 @api_view(["GET", "POST"])
 @firebase_auth_required(min_role="admin")
 def custom_events(request):
@@ -672,7 +774,7 @@ def import_team_from_faceit(request):
         headers = {"Authorization": f"Bearer {api_key}"}
         team_url_api = f"https://open.faceit.com/data/v4/teams/{team_id}"
 
-        response = requests.get(team_url_api, headers=headers)
+        response = http_client.get(team_url_api, headers=headers)
 
         if response.status_code != 200:
             return Response(
@@ -742,7 +844,7 @@ def import_team_from_faceit(request):
             # Fetch player details from Faceit API
             try:
                 player_url = f"https://open.faceit.com/data/v4/players/{player_id}"
-                player_response = requests.get(player_url, headers=headers)
+                player_response = http_client.get(player_url, headers=headers)
 
                 if player_response.status_code == 200:
                     player_data = player_response.json()
@@ -853,3 +955,125 @@ def create_competition(request):
             {"error": f"Failed to create competition: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@api_view(["GET"])
+@firebase_auth_required(min_role="admin")
+def public_cache_stats(request):
+    """
+    Get hit/miss counters for the public API response cache
+    """
+    try:
+        return Response(cache_stats())
+
+    except Exception as e:
+        logger.error(f"Error getting public cache stats: {str(e)}")
+        return Response(
+            {"error": f"Failed to get public cache stats: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@firebase_auth_required(min_role="admin")
+def outbound_http_stats(request):
+    """
+    Get per-host request counts, latency and circuit state for outbound calls
+    made by this worker process
+    """
+    try:
+        return Response(http_client.get_client().stats())
+
+    except Exception as e:
+        logger.error(f"Error getting outbound HTTP stats: {str(e)}")
+        return Response(
+            {"error": f"Failed to get outbound HTTP stats: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@firebase_auth_required(min_role="admin")
+def list_jobs(request):
+    """
+    List background jobs, newest first
+
+    Query parameters:
+    - status: Optional - filter by status (queued, running, succeeded, ...)
+    - kind: Optional - filter by job kind (import_matches, update_matches, ...)
+    - limit: Optional - maximum number of jobs to return (default 50)
+    """
+    try:
+        jobs = Job.objects.order_by("-created_at")
+
+        if request.query_params.get("status"):
+            jobs = jobs.filter(status=request.query_params["status"])
+        if request.query_params.get("kind"):
+            jobs = jobs.filter(kind=request.query_params["kind"])
+
+        try:
+            limit = min(int(request.query_params.get("limit", 50)), 200)
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {"jobs": [serialize_job(job, include_result=False) for job in jobs[:limit]]}
+        )
+
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        return Response(
+            {"error": f"Failed to list jobs: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@firebase_auth_required(min_role="admin")
+def job_detail(request, job_id):
+    """
+    Get the status, progress and result of a background job
+    """
+    try:
+        job = Job.objects.get(id=job_id)
+        return Response(serialize_job(job))
+
+    except Job.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {str(e)}")
+        return Response(
+            {"error": f"Failed to get job: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["POST"])
+@firebase_auth_required(min_role="admin")
+def cancel_job_view(request, job_id):
+    """
+    Cancel a background job. Queued jobs are cancelled immediately; running
+    jobs stop at their next progress update.
+    """
+    try:
+        job = Job.objects.get(id=job_id)
+
+        if not cancel_job(job):
+            return Response(
+                {"error": f"Job already {job.status}"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(serialize_job(job, include_result=False))
+
+    except Job.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {str(e)}")
+        return Response(
+            {"error": f"Failed to cancel job: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
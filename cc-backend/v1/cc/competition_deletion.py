@@ -0,0 +1,111 @@
+"""
+Set-based deletion of a competition.
+
+plan_competition_deletion lists, in a safe order (rows before the rows they
+reference), one queryset per table holding exactly the rows that deleting
+the competition removes:
+
+- event matches and Elo history of the competition's matches
+- events made up only of the competition's matches, with their custom event
+  pages (events of the same season that also hold other competitions'
+  matches are kept)
+- the competition's matches and participants, and the competition
+
+preview_deletion counts each with one aggregate query. purge_competition
+executes them in one transaction as plain DELETE ... WHERE statements, so
+nothing is loaded into memory however large the competition is. Model
+signals do not fire for raw deletes, so the affected public cache tags are
+invalidated explicitly, and team ratings are replayed from the earliest
+deleted rated match once the deletion commits, starting from the ratings the
+teams had just before it (captured first, as their history is deleted too).
+"""
+
+import logging
+
+from django.db import models, transaction
+
+from .elo import replay_from, restore_ratings
+from .models import (
+    Competition,
+    CustomEvent,
+    EloHistory,
+    Event,
+    EventMatch,
+    Match,
+    Participant,
+)
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+
+def _replay_after_commit(since, team_ids, base_ratings):
+    try:
+        replay_from(since=since, team_ids=team_ids, base_ratings=base_ratings)
+    except Exception as e:
+        logger.error(f"Error replaying ELOs after deleting a competition: {str(e)}")
+
+
+def plan_competition_deletion(competition):
+    """Ordered [(name, queryset)] of the rows deleting competition removes."""
+    matches = Match.objects.filter(competition=competition)
+    # Events with a match of another competition (or none) are left alone
+    shared_events = EventMatch.objects.exclude(
+        match__competition=competition
+    ).values("event_id")
+    event_ids = list(
+        Event.objects.filter(event_matches__match__competition=competition)
+        .exclude(id__in=shared_events)
+        .values_list("id", flat=True)
+        .distinct()
+    )
+
+    return [
+        ("custom_events", CustomEvent.objects.filter(event_id__in=event_ids)),
+        ("event_matches", EventMatch.objects.filter(match__in=matches)),
+        ("elo_history", EloHistory.objects.filter(match__in=matches)),
+        ("events", Event.objects.filter(id__in=event_ids)),
+        ("matches", matches),
+        ("participants", Participant.objects.filter(competition=competition)),
+        ("competition", Competition.objects.filter(id=competition.id)),
+    ]
+
+
+def preview_deletion(plan):
+    """Rows that executing plan would delete, per table."""
+    return {name: queryset.count() for name, queryset in plan}
+
+
+def purge_competition(competition):
+    """
+    Delete a competition and everything scoped to it.
+
+    Returns the number of rows deleted per table.
+    """
+    with transaction.atomic():
+        plan = plan_competition_deletion(competition)
+
+        rated = EloHistory.objects.filter(match__competition=competition)
+        since = rated.aggregate(since=models.Min("match_date"))["since"]
+        team_ids = set(rated.values_list("team_id", flat=True))
+        base_ratings = None
+        if since is not None:
+            base_ratings, _ = restore_ratings(team_ids, since)
+
+        deleted = {}
+        for name, queryset in plan:
+            # _raw_delete issues a single DELETE without collecting related
+            # objects or sending signals; the plan already covers the
+            # related rows
+            deleted[name] = queryset._raw_delete(queryset.db)
+
+        invalidate_models(
+            CustomEvent, EventMatch, Event, Match, Participant, Competition
+        )
+        if since is not None:
+            transaction.on_commit(
+                lambda: _replay_after_commit(since, team_ids, base_ratings)
+            )
+
+    logger.info(f"Deleted competition {competition.name}: {deleted}")
+    return deleted
@@ -0,0 +1,174 @@
+"""
+Duplicate team detection for the merge page.
+
+Duplicates come from platforms spelling the same school differently, so
+exact name lookups create a second team. Candidate pairs are found from two
+signals, each blocked through an inverted index so that teams are only
+compared with teams they share something with:
+
+- names: character-trigram similarity of team names (TrigramIndex), and
+  separately of school names
+- rosters: players of the two teams that look like the same person
+
+A player row belongs to a single team and platform ids are unique, so the
+same person on two teams shows up as two rows that share a Steam id, a
+Faceit id (a cached Faceit lookup links a Steam id to its Faceit id) or a
+name. Identities shared by more than MAX_IDENTITY_TEAMS teams (common names)
+are ignored.
+
+The signals are combined as independent evidence:
+score = 1 - (1 - name) * (1 - SCHOOL_WEIGHT * school) * (1 - roster).
+A matching school name alone is weak evidence, since a school can field
+several teams.
+"""
+
+from collections import defaultdict
+
+from .models import FaceitPlayerCache, Player, Team
+from .similarity import TrigramIndex, jaccard, trigrams
+
+SCHOOL_WEIGHT = 0.5
+MAX_IDENTITY_TEAMS = 10
+MIN_ROSTER_OVERLAP = 0.4
+
+
+def ordered_pair(a, b):
+    return (a, b) if str(a) <= str(b) else (b, a)
+
+
+def player_identities(player, faceit_by_steam):
+    identities = set()
+    if player["steam_id"]:
+        identities.add(("steam", player["steam_id"]))
+        faceit_id = faceit_by_steam.get(player["steam_id"])
+        if faceit_id:
+            identities.add(("faceit", faceit_id))
+    if player["faceit_id"]:
+        identities.add(("faceit", player["faceit_id"]))
+    name = player["name"].strip().lower()
+    if name:
+        identities.add(("name", name))
+    return identities
+
+
+def roster_overlaps(players, roster_sizes):
+    """
+    Share of the smaller roster found on the other team, for every pair of
+    teams with a player in common, as {(team_a, team_b): overlap}.
+    """
+    faceit_by_steam = dict(
+        FaceitPlayerCache.objects.filter(data__isnull=False).values_list(
+            "game_player_id", "data__player_id"
+        )
+    )
+
+    teams_by_identity = defaultdict(set)
+    player_keys = []
+    for player in players:
+        identities = player_identities(player, faceit_by_steam)
+        player_keys.append((player["team_id"], identities))
+        for identity in identities:
+            teams_by_identity[identity].add(player["team_id"])
+
+    # (team, other team) -> players of team that also play for other team
+    shared = defaultdict(int)
+    for team_id, identities in player_keys:
+        others = set()
+        for identity in identities:
+            teams = teams_by_identity[identity]
+            if len(teams) <= MAX_IDENTITY_TEAMS:
+                others |= teams
+        others.discard(team_id)
+        for other_id in others:
+            shared[(team_id, other_id)] += 1
+
+    overlaps = {}
+    for (team_id, other_id), count in shared.items():
+        pair = ordered_pair(team_id, other_id)
+        if pair in overlaps:
+            continue
+        # A player can match several rows on the other team; count each side
+        count = min(count, shared.get((other_id, team_id), 0))
+        smaller = min(roster_sizes[team_id], roster_sizes[other_id])
+        overlaps[pair] = count / smaller
+    return overlaps
+
+
+def find_duplicate_teams(min_score=0.6, limit=50):
+    """
+    Ranked list of likely duplicate team pairs.
+
+    Each item has both teams (the one with the larger roster first, as the
+    suggested team to keep), the combined score and the per-signal scores.
+    """
+    teams = {
+        team["id"]: team
+        for team in Team.objects.values("id", "name", "school_name", "elo")
+    }
+    players = list(
+        Player.objects.filter(team__isnull=False).values(
+            "team_id", "name", "steam_id", "faceit_id"
+        )
+    )
+    roster_sizes = defaultdict(int)
+    for player in players:
+        roster_sizes[player["team_id"]] += 1
+
+    names = TrigramIndex()
+    schools = TrigramIndex()
+    for team in teams.values():
+        names.add(team["id"], team["name"])
+        if team["school_name"]:
+            schools.add(team["id"], team["school_name"])
+    name_scores = names.similar_pairs(min_score)
+    school_scores = schools.similar_pairs(min_score)
+    roster_scores = {
+        pair: overlap
+        for pair, overlap in roster_overlaps(players, roster_sizes).items()
+        if overlap >= MIN_ROSTER_OVERLAP
+    }
+
+    candidates = []
+    for pair in set(name_scores) | set(school_scores) | set(roster_scores):
+        name_score = name_scores.get(pair)
+        if name_score is None:
+            # Below min_score on its own, but it can add up with the others
+            name_score = jaccard(
+                trigrams(teams[pair[0]]["name"]), trigrams(teams[pair[1]]["name"])
+            )
+        school_score = school_scores.get(pair, 0.0)
+        roster_score = roster_scores.get(pair, 0.0)
+        score = 1 - (
+            (1 - name_score)
+            * (1 - SCHOOL_WEIGHT * school_score)
+            * (1 - roster_score)
+        )
+        if score < min_score:
+            continue
+
+        primary, secondary = sorted(
+            pair, key=lambda team_id: (-roster_sizes[team_id], str(team_id))
+        )
+        candidates.append(
+            {
+                "primary_team": dict(
+                    teams[primary], player_count=roster_sizes[primary]
+                ),
+                "secondary_team": dict(
+                    teams[secondary], player_count=roster_sizes[secondary]
+                ),
+                "score": round(score, 3),
+                "name_score": round(name_score, 3),
+                "school_score": round(school_score, 3),
+                "roster_score": round(roster_score, 3),
+            }
+        )
+
+    candidates.sort(
+        key=lambda item: (
+            -item["score"],
+            str(item["primary_team"]["id"]),
+            str(item["secondary_team"]["id"]),
+        )
+    )
+    return candidates[:limit]
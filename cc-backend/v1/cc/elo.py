@@ -0,0 +1,494 @@
+"""
+Team Elo calculation and in-memory replay over completed matches.
+
+A replay loads the rated matches as plain tuples with a single query, applies
+calculate_new_elo over a dict of ratings keyed by team id, and writes the final
+ratings back with one bulk_update. No model instances are loaded per match.
+
+Every rated match leaves two EloHistory rows. replay_from uses them to restart
+from the earliest affected match instead of replaying the whole database, and
+sync_match_rating uses them to keep ratings current as single matches change.
+Restarting is only sound when every rated match of the affected teams has its
+history (matches rated before EloHistory existed have none); otherwise
+replay_from falls back to a full replay from the default rating, which also
+backfills the missing history.
+"""
+
+import logging
+
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Q, Subquery
+
+from .jobs import report_progress
+from .models import EloHistory, Match, Team
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_new_elo(current_elo, opponent_elo, result):
+    """
+    Calculate new ELO rating after a match.
+
+    Args:
+        current_elo (int): Current ELO of the team
+        opponent_elo (int): ELO of the opponent team
+        result (float): Match result (1.0 for win, 0.0 for loss, 0.5 for draw)
+
+    Returns:
+        int: New ELO rating
+    """
+    k = 150  # K-factor, determines the maximum possible adjustment per game
+    expected_score = 1 / (1 + 10 ** ((opponent_elo - current_elo) / 800))
+    new_elo = current_elo + k * (result - expected_score)
+    return round(new_elo)
+
+
+def rated_matches():
+    """
+    Queryset of matches that affect Elo, in replay order.
+
+    Completed matches with a winner, excluding byes. Ties on date are broken by
+    id so every replay processes matches in the same order.
+    """
+    return (
+        Match.objects.filter(status="completed", winner__isnull=False)
+        .exclude(
+            models.Q(team1__name__iexact="bye") | models.Q(team2__name__iexact="bye")
+        )
+        .order_by("date", "id")
+    )
+
+
+def match_rows(queryset):
+    """Load (id, date, team1_id, team2_id, winner_id) tuples in one query."""
+    return list(queryset.values_list("id", "date", "team1_id", "team2_id", "winner_id"))
+
+
+def replay_matches(rows, ratings):
+    """
+    Replay match rows over ratings (team id -> elo), updating it in place.
+
+    Rows whose winner is neither team are skipped. Returns one
+    (row, team1_before, team1_after, team2_before, team2_after) tuple per rated
+    match.
+    """
+    applied = []
+    for row in rows:
+        _, _, team1_id, team2_id, winner_id = row
+
+        if winner_id == team1_id:
+            team1_result = 1.0
+        elif winner_id == team2_id:
+            team1_result = 0.0
+        else:
+            continue
+
+        team1_elo = ratings[team1_id]
+        team2_elo = ratings[team2_id]
+        new_team1_elo = calculate_new_elo(team1_elo, team2_elo, team1_result)
+        new_team2_elo = calculate_new_elo(team2_elo, team1_elo, 1.0 - team1_result)
+        ratings[team1_id] = new_team1_elo
+        ratings[team2_id] = new_team2_elo
+
+        applied.append((row, team1_elo, new_team1_elo, team2_elo, new_team2_elo))
+
+    return applied
+
+
+def save_ratings(ratings, previous):
+    """
+    Write ratings that differ from previous with a single bulk_update.
+
+    Returns the number of teams updated.
+    """
+    changed = [
+        Team(id=team_id, elo=elo)
+        for team_id, elo in ratings.items()
+        if previous.get(team_id) != elo
+    ]
+    if not changed:
+        return 0
+
+    with transaction.atomic():
+        Team.objects.bulk_update(changed, ["elo"], batch_size=500)
+        invalidate_models(Team)
+
+    return len(changed)
+
+
+def history_rows(applied):
+    """EloHistory instances for the output of replay_matches."""
+    history = []
+    for row, team1_before, team1_after, team2_before, team2_after in applied:
+        match_id, date, team1_id, team2_id, _ = row
+        history.append(
+            EloHistory(
+                match_id=match_id,
+                team_id=team1_id,
+                match_date=date,
+                elo_before=team1_before,
+                elo_after=team1_after,
+            )
+        )
+        history.append(
+            EloHistory(
+                match_id=match_id,
+                team_id=team2_id,
+                match_date=date,
+                elo_before=team2_before,
+                elo_after=team2_after,
+            )
+        )
+    return history
+
+
+def replay_all(default_elo=None):
+    """
+    Replay every rated match and rebuild EloHistory, in one transaction.
+
+    Teams start from default_elo, or from their current rating when it is
+    None. Returns (rows, applied, teams_updated).
+    """
+    previous = dict(Team.objects.values_list("id", "elo"))
+    if default_elo is None:
+        ratings = dict(previous)
+    else:
+        ratings = dict.fromkeys(previous, default_elo)
+
+    rows = match_rows(rated_matches())
+    report_progress(0, len(rows), "Replaying matches")
+    applied = replay_matches(rows, ratings)
+    report_progress(len(rows), len(rows), "Saving ratings")
+
+    with transaction.atomic():
+        EloHistory.objects.all().delete()
+        EloHistory.objects.bulk_create(history_rows(applied), batch_size=500)
+        teams_updated = save_ratings(ratings, previous)
+
+    return rows, applied, teams_updated
+
+
+def history_covers(team_ids, new_match_ids=()):
+    """
+    Whether every rated match of the given teams has its EloHistory rows.
+
+    new_match_ids are matches that were not rated before and so have no
+    history yet; they are left out.
+    """
+    unrecorded = (
+        rated_matches()
+        .filter(Q(team1_id__in=team_ids) | Q(team2_id__in=team_ids))
+        .filter(Q(winner_id=F("team1_id")) | Q(winner_id=F("team2_id")))
+        .exclude(id__in=new_match_ids)
+        .exclude(id__in=EloHistory.objects.values("match_id"))
+    )
+    return not unrecorded.exists()
+
+
+def replay_start(match_ids=(), since=None):
+    """
+    Earliest point a replay has to restart from, or None if nothing is affected.
+
+    Both the current date of each affected match and the date it was last
+    rated at count, so moving or un-completing a match is handled too.
+    """
+    candidates = [since] if since else []
+    if match_ids:
+        candidates += Match.objects.filter(id__in=match_ids).values_list(
+            "date", flat=True
+        )
+        candidates += EloHistory.objects.filter(match_id__in=match_ids).values_list(
+            "match_date", flat=True
+        )
+    return min(candidates) if candidates else None
+
+
+def restore_ratings(team_ids, start, base_ratings=None):
+    """
+    Ratings of the given teams as they were just before start.
+
+    A team's rating is its elo_after from the last history row before start;
+    failing that, its rating in base_ratings (captured by a caller about to
+    delete history rows); failing that, the elo_before of its first row from
+    start on (the rating the last replay started it from); failing that, its
+    current rating. Returns (ratings, current) dicts keyed by team id.
+    """
+    base_ratings = base_ratings or {}
+    before = (
+        EloHistory.objects.filter(team=OuterRef("pk"), match_date__lt=start)
+        .order_by("-match_date", "-match_id")
+        .values("elo_after")[:1]
+    )
+    base = (
+        EloHistory.objects.filter(team=OuterRef("pk"), match_date__gte=start)
+        .order_by("match_date", "match_id")
+        .values("elo_before")[:1]
+    )
+
+    ratings = {}
+    current = {}
+    teams = (
+        Team.objects.select_for_update()
+        .filter(id__in=team_ids)
+        .annotate(elo_before_start=Subquery(before), base_elo=Subquery(base))
+        .values_list("id", "elo", "elo_before_start", "base_elo")
+    )
+    for team_id, elo, elo_before_start, base_elo in teams:
+        current[team_id] = elo
+        if elo_before_start is not None:
+            ratings[team_id] = elo_before_start
+        elif team_id in base_ratings:
+            ratings[team_id] = base_ratings[team_id]
+        elif base_elo is not None:
+            ratings[team_id] = base_elo
+        else:
+            ratings[team_id] = elo
+
+    return ratings, current
+
+
+def replay_from(
+    match_ids=(), since=None, team_ids=(), new_match_ids=(), base_ratings=None
+):
+    """
+    Incrementally replay Elo from the earliest affected match onwards.
+
+    Ratings are restored from EloHistory just before that point, every rated
+    match from there is replayed, and the history rows from that point are
+    replaced, all in one transaction. team_ids names extra teams to restore,
+    e.g. the teams of a deleted match whose history went with it, and
+    new_match_ids the affected matches that were not rated before.
+    base_ratings are the teams' ratings just before since, for callers that
+    delete the history restore_ratings would read them from.
+
+    If an affected team has rated matches without history, its rating before
+    start cannot be restored, so every match is replayed from the default
+    rating instead.
+
+    Returns a summary dict, or None if no match was affected.
+    """
+    start = replay_start(match_ids, since)
+    if start is None:
+        return None
+
+    with transaction.atomic():
+        rows = match_rows(rated_matches().filter(date__gte=start))
+        stale_history = EloHistory.objects.filter(match_date__gte=start)
+
+        # Teams losing history rows (e.g. a match no longer completed) need
+        # their rating restored even if they play no replayed match
+        team_ids = set(team_ids)
+        team_ids.update(stale_history.values_list("team_id", flat=True))
+        for _, _, team1_id, team2_id, _ in rows:
+            team_ids.update((team1_id, team2_id))
+
+        if not history_covers(team_ids, new_match_ids):
+            logger.warning(
+                f"EloHistory is incomplete for the teams replayed from "
+                f"{start.isoformat()}, replaying all matches instead"
+            )
+            rows, applied, teams_updated = replay_all(
+                Team._meta.get_field("elo").get_default()
+            )
+            return {
+                "start": None,
+                "full_replay": True,
+                "total_matches": len(rows),
+                "processed_count": len(applied),
+                "teams_updated": teams_updated,
+            }
+
+        ratings, current = restore_ratings(team_ids, start, base_ratings)
+        applied = replay_matches(rows, ratings)
+
+        stale_history.delete()
+        EloHistory.objects.bulk_create(history_rows(applied), batch_size=500)
+        teams_updated = save_ratings(ratings, current)
+
+    logger.info(
+        f"Replayed {len(applied)} matches from {start.isoformat()}, "
+        f"updated {teams_updated} teams"
+    )
+
+    return {
+        "start": start.isoformat(),
+        "full_replay": False,
+        "total_matches": len(rows),
+        "processed_count": len(applied),
+        "teams_updated": teams_updated,
+    }
+
+
+def update_match_elos(match):
+    """
+    Update team ELOs based on match result.
+    Only updates if the match is completed and has a winner.
+
+    Args:
+        match (Match): The completed match to process
+
+    Returns:
+        bool: True if ELOs were updated, False otherwise
+    """
+    if match.status != "completed" or not match.winner:
+        return False
+
+    # Determine results (1.0 for win, 0.0 for loss)
+    if match.winner_id == match.team1_id:
+        team1_result = 1.0
+        team2_result = 0.0
+    elif match.winner_id == match.team2_id:
+        team1_result = 0.0
+        team2_result = 1.0
+    else:
+        return False
+
+    # Current ELOs from the database: the match's team instances may be stale
+    # when one team finished several matches in the same batch
+    ratings = dict(
+        Team.objects.select_for_update()
+        .filter(id__in=[match.team1_id, match.team2_id])
+        .values_list("id", "elo")
+    )
+    team1_elo = ratings[match.team1_id]
+    team2_elo = ratings[match.team2_id]
+
+    # Calculate new ELOs
+    new_team1_elo = calculate_new_elo(team1_elo, team2_elo, team1_result)
+    new_team2_elo = calculate_new_elo(team2_elo, team1_elo, team2_result)
+
+    # Update only the ratings
+    Team.objects.filter(id=match.team1_id).update(elo=new_team1_elo)
+    Team.objects.filter(id=match.team2_id).update(elo=new_team2_elo)
+    invalidate_models(Team)
+    match.team1.elo = new_team1_elo
+    match.team2.elo = new_team2_elo
+
+    # Record the change so incremental replays can restart from this match
+    EloHistory.objects.filter(match=match).delete()
+    EloHistory.objects.bulk_create(
+        history_rows(
+            [
+                (
+                    (match.id, match.date, match.team1_id, match.team2_id, None),
+                    team1_elo,
+                    new_team1_elo,
+                    team2_elo,
+                    new_team2_elo,
+                )
+            ]
+        )
+    )
+
+    logger.info(
+        f"Updated ELOs for match {match.id}: {match.team1.name} {team1_elo}→{new_team1_elo}, {match.team2.name} {team2_elo}→{new_team2_elo}"
+    )
+
+    return True
+
+
+def rating_state(match):
+    """The fields that decide a match's effect on ratings, before an update."""
+    return (match.status, match.winner_id, match.date)
+
+
+def _is_rated(match):
+    return (
+        match.status == "completed"
+        and match.winner_id in (match.team1_id, match.team2_id)
+        and match.team1.name.lower() != "bye"
+        and match.team2.name.lower() != "bye"
+    )
+
+
+def _replay_after_commit(
+    match_id, since, team_ids=(), new_match_ids=(), base_ratings=None
+):
+    try:
+        replay_from(
+            match_ids=[match_id],
+            since=since,
+            team_ids=team_ids,
+            new_match_ids=new_match_ids,
+            base_ratings=base_ratings,
+        )
+    except Exception as e:
+        logger.error(f"Error replaying ELOs after match {match_id}: {str(e)}")
+
+
+def sync_match_rating(match, previous=None):
+    """
+    Keep team ratings in step after a match was created or saved.
+
+    previous is rating_state(match) from before the change, or None for a new
+    match. A newly rated match that is the latest rated match of both teams is
+    applied directly. Any other change to a rated result (winner flipped,
+    match moved or no longer completed, or completed out of order) schedules
+    an incremental replay from the earliest affected date once the current
+    transaction commits.
+
+    Returns "applied", "replay" or None when ratings are unaffected.
+    """
+    old_status, old_winner_id, old_date = previous or (None, None, None)
+
+    now_rated = _is_rated(match)
+    was_rated = (
+        old_status == "completed" and old_winner_id is not None
+    ) or EloHistory.objects.filter(match_id=match.id).exists()
+
+    if not now_rated and not was_rated:
+        return None
+    if (
+        now_rated
+        and was_rated
+        and old_winner_id == match.winner_id
+        and old_date == match.date
+    ):
+        return None
+
+    if now_rated and not was_rated:
+        later_history = (
+            EloHistory.objects.filter(
+                team_id__in=[match.team1_id, match.team2_id],
+                match_date__gte=match.date,
+            )
+            .exclude(match_id=match.id)
+            .exists()
+        )
+        if not later_history:
+            update_match_elos(match)
+            return "applied"
+
+    since = min(date for date in (old_date, match.date) if date)
+    match_id = match.id
+    new_match_ids = [] if was_rated else [match_id]
+    transaction.on_commit(
+        lambda: _replay_after_commit(match_id, since, new_match_ids=new_match_ids)
+    )
+    logger.info(f"Scheduled ELO replay from {since.isoformat()} for match {match.id}")
+    return "replay"
+
+
+def sync_deleted_match(match):
+    """
+    Schedule a replay for a match that is about to be deleted, if it was rated.
+
+    Call before match.delete(); the replay runs once the deletion commits,
+    from the ratings the teams had before the match (its history rows go
+    with it).
+    """
+    history = EloHistory.objects.filter(match_id=match.id)
+    if not history.exists():
+        return None
+
+    match_id = match.id
+    since = min(history.values_list("match_date", flat=True))
+    team_ids = (match.team1_id, match.team2_id)
+    base_ratings, _ = restore_ratings(team_ids, since)
+    transaction.on_commit(
+        lambda: _replay_after_commit(
+            match_id, since, team_ids, base_ratings=base_ratings
+        )
+    )
+    return "replay"
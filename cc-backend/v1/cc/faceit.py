@@ -0,0 +1,277 @@
+"""
+Concurrent Faceit player lookups: Elo refresh and import player lookups.
+
+Lookups run on a bounded thread pool and share one token bucket, so the pool
+size controls concurrency while the bucket caps the request rate against the
+Faceit API. Requests go through the shared cc.http_client, which retries 429
+and 5xx responses with backoff (honouring Retry-After). Results are collected
+in memory and persisted with a single bulk_update.
+
+Imports resolve their roster players with lookup_players, which asks Faceit
+once per distinct Steam ID and keeps the answers (including "not found") in
+the FaceitPlayerCache table, so re-importing within
+FACEIT_PLAYER_CACHE_SECONDS makes no API calls.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import http_client
+from .jobs import JobCancelled, report_progress
+from .models import FaceitPlayerCache, Player
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+FACEIT_PLAYERS_URL = "https://open.faceit.com/data/v4/players"
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RefreshStats:
+    """Counters shared by the worker threads of one refresh run."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+def fetch_player(steam_id, api_key, bucket, stats, max_retries=4, timeout=15):
+    """
+    Look up a player's CS2 Faceit profile by Steam ID.
+
+    Returns the Faceit player payload, or None if Faceit has no such player
+    (404). Raises requests.RequestException for any other error response,
+    e.g. a rejected API key, and once retries are exhausted.
+    """
+
+    def throttle():
+        bucket.acquire()
+        stats.add(requests=1)
+
+    def on_retry(response, error):
+        if response is not None and response.status_code == 429:
+            stats.add(rate_limited=1)
+        stats.add(retries=1)
+
+    response = http_client.get(
+        FACEIT_PLAYERS_URL,
+        headers={"Authorization": f"Bearer {api_key}"},
+        params={"game": "cs2", "game_player_id": steam_id},
+        timeout=timeout,
+        retries=max_retries,
+        throttle=throttle,
+        on_retry=on_retry,
+    )
+
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        response.raise_for_status()
+    return response.json()
+
+
+def fetch_cs2_stats(steam_id, api_key, bucket, stats, max_retries=4, timeout=15):
+    """
+    Look up a player's CS2 Faceit Elo and skill level by Steam ID.
+
+    Returns (elo, skill_level), or None if the player has no CS2 Faceit data.
+    Raises requests.RequestException once retries are exhausted.
+    """
+    data = fetch_player(steam_id, api_key, bucket, stats, max_retries, timeout)
+    if data is None:
+        return None
+
+    cs_data = data.get("games", {}).get("cs2")
+    if not cs_data or "faceit_elo" not in cs_data:
+        return None
+    return cs_data["faceit_elo"], cs_data.get("skill_level", 1)
+
+
+def refresh_player_elos(players=None, max_workers=None, requests_per_second=None):
+    """
+    Refresh elo/skill_level of players with a Steam ID from Faceit.
+
+    Returns a summary with updated/not found/failed counts and throughput.
+    """
+    api_key = getattr(settings, "FACEIT_API_KEY", None)
+    max_workers = max_workers or getattr(settings, "FACEIT_MAX_WORKERS", 8)
+    requests_per_second = requests_per_second or getattr(
+        settings, "FACEIT_REQUESTS_PER_SECOND", 10
+    )
+
+    if players is None:
+        players = Player.objects.all()
+    rows = list(
+        players.filter(steam_id__isnull=False)
+        .exclude(steam_id="")
+        .values_list("id", "steam_id", "elo", "skill_level")
+    )
+
+    bucket = TokenBucket(requests_per_second)
+    stats = RefreshStats()
+    started = time.monotonic()
+
+    def lookup(row):
+        player_id, steam_id, _, _ = row
+        try:
+            return row, fetch_cs2_stats(steam_id, api_key, bucket, stats), None
+        except Exception as e:
+            return row, None, e
+
+    changed = []
+    updated_count = 0
+    not_found_count = 0
+    failed_count = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for done, (row, result, error) in enumerate(executor.map(lookup, rows)):
+                report_progress(done, len(rows), "Refreshing player ELOs")
+                player_id, steam_id, elo, skill_level = row
+                if error is not None:
+                    failed_count += 1
+                    logger.warning(f"Error updating player {player_id}: {str(error)}")
+                    continue
+                if result is None:
+                    not_found_count += 1
+                    continue
+
+                updated_count += 1
+                if result != (elo, skill_level):
+                    new_elo, new_skill_level = result
+                    changed.append(
+                        Player(id=player_id, elo=new_elo, skill_level=new_skill_level)
+                    )
+        except JobCancelled:
+            # Drop the lookups that have not started instead of waiting on them
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    if changed:
+        with transaction.atomic():
+            Player.objects.bulk_update(changed, ["elo", "skill_level"], batch_size=500)
+            invalidate_models(Player)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Refreshed {updated_count} of {len(rows)} player ELOs in {elapsed:.1f}s "
+        f"({not_found_count} not found, {failed_count} failed)"
+    )
+
+    return {
+        "total_players": len(rows),
+        "updated_players": updated_count,
+        "changed_players": len(changed),
+        "not_found": not_found_count,
+        "failed": failed_count,
+        "requests": stats.requests,
+        "retries": stats.retries,
+        "rate_limited": stats.rate_limited,
+        "elapsed_seconds": round(elapsed, 2),
+        "players_per_second": round(len(rows) / elapsed, 2) if elapsed else None,
+    }
+
+
+def lookup_players(steam_ids, max_workers=None, requests_per_second=None):
+    """
+    Faceit player payloads for a batch of Steam IDs, as {steam_id: payload}.
+
+    Each distinct ID is looked up at most once: cached answers younger than
+    FACEIT_PLAYER_CACHE_SECONDS are reused and the rest are fetched
+    concurrently, then stored. IDs without a Faceit player map to None;
+    IDs whose lookup failed are left out and not cached.
+    """
+    steam_ids = {steam_id for steam_id in steam_ids if steam_id}
+    api_key = getattr(settings, "FACEIT_API_KEY", None)
+    if not steam_ids or not api_key:
+        return {}
+
+    max_workers = max_workers or getattr(settings, "FACEIT_MAX_WORKERS", 8)
+    requests_per_second = requests_per_second or getattr(
+        settings, "FACEIT_REQUESTS_PER_SECOND", 10
+    )
+    cutoff = timezone.now() - timedelta(
+        seconds=getattr(settings, "FACEIT_PLAYER_CACHE_SECONDS", 21600)
+    )
+
+    players = dict(
+        FaceitPlayerCache.objects.filter(
+            game_player_id__in=steam_ids, fetched_at__gte=cutoff
+        ).values_list("game_player_id", "data")
+    )
+    missing = sorted(steam_ids - players.keys())
+
+    bucket = TokenBucket(requests_per_second)
+    stats = RefreshStats()
+
+    def lookup(steam_id):
+        try:
+            return steam_id, fetch_player(steam_id, api_key, bucket, stats), None
+        except Exception as e:
+            return steam_id, None, e
+
+    fetched = []
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for steam_id, data, error in executor.map(lookup, missing):
+                if error is not None:
+                    logger.warning(
+                        f"Could not fetch Faceit player {steam_id}: {str(error)}"
+                    )
+                    continue
+                players[steam_id] = data
+                fetched.append(FaceitPlayerCache(game_player_id=steam_id, data=data))
+
+    if fetched:
+        FaceitPlayerCache.objects.bulk_create(
+            fetched,
+            update_conflicts=True,
+            unique_fields=["game_player_id"],
+            update_fields=["data", "fetched_at"],
+        )
+    FaceitPlayerCache.objects.filter(fetched_at__lt=cutoff).delete()
+
+    logger.info(
+        f"Looked up {len(steam_ids)} Faceit players: "
+        f"{len(steam_ids) - len(missing)} cached, {stats.requests} requests"
+    )
+    return players
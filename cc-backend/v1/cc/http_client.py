@@ -0,0 +1,325 @@
+"""
+Shared outbound HTTP client for the platform integrations.
+
+Every call to Faceit, LeagueSpot, the Regents League API, NWES, Discord and
+proxied images goes through one HttpClient. Sessions are per thread (a
+requests.Session is not thread-safe) but they all mount the same HTTPAdapter,
+so keep-alive connections are pooled per host and reused across requests and
+worker threads.
+
+Idempotent requests are retried on connection errors, timeouts, 429 and 5xx
+with jittered exponential backoff (Retry-After is honoured). Each host has a
+circuit breaker: after HTTP_CIRCUIT_FAILURES consecutive failures, calls fail
+fast with CircuitOpenError for HTTP_CIRCUIT_RESET_SECONDS, then one trial
+request decides whether the circuit closes again. Per-host latency and error
+counters are available from stats(). The image proxy reaches arbitrary hosts,
+so only the HTTP_MAX_TRACKED_HOSTS most recently used hosts keep a breaker
+and counters.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without making a request while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host."""
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half-open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def release(self):
+        """End a trial request that neither succeeded nor failed."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        """Count a failure; returns True if this failure opened the circuit."""
+        with self.lock:
+            self.failures += 1
+            was_closed = self.opened_at is None
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.trial_running = False
+                return was_closed
+            return False
+
+
+class HostStats:
+    """Request counters and latency for one host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "avg_ms": (
+                round(self.total_seconds / self.requests * 1000, 1)
+                if self.requests
+                else None
+            ),
+            "max_ms": round(self.max_seconds * 1000, 1),
+        }
+
+
+class HttpClient:
+    """
+    Pooled, retrying HTTP client. Unset options are read from settings.
+
+    request() takes the usual requests keyword arguments plus:
+      retries:  attempts after the first; defaults to HTTP_MAX_RETRIES for
+                idempotent methods and 0 otherwise
+      throttle: callable run before every attempt (e.g. a rate limiter)
+      on_retry: callable(response, error) run before every retry
+    After the last attempt the final response is returned (check its status
+    as with requests) or the final exception is raised.
+    """
+
+    def __init__(
+        self,
+        timeout=None,
+        max_retries=None,
+        backoff_base=None,
+        backoff_max=None,
+        failure_threshold=None,
+        reset_seconds=None,
+        pool_maxsize=None,
+        max_tracked_hosts=None,
+    ):
+        def setting(value, name, default):
+            return value if value is not None else getattr(settings, name, default)
+
+        self.timeout = setting(timeout, "HTTP_TIMEOUT", (5, 30))
+        self.max_retries = setting(max_retries, "HTTP_MAX_RETRIES", 3)
+        self.backoff_base = setting(backoff_base, "HTTP_BACKOFF_BASE", 0.5)
+        self.backoff_max = setting(backoff_max, "HTTP_BACKOFF_MAX", 30)
+        self.failure_threshold = setting(
+            failure_threshold, "HTTP_CIRCUIT_FAILURES", 5
+        )
+        self.reset_seconds = setting(reset_seconds, "HTTP_CIRCUIT_RESET_SECONDS", 30)
+        pool_maxsize = setting(pool_maxsize, "HTTP_POOL_MAXSIZE", 16)
+        self.max_tracked_hosts = setting(
+            max_tracked_hosts, "HTTP_MAX_TRACKED_HOSTS", 256
+        )
+
+        # One pool per host, shared by every thread's session
+        self.adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # Least recently used host first
+        self.breakers = OrderedDict()
+        self.host_stats = {}
+
+    def _session(self):
+        if not hasattr(self.local, "session"):
+            session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self.local.session = session
+        return self.local.session
+
+    def _host(self, url):
+        return urlsplit(url).netloc.lower()
+
+    def _track(self, host):
+        """The breaker and counters of a host, created on first use."""
+        with self.lock:
+            if host in self.breakers:
+                self.breakers.move_to_end(host)
+            else:
+                self.breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.reset_seconds
+                )
+                self.host_stats[host] = HostStats()
+                while len(self.breakers) > self.max_tracked_hosts:
+                    evicted, _ = self.breakers.popitem(last=False)
+                    del self.host_stats[evicted]
+            return self.breakers[host], self.host_stats[host]
+
+    def _record(self, host_stats, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(host_stats, name, getattr(host_stats, name) + value)
+            if "total_seconds" in counts:
+                host_stats.max_seconds = max(
+                    host_stats.max_seconds, counts["total_seconds"]
+                )
+
+    def _backoff(self, attempt, response):
+        retry_after = (
+            response.headers.get("Retry-After", "") if response is not None else ""
+        )
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # Full jitter keeps concurrent workers from retrying in lockstep
+            delay = random.uniform(0, self.backoff_base * 2**attempt)
+        return min(delay, self.backoff_max)
+
+    def request(
+        self, method, url, retries=None, throttle=None, on_retry=None, **kwargs
+    ):
+        method = method.upper()
+        if retries is None:
+            retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        kwargs.setdefault("timeout", self.timeout)
+
+        host = self._host(url)
+        # Held for the whole call, the host may be evicted meanwhile
+        breaker, host_stats = self._track(host)
+
+        for attempt in range(retries + 1):
+            if throttle:
+                throttle()
+
+            if not breaker.allow():
+                self._record(host_stats, rejected=1)
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            started = time.monotonic()
+            response, error = None, None
+            try:
+                response = self._session().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except Exception:
+                # Invalid URL and the like say nothing about the host
+                breaker.release()
+                raise
+            elapsed = time.monotonic() - started
+
+            failed = error is not None or response.status_code >= 500
+            self._record(
+                host_stats, requests=1, failures=int(failed), total_seconds=elapsed
+            )
+            if failed:
+                if breaker.record_failure():
+                    logger.warning(f"Circuit opened for {host}")
+            else:
+                breaker.record_success()
+
+            logger.debug(
+                f"{method} {host} -> "
+                f"{error or response.status_code} in {elapsed * 1000:.0f}ms"
+            )
+
+            retryable = error is not None or response.status_code in RETRY_STATUSES
+            if not retryable or attempt == retries:
+                if error is not None:
+                    raise error
+                return response
+
+            self._record(host_stats, retries=1)
+            if on_retry:
+                on_retry(response, error)
+            delay = self._backoff(attempt, response)
+            if response is not None:
+                # Hand the connection back to the pool; a streamed body is
+                # otherwise never read and keeps it checked out
+                response.close()
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Per-host request counts, latency and circuit state."""
+        with self.lock:
+            hosts = [
+                (host, breaker, self.host_stats[host])
+                for host, breaker in self.breakers.items()
+            ]
+        return {
+            host: {**host_stats.as_dict(), "circuit": breaker.state}
+            for host, breaker, host_stats in hosts
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, built from settings on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def reset_client():
+    """Drop the shared client so the next call rebuilds it from settings."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def request(method, url, **kwargs):
+    return get_client().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
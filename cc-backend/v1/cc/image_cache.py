@@ -0,0 +1,289 @@
+"""
+Disk-backed cache for the image proxy.
+
+Each proxied URL has a small JSON metadata file (upstream ETag/Last-Modified,
+content type, when it was last checked) pointing at a body file keyed by the
+URL and its ETag (or Last-Modified). Resized variants are stored next to the
+original under a key that also includes the requested size and format, so a
+changed upstream image never serves old variants.
+
+Originals are written while they are streamed to the client: chunks go to a
+temporary file that is only moved into place once the download completes.
+Downloads larger than IMAGE_PROXY_MAX_DOWNLOAD_BYTES are aborted and never
+stored. Files are touched on every hit and the least recently used ones are
+removed, each original together with its metadata file, once the directory
+grows beyond IMAGE_PROXY_CACHE_MAX_BYTES. All writes use os.replace, so
+several worker processes can share one cache directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+VARIANT_FORMATS = {"webp": ("WEBP", "image/webp"), "png": ("PNG", "image/png")}
+
+
+class ImageTooLarge(Exception):
+    """The upstream image exceeds the download limit."""
+
+
+def _digest(*parts):
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class ImageCache:
+    def __init__(
+        self, directory, max_bytes, revalidate_seconds, max_download_bytes=None
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.max_download_bytes = max_download_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _meta_path(self, url):
+        return self._path(f"{_digest(url)}.json")
+
+    def _write_atomic(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _save_meta(self, url, meta):
+        self._write_atomic(
+            self._meta_path(url), lambda f: f.write(json.dumps(meta).encode())
+        )
+
+    def lookup(self, url):
+        """Metadata for a cached original, or None."""
+        try:
+            with open(self._meta_path(url)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        body_path = self.body_path(meta)
+        if not os.path.exists(body_path):
+            return None
+        os.utime(body_path)
+        return meta
+
+    def body_path(self, meta):
+        return self._path(meta["body"])
+
+    def is_fresh(self, meta):
+        return time.time() - meta["checked_at"] < self.revalidate_seconds
+
+    def validators(self, meta):
+        """Conditional request headers for revalidating a cached original."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def mark_checked(self, url, meta):
+        meta["checked_at"] = time.time()
+        self._save_meta(url, meta)
+
+    def _new_meta(self, url, response):
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        # Without validators every download is treated as a new version
+        version = etag or last_modified or str(time.time())
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": response.headers.get("Content-Type", "image/jpeg"),
+            "body": f"{_digest(url, version)}.img",
+            "checked_at": time.time(),
+        }
+
+    def check_size(self, response):
+        """Raise ImageTooLarge if the announced Content-Length exceeds the limit."""
+        try:
+            length = int(response.headers.get("Content-Length", ""))
+        except ValueError:
+            return
+        if self.max_download_bytes is not None and length > self.max_download_bytes:
+            response.close()
+            raise ImageTooLarge(f"Image of {length} bytes exceeds the download limit")
+
+    def _iter_body(self, response):
+        # Content-Length may be missing or wrong, so count what actually arrives
+        limit = self.max_download_bytes
+        received = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            received += len(chunk)
+            if limit is not None and received > limit:
+                raise ImageTooLarge(
+                    f"Image exceeds the download limit of {limit} bytes"
+                )
+            yield chunk
+
+    def _replace_original(self, url, meta):
+        previous = self.lookup(url)
+        self._save_meta(url, meta)
+        if previous and previous["body"] != meta["body"]:
+            try:
+                os.unlink(self.body_path(previous))
+            except OSError:
+                pass
+        self.evict()
+
+    def stream_and_store(self, url, response):
+        """
+        Yield the upstream body in chunks while writing it to the cache.
+        The entry is only stored if the whole body was read; raises
+        ImageTooLarge (ending the stream) once the download limit is passed.
+        """
+        meta = self._new_meta(url, response)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._iter_body(response):
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, self.body_path(meta))
+            complete = True
+            self._replace_original(url, meta)
+        finally:
+            response.close()
+            if not complete:
+                os.unlink(tmp_path)
+
+    def store(self, url, response):
+        """
+        Download the upstream body into the cache and return its metadata.
+        Raises ImageTooLarge, storing nothing, past the download limit.
+        """
+        meta = self._new_meta(url, response)
+
+        def write(f):
+            for chunk in self._iter_body(response):
+                f.write(chunk)
+
+        try:
+            self._write_atomic(self.body_path(meta), write)
+        finally:
+            response.close()
+        self._replace_original(url, meta)
+        return meta
+
+    def variant(self, meta, width, height, fmt):
+        """
+        Path and content type of the original resized to fit width x height
+        (either may be None) and re-encoded as fmt. Generated on first use.
+        Raises PIL.UnidentifiedImageError if the original cannot be decoded.
+        """
+        pil_format, content_type = VARIANT_FORMATS[fmt]
+        name = _digest(meta["body"], str(width), str(height), fmt)
+        path = self._path(f"{name}.{fmt}")
+        if os.path.exists(path):
+            os.utime(path)
+            return path, content_type
+
+        with Image.open(self.body_path(meta)) as image:
+            image.thumbnail((width or image.width, height or image.height))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            self._write_atomic(path, lambda f: image.save(f, pil_format))
+
+        self.evict()
+        return path, content_type
+
+    def evict(self):
+        """
+        Remove least recently used files until the cache fits max_bytes.
+        An original is removed together with its metadata file.
+        """
+        files = {}
+        meta_files = []
+        total = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                total += stat.st_size
+                if entry.name.endswith(".json"):
+                    meta_files.append((entry.path, stat.st_mtime, stat.st_size))
+                else:
+                    files[entry.path] = [stat.st_mtime, stat.st_size, [entry.path]]
+
+        if total <= self.max_bytes:
+            return
+
+        # Metadata is rewritten on revalidation, so it ages with its body,
+        # which is touched on every hit; a metadata file whose body is gone
+        # is an entry of its own
+        for path, mtime, size in meta_files:
+            try:
+                with open(path) as f:
+                    body_path = self._path(json.load(f)["body"])
+            except (OSError, ValueError, KeyError):
+                body_path = None
+            if body_path in files:
+                files[body_path][1] += size
+                files[body_path][2].insert(0, path)
+            else:
+                files[path] = [mtime, size, [path]]
+
+        # Trim to 90% so a full cache does not rescan on every write
+        target = self.max_bytes * 0.9
+        for _, size, paths in sorted(files.values()):
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            total -= size
+            if total <= target:
+                break
+        logger.info(f"Image cache trimmed to {total} bytes")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    """The image cache configured in settings, created on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ImageCache(
+                    settings.IMAGE_PROXY_CACHE_DIR,
+                    settings.IMAGE_PROXY_CACHE_MAX_BYTES,
+                    settings.IMAGE_PROXY_REVALIDATE_SECONDS,
+                    settings.IMAGE_PROXY_MAX_DOWNLOAD_BYTES,
+                )
+    return _cache
+
+
+def reset_image_cache():
+    global _cache
+    with _cache_lock:
+        _cache = None
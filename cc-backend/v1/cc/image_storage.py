@@ -0,0 +1,130 @@
+"""
+Picture upload pipeline and storage backends.
+
+An uploaded team or player picture is stored as-is and re-encoded with Pillow
+into a fixed set of WebP size variants. All files of one upload share a prefix:
+
+    <kind>/<object id>/<upload id>/original.<ext>
+    <kind>/<object id>/<upload id>/<variant>.webp
+
+so list pages can fetch a small variant instead of the full-size original.
+Keys are unique per upload, which lets the files be cached indefinitely.
+
+IMAGE_STORAGE_BACKEND selects where files go: "firebase" (default) uploads to
+Firebase Storage, "local" writes to IMAGE_STORAGE_LOCAL_DIR and serves them
+from IMAGE_STORAGE_LOCAL_URL, which keeps the pipeline usable offline.
+"""
+
+import io
+import logging
+import os
+import uuid
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+FIREBASE_BUCKET = "college-counter-9057f.firebasestorage.app"
+
+# Variant name -> longest side in pixels
+PICTURE_VARIANT_SIZES = {"small": 64, "medium": 256, "large": 512}
+
+WEBP_QUALITY = 85
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class FirebaseStorage:
+    def __init__(self, bucket_name=FIREBASE_BUCKET):
+        import firebase_admin
+        from firebase_admin import credentials, storage
+
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(settings.FIREBASE_ADMIN_CREDENTIAL)
+            firebase_admin.initialize_app(cred, {"storageBucket": bucket_name})
+        self.bucket = storage.bucket(bucket_name)
+
+    def save(self, key, data, content_type):
+        """Upload data under key and return its public URL."""
+        blob = self.bucket.blob(key)
+        blob.cache_control = IMMUTABLE_CACHE_CONTROL
+        blob.upload_from_string(data, content_type=content_type)
+        blob.make_public()
+        return blob.public_url
+
+
+class LocalStorage:
+    def __init__(self, directory, base_url):
+        self.directory = directory
+        self.base_url = base_url
+
+    def save(self, key, data, content_type):
+        """Write data under key below the storage directory and return its URL."""
+        path = os.path.join(self.directory, *key.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return f"{self.base_url.rstrip('/')}/{key}"
+
+
+def get_storage():
+    backend = getattr(settings, "IMAGE_STORAGE_BACKEND", "firebase")
+    if backend == "local":
+        return LocalStorage(
+            settings.IMAGE_STORAGE_LOCAL_DIR, settings.IMAGE_STORAGE_LOCAL_URL
+        )
+    return FirebaseStorage()
+
+
+def render_variants(data):
+    """
+    Re-encode image bytes as WebP at every PICTURE_VARIANT_SIZES size.
+    Returns {name: webp bytes}, or {} if Pillow cannot decode the image
+    (e.g. SVG), in which case only the original is stored.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except (UnidentifiedImageError, OSError):
+        return {}
+
+    # Respect camera orientation and keep transparency for logos
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    variants = {}
+    for name, size in PICTURE_VARIANT_SIZES.items():
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+        variants[name] = buffer.getvalue()
+    return variants
+
+
+def store_picture(kind, object_id, upload, storage=None):
+    """
+    Store an uploaded picture and its variants for a team or player.
+
+    kind is the key prefix ("teams" or "players"). Returns
+    (original URL, {variant name: URL}).
+    """
+    storage = storage or get_storage()
+    data = upload.read()
+    extension = os.path.splitext(upload.name)[1].lower()
+    prefix = f"{kind}/{object_id}/{uuid.uuid4()}"
+
+    content_type = getattr(upload, "content_type", None) or (
+        f"image/{extension.lstrip('.')}"
+    )
+    picture_url = storage.save(f"{prefix}/original{extension}", data, content_type)
+
+    variant_urls = {
+        name: storage.save(f"{prefix}/{name}.webp", variant, "image/webp")
+        for name, variant in render_variants(data).items()
+    }
+    if not variant_urls:
+        logger.info(f"Stored {prefix} without variants: image could not be decoded")
+
+    return picture_url, variant_urls
@@ -1,22 +1,10 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.conf import settings
 from .models import Team, Player
 from .middleware import firebase_auth_required
-import uuid
+from .image_storage import store_picture
 import json
-import os
-import firebase_admin
-from firebase_admin import credentials, storage
-
-# Initialize Firebase Storage (this would typically be done in your app's initialization)
-# This assumes you've added the Firebase credentials to your Django settings
-if not firebase_admin._apps:
-    cred = credentials.Certificate(settings.FIREBASE_ADMIN_CREDENTIAL)
-    firebase_admin.initialize_app(
-        cred, {"storageBucket": "college-counter-9057f.firebasestorage.app"}
-    )
 
 
 @csrf_exempt
@@ -24,7 +12,8 @@ if not firebase_admin._apps:
 @firebase_auth_required(min_role="admin")
 def upload_team_picture(request, team_id):
     """
-    Upload a team picture to Firebase Storage and update the team's picture URL
+    Upload a team picture with its size variants (see cc.image_storage) and
+    update the team's picture URL and picture_variants
     """
     try:
         team = Team.objects.get(id=team_id)
@@ -34,35 +23,18 @@ def upload_team_picture(request, team_id):
         if not picture:
             return JsonResponse({"error": "No picture provided"}, status=400)
 
-        # Create a unique filename
-        extension = os.path.splitext(picture.name)[1]
-        filename = f"teams/{team_id}_{uuid.uuid4()}{extension}"
-
-        # Upload to Firebase Storage
-        bucket = storage.bucket()
-        blob = bucket.blob(filename)
-
-        # Set content type based on file extension
-        content_type = f"image/{extension.lstrip('.')}"
-        blob.content_type = content_type
-
-        # Upload the file
-        blob.upload_from_file(picture)
-
-        # Make the blob publicly accessible
-        blob.make_public()
-
-        # Get the public URL
-        picture_url = blob.public_url
+        picture_url, picture_variants = store_picture("teams", team.id, picture)
 
         # Update the team's picture URL
         team.picture = picture_url
-        team.save()
+        team.picture_variants = picture_variants
+        team.save(update_fields=["picture", "picture_variants"])
 
         return JsonResponse(
             {
                 "message": "Team picture uploaded successfully",
                 "picture_url": picture_url,
+                "picture_variants": picture_variants,
             }
         )
 
@@ -77,7 +49,8 @@ def upload_team_picture(request, team_id):
 @firebase_auth_required(min_role="admin")
 def upload_player_picture(request, player_id):
     """
-    Upload a player picture to Firebase Storage and update the player's picture URL
+    Upload a player picture with its size variants (see cc.image_storage) and
+    update the player's picture URL and picture_variants
     """
     try:
         player = Player.objects.get(id=player_id)
@@ -87,35 +60,18 @@ def upload_player_picture(request, player_id):
         if not picture:
             return JsonResponse({"error": "No picture provided"}, status=400)
 
-        # Create a unique filename
-        extension = os.path.splitext(picture.name)[1]
-        filename = f"players/{player_id}_{uuid.uuid4()}{extension}"
-
-        # Upload to Firebase Storage
-        bucket = storage.bucket("college-counter-9057f.firebasestorage.app")
-        blob = bucket.blob(filename)
-
-        # Set content type based on file extension
-        content_type = f"image/{extension.lstrip('.')}"
-        blob.content_type = content_type
-
-        # Upload the file
-        blob.upload_from_file(picture)
-
-        # Make the blob publicly accessible
-        blob.make_public()
-
-        # Get the public URL
-        picture_url = blob.public_url
+        picture_url, picture_variants = store_picture("players", player.id, picture)
 
         # Update the player's picture URL
         player.picture = picture_url
-        player.save()
+        player.picture_variants = picture_variants
+        player.save(update_fields=["picture", "picture_variants"])
 
         return JsonResponse(
             {
                 "message": "Player picture uploaded successfully",
                 "picture_url": picture_url,
+                "picture_variants": picture_variants,
             }
         )
 
@@ -0,0 +1,326 @@
+"""
+Bulk identity resolution for match imports.
+
+An import payload names the same teams and players over and over. Instead of
+resolving them match by match, the importers hand every team payload of the
+batch to ImportIdentities.resolve_teams. It loads the participants of the
+import's competition/season, the teams matching the payload names and the
+players matching the roster steam ids, Faceit ids and names with a handful of
+IN queries, resolves every payload against these identity maps in payload
+order, and writes the missing Teams, Participants and Players with
+bulk_create (and changed ones with bulk_update).
+
+The matching rules are those of the former per-match get_or_create_team and
+process_player helpers: a team is found through a participant of this
+competition/season by Faceit id, Playfly team id, Playfly participant id or
+Regents League id, otherwise by exact name; a player is found by steam id,
+then Faceit id, then a unique case-insensitive name.
+
+payload_hash fingerprints the upstream payload of each match. The importers
+store it on Match.import_hash and skip re-imported matches whose payload has
+not changed before any of the above runs.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .faceit import lookup_players
+from .models import Participant, Player, Team
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_ID_FIELDS = (
+    "faceit_id",
+    "playfly_id",
+    "playfly_participant_id",
+    "regentsleague_id",
+)
+
+
+def payload_hash(payload):
+    """Stable SHA-256 of an upstream payload, independent of key order."""
+    normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def team_identity(team_data, platform):
+    """The names and platform ids a team payload can be matched by."""
+    identity = {
+        "name": team_data.get("name", "Unknown Team"),
+        "avatar": team_data.get("avatar"),
+        "faceit_id": team_data.get("faction_id"),
+        "playfly_id": None,
+        "playfly_participant_id": None,
+        "regentsleague_id": None,
+        "roster": team_data.get("roster", []),
+    }
+    if platform == "regentsleague":
+        identity["avatar"] = team_data.get("picture")
+        identity["regentsleague_id"] = team_data.get("id")
+
+    # Only process LeagueSpot/Playfly IDs if we're actually importing from there
+    if platform == "leaguespot":
+        identity["playfly_id"] = team_data.get("faction_id") or team_data.get("teamId")
+        identity["playfly_participant_id"] = team_data.get("participantId")
+    return identity
+
+
+def any_of(**lookups):
+    """OR together the IN lookups that have values."""
+    query = Q(pk__in=[])
+    for lookup, values in lookups.items():
+        if values:
+            query |= Q(**{lookup: values})
+    return query
+
+
+class ImportIdentities:
+    """Resolves the teams and players of one import batch."""
+
+    def __init__(self, competition, season, platform):
+        self.competition = competition
+        self.season = season
+        self.platform = platform
+
+    def resolve_teams(self, team_payloads):
+        """
+        Resolve team payloads to Teams, creating what is missing.
+        Returns a list of Teams parallel to team_payloads.
+        """
+        if not team_payloads:
+            return []
+        identities = [team_identity(data, self.platform) for data in team_payloads]
+
+        participants = Participant.objects.filter(
+            competition=self.competition, season=self.season
+        ).select_related("team")
+        self.participants_by = {field: {} for field in PARTICIPANT_ID_FIELDS}
+        self.participants_by["team"] = {}
+        for participant in participants:
+            self._index_participant(participant)
+
+        teams_by_name = {}
+        names = {identity["name"] for identity in identities}
+        for team in Team.objects.filter(name__in=names).order_by("pk"):
+            teams_by_name.setdefault(team.name, team)
+
+        new_teams = []
+        new_participants = []
+        changed_participants = {}
+        rosters = []
+        teams = []
+
+        for identity in identities:
+            participant = self._find_participant(identity)
+            if participant and participant.team:
+                teams.append(participant.team)
+                continue
+
+            team = teams_by_name.get(identity["name"])
+            if team is None:
+                team = Team(name=identity["name"], picture=identity["avatar"])
+                teams_by_name[team.name] = team
+                new_teams.append(team)
+
+            # Link the team to this competition and season
+            participant = self.participants_by["team"].get(team.id)
+            if participant is None:
+                participant = Participant(
+                    team=team,
+                    competition=self.competition,
+                    season=self.season,
+                    **{
+                        field: identity[field]
+                        for field in PARTICIPANT_ID_FIELDS
+                        if identity[field]
+                    },
+                )
+                new_participants.append(participant)
+            else:
+                # Fill in platform IDs the participant was missing
+                for field in PARTICIPANT_ID_FIELDS:
+                    if identity[field] and not getattr(participant, field):
+                        setattr(participant, field, identity[field])
+                        changed_participants[participant.id] = participant
+            self._index_participant(participant)
+
+            rosters.append((identity["roster"], team))
+            teams.append(team)
+
+        # Ask Faceit before opening the transaction
+        player_entries = self.player_entries(rosters)
+
+        with transaction.atomic():
+            Team.objects.bulk_create(new_teams)
+            Participant.objects.bulk_create(new_participants)
+            created = {p.id for p in new_participants}
+            changed_participants = [
+                p for p in changed_participants.values() if p.id not in created
+            ]
+            if changed_participants:
+                Participant.objects.bulk_update(
+                    changed_participants, PARTICIPANT_ID_FIELDS
+                )
+            self.resolve_players(player_entries)
+
+        invalidate_models(Team, Participant, Player)
+        logger.info(
+            f"Resolved {len(identities)} team references: {len(new_teams)} new teams, "
+            f"{len(new_participants)} new participants"
+        )
+        return teams
+
+    def _index_participant(self, participant):
+        for field in PARTICIPANT_ID_FIELDS:
+            value = getattr(participant, field)
+            if value:
+                self.participants_by[field].setdefault(value, participant)
+        if participant.team_id:
+            self.participants_by["team"].setdefault(participant.team_id, participant)
+
+    def _find_participant(self, identity):
+        by = self.participants_by
+        participant = None
+        if identity["faceit_id"]:
+            participant = by["faceit_id"].get(identity["faceit_id"])
+            if participant is None and identity["playfly_id"]:
+                participant = by["faceit_id"].get(identity["playfly_id"])
+        for field in PARTICIPANT_ID_FIELDS[1:]:
+            if participant is None and identity[field]:
+                participant = by[field].get(identity[field])
+        return participant
+
+    def player_entries(self, rosters):
+        """
+        Flatten rosters into player entries, enriched with Faceit data where
+        a Steam ID is known. Faceit is asked once per distinct Steam ID.
+        """
+        entries = []
+        for roster, team in rosters:
+            for player_data in roster:
+                game_player_id = player_data.get("game_player_id") or player_data.get(
+                    "steam_id"
+                )
+                entry = {
+                    "team": team,
+                    "faceit_id": player_data.get("player_id") or None,
+                    "steam_id": game_player_id or None,
+                    "name": player_data.get("nickname", "Unknown Player"),
+                    "avatar": player_data.get("avatar"),
+                    "elo": 1000,
+                }
+                entries.append(entry)
+
+        faceit_players = lookup_players(entry["steam_id"] for entry in entries)
+        for entry in entries:
+            faceit_data = faceit_players.get(entry["steam_id"])
+            if faceit_data:
+                entry["faceit_id"] = faceit_data.get("player_id", entry["faceit_id"])
+                entry["name"] = faceit_data.get("nickname", entry["name"])
+                entry["avatar"] = faceit_data.get("avatar", entry["avatar"])
+                entry["elo"] = (
+                    faceit_data.get("games", {})
+                    .get("cs2", {})
+                    .get("faceit_elo", 1000)
+                )
+        return entries
+
+    def resolve_players(self, entries):
+        """
+        Match player entries to existing Players, moving them onto the team,
+        and create the ones that do not exist yet.
+        """
+        if not entries:
+            return
+
+        steam_ids = {e["steam_id"] for e in entries if e["steam_id"]}
+        faceit_ids = {e["faceit_id"] for e in entries if e["faceit_id"]}
+        names = {e["name"].lower() for e in entries if e["name"]}
+
+        by_steam_id = {}
+        by_faceit_id = {}
+        by_name = {}
+        existing = Player.objects.annotate(name_lower=Lower("name")).filter(
+            any_of(
+                steam_id__in=steam_ids,
+                faceit_id__in=faceit_ids,
+                name_lower__in=names,
+            )
+        )
+        for player in existing:
+            self._index_player(player, by_steam_id, by_faceit_id, by_name)
+
+        new_players = []
+        changed_players = {}
+        for entry in entries:
+            player = None
+            if entry["steam_id"]:
+                player = by_steam_id.get(entry["steam_id"])
+            if player is None and entry["faceit_id"]:
+                player = by_faceit_id.get(entry["faceit_id"])
+            if player is None and entry["name"] and entry["name"] != "Unknown Player":
+                # If several players share the name, don't risk picking one
+                same_name = by_name.get(entry["name"].lower(), [])
+                if len(same_name) == 1:
+                    player = same_name[0]
+
+            if player is None:
+                player = Player(
+                    name=entry["name"],
+                    picture=entry["avatar"],
+                    faceit_id=entry["faceit_id"],
+                    steam_id=entry["steam_id"],
+                    team=entry["team"],
+                    elo=entry["elo"],
+                )
+                new_players.append(player)
+            else:
+                # Keep manually set names and pictures, fill in missing IDs
+                if entry["faceit_id"] and not player.faceit_id:
+                    player.faceit_id = entry["faceit_id"]
+                if entry["steam_id"] and not player.steam_id:
+                    player.steam_id = entry["steam_id"]
+                player.elo = entry["elo"]
+                player.team = entry["team"]
+                player.benched = False
+                changed_players[player.id] = player
+            self._index_player(player, by_steam_id, by_faceit_id, by_name)
+
+        Player.objects.bulk_create(new_players)
+        created = {p.id for p in new_players}
+        changed_players = [p for p in changed_players.values() if p.id not in created]
+        if changed_players:
+            Player.objects.bulk_update(
+                changed_players,
+                ["faceit_id", "steam_id", "elo", "team", "benched"],
+                batch_size=500,
+            )
+
+        Through = Player.seasons.through
+        Through.objects.bulk_create(
+            [
+                Through(player_id=player.id, season_id=self.season.id)
+                for player in {p.id: p for p in new_players + changed_players}.values()
+            ],
+            ignore_conflicts=True,
+        )
+        logger.info(
+            f"Resolved {len(entries)} roster entries: {len(new_players)} new players, "
+            f"{len(changed_players)} updated"
+        )
+
+    def _index_player(self, player, by_steam_id, by_faceit_id, by_name):
+        if player.steam_id:
+            by_steam_id.setdefault(player.steam_id, player)
+        if player.faceit_id:
+            by_faceit_id.setdefault(player.faceit_id, player)
+        if player.name:
+            same_name = by_name.setdefault(player.name.lower(), [])
+            if player not in same_name:
+                same_name.append(player)
@@ -0,0 +1,339 @@
+"""
+Database-backed background jobs for long-running admin operations.
+
+Job-capable views keep their body in a function of the request data that is
+registered with @job_handler. The view calls run_or_enqueue: by default the
+function runs inline as before, and with "async": true in the request (or
+ADMIN_JOBS_ASYNC=True) a Job row is queued and its id returned with 202.
+
+The run_jobs management command is the worker. It claims jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, runs the handler, and stores the handler's
+response as the job result. While a handler runs, a background thread keeps
+the job's heartbeat fresh so requeue_stale only picks up jobs whose worker
+died. Handlers report progress and honour cancellation through
+report_progress(), which is a no-op outside a job.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> function of the request data returning a Response
+JOB_HANDLERS = {}
+
+# Minimum seconds between progress writes for one job
+PROGRESS_INTERVAL = 1.0
+
+# Seconds between heartbeats the worker writes for a running job
+HEARTBEAT_INTERVAL = 60
+
+_current = threading.local()
+
+
+class JobCancelled(BaseException):
+    """
+    Raised by report_progress when the current job was cancelled.
+
+    A BaseException, so the broad "except Exception" of job handlers that
+    turn errors into a 500 response let it through to run_job.
+    """
+
+
+def job_handler(kind):
+    """Register a function of the request data as the handler for kind."""
+
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        func.job_kind = kind
+        return func
+
+    return decorator
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(kind, payload=None, created_by="", run_after=None, max_attempts=1):
+    """Queue a job of a registered kind and return it."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        created_by=created_by,
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def _wants_async(data):
+    value = data.get("async", getattr(settings, "ADMIN_JOBS_ASYNC", False))
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def run_or_enqueue(request, handler):
+    """
+    Run a job handler inline, or queue it when the request asks for async.
+
+    Queued jobs answer 202 with the job id; poll status_url for the result.
+    """
+    data = request.data
+    if not _wants_async(data):
+        return handler(data)
+
+    payload = data.dict() if hasattr(data, "dict") else dict(data)
+    payload.pop("async", None)
+
+    user = getattr(request, "firebase_user", None) or {}
+    job = enqueue(
+        handler.job_kind,
+        payload,
+        created_by=user.get("email") or user.get("uid") or "",
+    )
+    logger.info(f"Queued {job.kind} job {job.id}")
+
+    return Response(
+        {
+            "message": f"{job.kind} queued",
+            "job_id": str(job.id),
+            "status": job.status,
+            "status_url": reverse("job_detail", args=[job.id]),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def report_progress(done=None, total=None, message=None):
+    """
+    Record progress of the current job and stop it if cancellation was asked.
+
+    Writes are throttled to one per PROGRESS_INTERVAL. Outside a job this does
+    nothing, so handlers can call it unconditionally when run inline.
+    """
+    job_id = getattr(_current, "job_id", None)
+    if job_id is None:
+        return
+
+    now = time.monotonic()
+    finished = done is not None and total is not None and done >= total
+    if now - _current.last_report < PROGRESS_INTERVAL and not finished:
+        return
+    _current.last_report = now
+
+    fields = {"heartbeat_at": timezone.now()}
+    if done is not None:
+        fields["progress"] = done
+    if total is not None:
+        fields["progress_total"] = total
+    if message is not None:
+        fields["progress_message"] = message[:255]
+    Job.objects.filter(id=job_id).update(**fields)
+
+    if Job.objects.filter(id=job_id, cancel_requested=True).exists():
+        raise JobCancelled()
+
+
+def claim_next(worker=None):
+    """Claim the oldest runnable job, or return None when the queue is empty."""
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_after__lte=timezone.now())
+            .order_by("run_after", "created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = "running"
+        job.worker = worker or worker_name()
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.save(
+            update_fields=["status", "worker", "attempts", "started_at", "heartbeat_at"]
+        )
+        return job
+
+
+class Heartbeat:
+    """
+    Keeps a running job's heartbeat_at fresh from a background thread, so
+    handlers that rarely report progress are not taken for dead by
+    requeue_stale.
+    """
+
+    def __init__(self, job_id, interval=None):
+        self.job_id = job_id
+        self.interval = interval or getattr(
+            settings, "JOB_HEARTBEAT_SECONDS", HEARTBEAT_INTERVAL
+        )
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    Job.objects.filter(id=self.job_id).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except Exception as e:
+                    logger.warning(f"Heartbeat of job {self.job_id} failed: {e}")
+        finally:
+            # The thread has its own database connection
+            connections.close_all()
+
+
+def _finish(job, status_value, result=None, error=""):
+    job.status = status_value
+    job.result = result
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "finished_at"])
+
+
+def run_job(job):
+    """Run a claimed job to completion, recording its result or error."""
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        _finish(job, "failed", error=f"Unknown job kind: {job.kind}")
+        return job
+
+    if Job.objects.filter(id=job.id, cancel_requested=True).exists():
+        _finish(job, "cancelled")
+        return job
+
+    _current.job_id = job.id
+    _current.last_report = 0.0
+    started = time.monotonic()
+    try:
+        with Heartbeat(job.id):
+            response = handler(job.payload)
+        result = {"status_code": response.status_code, "data": response.data}
+        if response.status_code >= 400:
+            error = ""
+            if isinstance(response.data, dict):
+                error = str(response.data.get("error", ""))
+            _finish(job, "failed", result=result, error=error)
+        else:
+            _finish(job, "succeeded", result=result)
+    except JobCancelled:
+        _finish(job, "cancelled")
+    except Exception as e:
+        logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.error = traceback.format_exc()
+            job.run_after = timezone.now() + timedelta(seconds=30 * job.attempts)
+            job.save(update_fields=["status", "error", "run_after"])
+        else:
+            _finish(job, "failed", error=traceback.format_exc())
+    finally:
+        _current.job_id = None
+
+    logger.info(
+        f"Job {job.id} ({job.kind}) {job.status} in {time.monotonic() - started:.1f}s"
+    )
+    return job
+
+
+def cancel_job(job):
+    """
+    Cancel a job. Queued jobs stop immediately; running jobs stop at their
+    next progress report. Returns False if the job had already finished.
+    """
+    if job.status in Job.FINISHED_STATUSES:
+        return False
+
+    Job.objects.filter(id=job.id).update(cancel_requested=True)
+    Job.objects.filter(id=job.id, status="queued").update(
+        status="cancelled", finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return True
+
+
+def requeue_stale(timeout=None):
+    """
+    Recover jobs whose worker died: running jobs without a heartbeat for
+    timeout seconds are queued again, or failed once out of attempts.
+    """
+    timeout = timeout or getattr(settings, "JOB_STALE_SECONDS", 900)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = Job.objects.filter(status="running").filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True)
+    )
+
+    count = 0
+    for job in stale:
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+        else:
+            job.status = "failed"
+            job.finished_at = timezone.now()
+        job.error = f"Worker {job.worker} stopped responding"
+        job.save(update_fields=["status", "finished_at", "error"])
+        count += 1
+    return count
+
+
+def purge_finished(days=None):
+    """Delete finished jobs older than JOB_RETENTION_DAYS. Returns the count."""
+    days = days if days is not None else getattr(settings, "JOB_RETENTION_DAYS", 14)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(
+        status__in=Job.FINISHED_STATUSES, finished_at__lt=cutoff
+    ).delete()
+    return deleted
+
+
+def serialize_job(job, include_result=True):
+    data = {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "progress_total": job.progress_total,
+        "progress_message": job.progress_message,
+        "cancel_requested": job.cancel_requested,
+        "attempts": job.attempts,
+        "worker": job.worker,
+        "created_by": job.created_by,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_result:
+        data["result"] = job.result
+        data["error"] = job.error
+    return data
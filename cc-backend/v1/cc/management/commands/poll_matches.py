@@ -0,0 +1,120 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from cc.match_polling import OPEN_STATUSES, MatchSchedule
+from cc.models import Match
+from cc.views import MATCH_UPDATERS, apply_match_updates, fetch_match_updates
+
+logger = logging.getLogger(__name__)
+
+# Longest sleep between checks, so stop signals and rescans are not delayed
+MAX_SLEEP = 30
+
+# Sleep after a failed iteration, e.g. while the database is unreachable
+ERROR_SLEEP = 10
+
+
+class Command(BaseCommand):
+    help = "Keep open matches up to date, polling each as often as it needs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Check the matches that are due now, then exit",
+        )
+        parser.add_argument(
+            "--rescan",
+            type=float,
+            default=300.0,
+            help="Seconds between rescans of the open matches in the database",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        schedule = MatchSchedule()
+        batch_size = getattr(settings, "MATCH_POLL_BATCH_SIZE", 50)
+        last_rescan = None
+        self.stdout.write("Match poller started")
+
+        while not self.stopping:
+            close_old_connections()
+            now = timezone.now()
+            match_ids = []
+
+            try:
+                if (
+                    last_rescan is None
+                    or time.monotonic() - last_rescan > options["rescan"]
+                ):
+                    schedule.sync(self.open_matches(), now)
+                    last_rescan = time.monotonic()
+                    self.stdout.write(f"Tracking {len(schedule)} open matches")
+
+                match_ids = schedule.pop_due(now, batch_size)
+                if match_ids:
+                    self.poll(schedule, match_ids)
+                    continue
+            except Exception as e:
+                logger.exception(f"Match poll failed: {str(e)}")
+                # The connection may be broken; reconnect on the next iteration
+                connection.close()
+                # Check the batch again later rather than losing track of it
+                schedule.defer(match_ids, timezone.now())
+                if options["once"]:
+                    break
+                time.sleep(ERROR_SLEEP)
+                continue
+
+            if options["once"]:
+                break
+            next_due = schedule.next_due()
+            wait = MAX_SLEEP
+            if next_due is not None:
+                wait = min(wait, max((next_due - now).total_seconds(), 1))
+            time.sleep(wait)
+
+        self.stdout.write(self.style.SUCCESS("Match poller stopped"))
+
+    def open_matches(self):
+        return Match.objects.filter(
+            status__in=OPEN_STATUSES, platform__in=list(MATCH_UPDATERS)
+        ).only("id", "date", "status")
+
+    def poll(self, schedule, match_ids):
+        """Fetch and apply one batch of due matches, then reschedule them."""
+        matches = list(
+            Match.objects.filter(id__in=match_ids).select_related(
+                "team1", "team2", "winner", "competition", "season"
+            )
+        )
+        fetched, _ = fetch_match_updates(matches)
+        results, updated_count, error_count = apply_match_updates(matches, fetched)
+
+        now = timezone.now()
+        updated_ids = {
+            result["match_id"] for result in results if result["status"] == "updated"
+        }
+        for match in matches:
+            schedule.reschedule(match, str(match.id) in updated_ids, now)
+        # Deleted since the last rescan
+        for match_id in set(match_ids) - {match.id for match in matches}:
+            schedule.drop(match_id)
+
+        self.stdout.write(
+            f"Checked {len(matches)} matches: {updated_count} updated, "
+            f"{error_count} errors"
+        )
+
+    def stop(self, signum, frame):
+        # Finish the current batch, then exit
+        self.stopping = True
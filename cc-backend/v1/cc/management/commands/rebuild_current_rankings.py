@@ -0,0 +1,40 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from cc.models import Season
+from cc.rankings import rebuild_all_current_rankings, rebuild_current_rankings
+
+
+class Command(BaseCommand):
+    help = "Rebuild the current ranking projection from historical ranking snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--season",
+            help="Only rebuild this season (ID)",
+        )
+
+    def handle(self, *args, **options):
+        season_id = options["season"]
+
+        if season_id:
+            try:
+                season = Season.objects.get(id=season_id)
+            except (Season.DoesNotExist, ValidationError):
+                raise CommandError(f"Season with ID {season_id} not found")
+
+            rows = rebuild_current_rankings(season)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {rows} current ranking rows for {season.name}"
+                )
+            )
+            return
+
+        results = rebuild_all_current_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {sum(results.values())} current ranking rows "
+                f"across {len(results)} seasons"
+            )
+        )
@@ -0,0 +1,66 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from cc import views  # noqa: F401 - registers the job handlers
+from cc.jobs import claim_next, purge_finished, requeue_stale, run_job, worker_name
+
+# Seconds between stale job recovery and retention sweeps
+MAINTENANCE_INTERVAL = 300
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs until stopped"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls of an empty queue",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = worker_name()
+        self.stdout.write(f"Job worker {worker} started")
+        last_maintenance = 0.0
+
+        while not self.stopping:
+            close_old_connections()
+
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                requeued = requeue_stale()
+                purged = purge_finished()
+                if requeued or purged:
+                    self.stdout.write(
+                        f"Recovered {requeued} stale jobs, purged {purged} old jobs"
+                    )
+                last_maintenance = time.monotonic()
+
+            job = claim_next(worker)
+            if job is None:
+                if options["burst"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            self.stdout.write(f"Running {job.kind} job {job.id}")
+            run_job(job)
+            self.stdout.write(f"Job {job.id} {job.status}")
+
+        self.stdout.write(self.style.SUCCESS(f"Job worker {worker} stopped"))
+
+    def stop(self, signum, frame):
+        # Finish the current job, then exit
+        self.stopping = True
@@ -0,0 +1,145 @@
+"""
+Adaptive polling schedule for the poll_matches daemon.
+
+Every open match (scheduled or in progress, on a platform with an updater)
+sits in a heap keyed by the time it should next be checked. How often a
+match is checked depends on how close it is to being played:
+
+- in progress, or within KICKOFF_WINDOW of its start: MATCH_POLL_LIVE_SECONDS
+- overdue (start passed but not reported live): MATCH_POLL_LIVE_SECONDS, for
+  up to OVERDUE_GRACE; after that it was most likely never played
+- starting within SOON_WINDOW: MATCH_POLL_SOON_SECONDS
+- anything later, long overdue, or without a date: MATCH_POLL_IDLE_SECONDS
+
+Each check that finds nothing new doubles the interval, up to MAX_BACKOFF
+times the base (and never beyond the idle interval); a change resets it. A
+check that failed is deferred the same way.
+Entries are invalidated lazily: rescheduling or dropping a match leaves its
+old heap entry behind, which is skipped when it comes up.
+"""
+
+import heapq
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+
+OPEN_STATUSES = ("scheduled", "in_progress")
+
+KICKOFF_WINDOW = timedelta(hours=1)
+SOON_WINDOW = timedelta(hours=24)
+OVERDUE_GRACE = timedelta(days=1)
+MAX_BACKOFF = 8
+
+# What the schedule remembers of a match, enough to compute its interval
+ScheduledMatch = namedtuple("ScheduledMatch", ["id", "date", "status"])
+
+
+def base_interval(match, now):
+    """Seconds between checks of a match that keeps changing."""
+    live = getattr(settings, "MATCH_POLL_LIVE_SECONDS", 60)
+    if match.status == "in_progress":
+        return live
+    if match.date is None or match.date + OVERDUE_GRACE < now:
+        return getattr(settings, "MATCH_POLL_IDLE_SECONDS", 21600)
+    if match.date - KICKOFF_WINDOW <= now:
+        return live
+    if match.date - SOON_WINDOW <= now:
+        return getattr(settings, "MATCH_POLL_SOON_SECONDS", 900)
+    return getattr(settings, "MATCH_POLL_IDLE_SECONDS", 21600)
+
+
+def poll_interval(match, now, unchanged=0):
+    """Seconds until the next check, backed off by unchanged checks in a row."""
+    base = base_interval(match, now)
+    idle = getattr(settings, "MATCH_POLL_IDLE_SECONDS", 21600)
+    return min(base * min(2**unchanged, MAX_BACKOFF), max(base, idle))
+
+
+class MatchSchedule:
+    """Heap of open matches ordered by their next check time."""
+
+    def __init__(self):
+        self.heap = []
+        # match id -> (due, unchanged checks in a row, match date, status)
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _push(self, match, due, unchanged):
+        self.entries[match.id] = (due, unchanged, match.date, match.status)
+        heapq.heappush(self.heap, (due, str(match.id), match.id))
+
+    def sync(self, matches, now):
+        """
+        Make the schedule follow the current set of open matches.
+
+        New matches near kickoff or live are due at once, others after their
+        interval. Matches whose date or status changed outside the daemon are
+        rescheduled, and matches that are no longer open are dropped.
+        """
+        seen = set()
+        for match in matches:
+            seen.add(match.id)
+            entry = self.entries.get(match.id)
+            if entry is not None and entry[2:] == (match.date, match.status):
+                continue
+
+            interval = poll_interval(match, now)
+            if interval <= getattr(settings, "MATCH_POLL_LIVE_SECONDS", 60):
+                due = now
+            else:
+                due = now + timedelta(seconds=interval)
+            if entry is not None:
+                due = min(due, entry[0])
+            self._push(match, due, 0)
+
+        for match_id in set(self.entries) - seen:
+            del self.entries[match_id]
+
+    def pop_due(self, now, limit):
+        """Remove and return the ids of up to limit matches due by now."""
+        due_ids = []
+        while self.heap and len(due_ids) < limit:
+            due, _, match_id = self.heap[0]
+            entry = self.entries.get(match_id)
+            if entry is None or entry[0] != due:
+                heapq.heappop(self.heap)  # stale entry
+                continue
+            if due > now:
+                break
+            heapq.heappop(self.heap)
+            due_ids.append(match_id)
+        return due_ids
+
+    def reschedule(self, match, changed, now):
+        """Schedule the next check of a polled match, or drop it if closed."""
+        if match.status not in OPEN_STATUSES:
+            self.drop(match.id)
+            return
+        previous = self.entries.get(match.id)
+        unchanged = 0 if changed or previous is None else previous[1] + 1
+        due = now + timedelta(seconds=poll_interval(match, now, unchanged))
+        self._push(match, due, unchanged)
+
+    def defer(self, match_ids, now):
+        """Put back popped matches whose check failed, backed off as unchanged."""
+        for match_id in match_ids:
+            entry = self.entries.get(match_id)
+            if entry is not None:
+                _, _, date, status = entry
+                self.reschedule(ScheduledMatch(match_id, date, status), False, now)
+
+    def drop(self, match_id):
+        self.entries.pop(match_id, None)
+
+    def next_due(self):
+        """When the earliest live entry is due, or None if nothing is scheduled."""
+        while self.heap:
+            due, _, match_id = self.heap[0]
+            entry = self.entries.get(match_id)
+            if entry is not None and entry[0] == due:
+                return due
+            heapq.heappop(self.heap)
+        return None
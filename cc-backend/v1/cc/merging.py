@@ -0,0 +1,156 @@
+"""
+Set-based team merge.
+
+merge_team moves everything that references the secondary team onto the
+primary one with a fixed number of UPDATE/DELETE statements, regardless of
+how many players, matches or rankings the team has, then deletes the
+secondary team. Everything runs in one transaction; a dry run performs the
+same statements and rolls them back, so the counts it reports are exactly
+those a real merge would change.
+
+Rows that would collide with a row the primary team already has are merged
+or dropped instead of moved:
+
+- participants for the same competition/season: missing platform ids are
+  copied onto the primary's participant and the secondary's is deleted
+- ranking items in the same ranking: the secondary's item is deleted
+- Elo history of the same match: the secondary's row is deleted
+"""
+
+import logging
+
+from django.db import transaction
+
+from .importing import PARTICIPANT_ID_FIELDS
+from .models import (
+    CurrentRankingItem,
+    EloHistory,
+    Event,
+    Match,
+    Participant,
+    Player,
+    RankingItem,
+    Team,
+)
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+
+def merge_participants(primary, secondary):
+    """
+    Move the secondary team's participants to the primary team, merging
+    those for a competition/season the primary already takes part in.
+    Returns (moved, merged).
+    """
+    # One query for both teams' participants, split by competition/season
+    primary_by_key = {}
+    secondary_participants = []
+    for participant in Participant.objects.filter(team__in=[primary, secondary]):
+        key = (participant.competition_id, participant.season_id)
+        if participant.team_id == primary.id:
+            primary_by_key.setdefault(key, participant)
+        else:
+            secondary_participants.append(participant)
+
+    to_move = []
+    to_delete = []
+    changed = {}
+    for participant in secondary_participants:
+        existing = primary_by_key.get(
+            (participant.competition_id, participant.season_id)
+        )
+        if existing is None:
+            to_move.append(participant.id)
+            continue
+
+        for field in PARTICIPANT_ID_FIELDS:
+            if getattr(participant, field) and not getattr(existing, field):
+                setattr(existing, field, getattr(participant, field))
+                changed[existing.id] = existing
+        to_delete.append(participant.id)
+
+    if changed:
+        Participant.objects.bulk_update(changed.values(), PARTICIPANT_ID_FIELDS)
+    Participant.objects.filter(id__in=to_delete).delete()
+    Participant.objects.filter(id__in=to_move).update(team=primary)
+    return len(to_move), len(to_delete)
+
+
+def merge_team(primary, secondary, dry_run=False):
+    """
+    Merge secondary into primary and delete secondary.
+
+    Returns the number of rows changed per kind. With dry_run the changes
+    are rolled back and only the counts are returned.
+    """
+    counts = {}
+    with transaction.atomic():
+        # Lock both teams so concurrent merges of either wait for this one
+        teams = Team.objects.select_for_update().filter(
+            id__in=[primary.id, secondary.id]
+        )
+        list(teams)
+
+        counts["players_moved"] = Player.objects.filter(team=secondary).update(
+            team=primary
+        )
+
+        moved, merged = merge_participants(primary, secondary)
+        counts["participants_moved"] = moved
+        counts["participants_merged"] = merged
+
+        counts["matches_team1"] = Match.objects.filter(team1=secondary).update(
+            team1=primary
+        )
+        counts["matches_team2"] = Match.objects.filter(team2=secondary).update(
+            team2=primary
+        )
+        counts["matches_won"] = Match.objects.filter(winner=secondary).update(
+            winner=primary
+        )
+
+        primary_rankings = RankingItem.objects.filter(team=primary).values(
+            "ranking_id"
+        )
+        counts["ranking_items_dropped"] = RankingItem.objects.filter(
+            team=secondary, ranking_id__in=primary_rankings
+        ).delete()[1].get("cc.RankingItem", 0)
+        counts["ranking_items_moved"] = RankingItem.objects.filter(
+            team=secondary
+        ).update(team=primary)
+        # Current items of dropped ranking items went with them; the rest
+        # belong to rankings the primary team is not in
+        CurrentRankingItem.objects.filter(team=secondary).update(team=primary)
+
+        primary_history = EloHistory.objects.filter(team=primary).values("match_id")
+        EloHistory.objects.filter(
+            team=secondary, match_id__in=primary_history
+        ).delete()
+        counts["elo_history_moved"] = EloHistory.objects.filter(
+            team=secondary
+        ).update(team=primary)
+
+        counts["events_won"] = Event.objects.filter(winner=secondary).update(
+            winner=primary
+        )
+
+        # Queryset delete, so the caller's instance keeps its id on dry runs
+        Team.objects.filter(id=secondary.id).delete()
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run:
+        invalidate_models(
+            Player,
+            Participant,
+            Match,
+            RankingItem,
+            CurrentRankingItem,
+            EloHistory,
+            Event,
+            Team,
+        )
+        logger.info(f"Merged team {secondary.name} into {primary.name}: {counts}")
+    return counts
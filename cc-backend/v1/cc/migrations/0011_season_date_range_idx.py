@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cc', '0010_match_regentsleague_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='season',
+            index=models.Index(fields=['start_date', 'end_date'], name='season_date_range_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0011_season_date_range_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "tag",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
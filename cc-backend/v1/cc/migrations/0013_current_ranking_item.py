@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:59
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0012_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrentRankingItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ranking_date", models.DateTimeField()),
+                (
+                    "rank",
+                    models.IntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
+                (
+                    "elo",
+                    models.IntegerField(
+                        default=1000,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                    ),
+                ),
+                ("previous_rank", models.IntegerField(blank=True, null=True)),
+                (
+                    "ranking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="current_items",
+                        to="cc.ranking",
+                    ),
+                ),
+                (
+                    "ranking_item",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="current_item",
+                        to="cc.rankingitem",
+                    ),
+                ),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="current_ranking_items",
+                        to="cc.season",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="current_ranking_items",
+                        to="cc.team",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["season", "rank"], name="current_ranking_rank_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("season", "team"),
+                        name="current_ranking_season_team_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
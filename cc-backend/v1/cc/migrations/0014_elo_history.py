@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:01
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0013_current_ranking_item"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EloHistory",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("match_date", models.DateTimeField()),
+                ("elo_before", models.IntegerField()),
+                ("elo_after", models.IntegerField()),
+                (
+                    "match",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="elo_history",
+                        to="cc.match",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="elo_history",
+                        to="cc.team",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Elo history",
+                "indexes": [
+                    models.Index(
+                        fields=["team", "match_date", "match"],
+                        name="elo_history_team_idx",
+                    ),
+                    models.Index(fields=["match_date"], name="elo_history_date_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("match", "team"), name="elo_history_match_team_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0015_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="picture_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Resized picture URLs by variant name",
+            ),
+        ),
+        migrations.AddField(
+            model_name="team",
+            name="picture_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Resized picture URLs by variant name",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0016_picture_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FaceitPlayerCache",
+            fields=[
+                (
+                    "game_player_id",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.JSONField(blank=True, null=True)),
+                (
+                    "fetched_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+        ),
+    ]
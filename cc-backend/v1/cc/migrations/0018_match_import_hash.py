@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0017_faceitplayercache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="import_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Hash of the upstream payload this match was last imported from",
+                max_length=64,
+            ),
+        ),
+    ]
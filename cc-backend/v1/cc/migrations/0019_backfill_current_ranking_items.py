@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+def backfill_current_ranking_items(apps, schema_editor):
+    """Fill the projection from each season's latest ranking, as cc.rankings does."""
+    Season = apps.get_model("cc", "Season")
+    Ranking = apps.get_model("cc", "Ranking")
+    RankingItem = apps.get_model("cc", "RankingItem")
+    CurrentRankingItem = apps.get_model("cc", "CurrentRankingItem")
+
+    for season_id in Season.objects.values_list("id", flat=True):
+        rankings = list(
+            Ranking.objects.filter(season_id=season_id).order_by("-date", "-id")[:2]
+        )
+        if not rankings:
+            continue
+        latest = rankings[0]
+
+        previous_ranks = {}
+        if len(rankings) > 1:
+            previous_ranks = dict(
+                RankingItem.objects.filter(ranking=rankings[1]).values_list(
+                    "team_id", "rank"
+                )
+            )
+
+        rows = []
+        seen_teams = set()
+        for item_id, team_id, rank, elo in (
+            RankingItem.objects.filter(ranking=latest)
+            .order_by("rank", "id")
+            .values_list("id", "team_id", "rank", "elo")
+        ):
+            if team_id in seen_teams:
+                continue
+            seen_teams.add(team_id)
+            rows.append(
+                CurrentRankingItem(
+                    season_id=season_id,
+                    team_id=team_id,
+                    ranking=latest,
+                    ranking_item_id=item_id,
+                    ranking_date=latest.date,
+                    rank=rank,
+                    elo=elo,
+                    previous_rank=previous_ranks.get(team_id),
+                )
+            )
+
+        CurrentRankingItem.objects.filter(season_id=season_id).delete()
+        CurrentRankingItem.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cc", "0018_match_import_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_current_ranking_items, migrations.RunPython.noop
+        ),
+    ]
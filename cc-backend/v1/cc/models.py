@@ -1,13 +1,18 @@
 import uuid
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 class Team(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
     picture = models.URLField(blank=True, null=True)
+    picture_variants = models.JSONField(
+        default=dict, blank=True, help_text="Resized picture URLs by variant name"
+    )
     school_name = models.CharField(max_length=100, blank=True, null=True)
     elo = models.IntegerField(default=1000, validators=[MinValueValidator(0)])
     captain = models.ForeignKey(
@@ -32,6 +37,9 @@ class Player(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
     picture = models.URLField(blank=True, null=True)
+    picture_variants = models.JSONField(
+        default=dict, blank=True, help_text="Resized picture URLs by variant name"
+    )
     skill_level = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     steam_id = models.CharField(
         max_length=100, unique=True, blank=True, null=True, db_index=True
@@ -111,6 +119,12 @@ class Match(models.Model):
         max_length=20,
         default="other",
     )
+    import_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Hash of the upstream payload this match was last imported from",
+    )
 
     def __str__(self):
         return (
@@ -118,6 +132,43 @@ class Match(models.Model):
         )
 
 
+class EloHistory(models.Model):
+    """
+    A team's Elo before and after one rated match.
+
+    Written by the Elo replay in cc.elo; match_date is the match date at the
+    time it was rated, so replays can restart from any point in history.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    match = models.ForeignKey(
+        Match, on_delete=models.CASCADE, related_name="elo_history"
+    )
+    team = models.ForeignKey(
+        Team, on_delete=models.CASCADE, related_name="elo_history"
+    )
+    match_date = models.DateTimeField()
+    elo_before = models.IntegerField()
+    elo_after = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.team.name}: {self.elo_before} → {self.elo_after}"
+
+    class Meta:
+        verbose_name_plural = "Elo history"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "team"], name="elo_history_match_team_uniq"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["team", "match_date", "match"], name="elo_history_team_idx"
+            ),
+            models.Index(fields=["match_date"], name="elo_history_date_idx"),
+        ]
+
+
 class Season(models.Model):
     """
     Model representing a season.
@@ -128,6 +179,13 @@ class Season(models.Model):
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["start_date", "end_date"], name="season_date_range_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -214,6 +272,45 @@ class RankingItem(models.Model):
         return f"{self.team.name} - Rank {self.rank} - Elo {self.elo}"
 
 
+class CurrentRankingItem(models.Model):
+    """
+    Projection of the latest ranking of each season, one row per team.
+
+    Rebuilt from Ranking/RankingItem by cc.rankings whenever a snapshot is
+    taken, so current-rank lookups do not have to find the latest ranking first.
+    """
+
+    season = models.ForeignKey(
+        Season, on_delete=models.CASCADE, related_name="current_ranking_items"
+    )
+    team = models.ForeignKey(
+        Team, on_delete=models.CASCADE, related_name="current_ranking_items"
+    )
+    ranking = models.ForeignKey(
+        Ranking, on_delete=models.CASCADE, related_name="current_items"
+    )
+    ranking_item = models.OneToOneField(
+        RankingItem, on_delete=models.CASCADE, related_name="current_item"
+    )
+    ranking_date = models.DateTimeField()
+    rank = models.IntegerField(validators=[MinValueValidator(1)])
+    elo = models.IntegerField(default=1000, validators=[MinValueValidator(0)])
+    previous_rank = models.IntegerField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.team.name} - Rank {self.rank} in {self.season.name}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["season", "team"], name="current_ranking_season_team_uniq"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["season", "rank"], name="current_ranking_rank_idx")
+        ]
+
+
 class Event(models.Model):
     """
     Model representing an event.
@@ -405,3 +502,85 @@ class CustomEvent(models.Model):
     class Meta:
         verbose_name = "Custom Event"
         verbose_name_plural = "Custom Events"
+
+
+class DataVersion(models.Model):
+    """
+    Write counter per model, bumped on every save/delete of that model.
+
+    Public API responses are keyed and ETagged on the versions of the models
+    they read, so a single lookup here tells whether a response is still valid.
+    """
+
+    tag = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.tag} v{self.version}"
+
+
+class Job(models.Model):
+    """
+    A long-running admin operation executed by the run_jobs worker.
+
+    Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any
+    number of them can share the table without a broker.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+    FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    result = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True, default="")
+
+    progress = models.IntegerField(default=0)
+    progress_total = models.IntegerField(blank=True, null=True)
+    progress_message = models.CharField(max_length=255, blank=True, default="")
+    cancel_requested = models.BooleanField(default=False)
+
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=1)
+    worker = models.CharField(max_length=100, blank=True, default="")
+    created_by = models.CharField(max_length=255, blank=True, default="")
+
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_queue_idx"),
+            models.Index(fields=["finished_at"], name="job_finished_idx"),
+        ]
+
+
+class FaceitPlayerCache(models.Model):
+    """
+    Faceit player lookups by Steam ID, kept for FACEIT_PLAYER_CACHE_SECONDS.
+
+    data is the Faceit player payload, or null if Faceit has no such player,
+    so repeated imports do not ask again for players that are not on Faceit.
+    """
+
+    game_player_id = models.CharField(max_length=64, primary_key=True)
+    data = models.JSONField(blank=True, null=True)
+    fetched_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Faceit player {self.game_player_id}"
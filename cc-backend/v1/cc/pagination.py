@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) pagination for the public list endpoints.
+
+Page/page_size pagination needs a COUNT(*) and an OFFSET scan on every request.
+Cursor mode instead seeks directly to the row after (or before) the last one the
+client saw, using the sort field plus the UUID primary key as a tiebreaker, and
+never counts.
+
+Cursors are opaque to clients: urlsafe base64 of a small JSON document holding
+the sort field, the sort value and id of the boundary row, and the direction.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def encode_cursor(sort_field, value, pk, direction):
+    payload = {
+        "f": sort_field,
+        "v": _json_value(value),
+        "id": str(pk),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_field):
+    """Decode a cursor produced for sort_field. Raises InvalidCursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        pk = uuid.UUID(payload["id"])
+        direction = payload["d"]
+        field = payload["f"]
+        value = payload["v"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise InvalidCursor("Invalid cursor")
+
+    # A cursor only makes sense for the ordering it was created with
+    if field != sort_field or direction not in ("next", "prev"):
+        raise InvalidCursor("Invalid cursor")
+
+    return value, pk, direction
+
+
+def _ordering(field, descending, reverse=False):
+    # Nulls always sort after non-null values in the forward direction
+    nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+    if descending != reverse:
+        return [F(field).desc(**nulls), F("id").desc()]
+    return [F(field).asc(**nulls), F("id").asc()]
+
+
+def _after(field, value, pk, descending):
+    """Rows strictly after (value, pk) in forward order."""
+    op = "lt" if descending else "gt"
+    if value is None:
+        return Q(**{f"{field}__isnull": True, f"id__{op}": pk})
+    return (
+        Q(**{f"{field}__{op}": value})
+        | Q(**{field: value, f"id__{op}": pk})
+        | Q(**{f"{field}__isnull": True})
+    )
+
+
+def _before(field, value, pk, descending):
+    """Rows strictly before (value, pk) in forward order."""
+    op = "gt" if descending else "lt"
+    if value is None:
+        return Q(**{f"{field}__isnull": False}) | Q(
+            **{f"{field}__isnull": True, f"id__{op}": pk}
+        )
+    return Q(**{f"{field}__isnull": False}) & (
+        Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk})
+    )
+
+
+def paginate_by_cursor(queryset, sort_field, cursor, page_size):
+    """
+    Return one page of queryset in keyset mode.
+
+    sort_field uses the same "-field" convention as order_by. cursor is the
+    value of the cursor query parameter; an empty string means the first page.
+
+    Returns (items, next_cursor, prev_cursor). Raises InvalidCursor.
+    """
+    descending = sort_field.startswith("-")
+    field = sort_field.lstrip("-")
+
+    direction = "next"
+    if cursor:
+        value, pk, direction = decode_cursor(cursor, sort_field)
+        if direction == "next":
+            queryset = queryset.filter(_after(field, value, pk, descending))
+        else:
+            queryset = queryset.filter(_before(field, value, pk, descending))
+
+    reverse = direction == "prev"
+    rows = list(
+        queryset.order_by(*_ordering(field, descending, reverse))[: page_size + 1]
+    )
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+    if reverse:
+        items.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        first, last = items[0], items[-1]
+        if has_more or reverse:
+            next_cursor = encode_cursor(
+                sort_field, getattr(last, field), last.pk, "next"
+            )
+        if (has_more and reverse) or (cursor and not reverse):
+            prev_cursor = encode_cursor(
+                sort_field, getattr(first, field), first.pk, "prev"
+            )
+
+    return items, next_cursor, prev_cursor
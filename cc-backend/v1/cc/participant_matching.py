@@ -0,0 +1,124 @@
+"""
+Team suggestions for the participant matcher.
+
+A participant still needs matching when it has no team, or when its team
+has no other participants (a team an import created for it, which is often
+a duplicate of an existing one). For such a participant the likeliest teams
+are found from two signals:
+
+- its team name against every team and school name (TrigramIndex)
+- platform ids (faceit_id, playfly_id, regentsleague_id) it shares with a
+  participant of another season, whose team is then the same team
+
+A shared platform id is decisive: such teams score 1, the others their name
+similarity.
+
+The index holds every team and participant id and takes a few queries to
+build, so it is kept per process and rebuilt only when the Team or
+Participant data version changes (see cc.public_cache).
+"""
+
+import threading
+from collections import defaultdict
+
+from .models import Participant, Team
+from .public_cache import data_versions
+from .similarity import TrigramIndex
+
+ID_FIELDS = ("faceit_id", "playfly_id", "regentsleague_id")
+VERSION_TAGS = ["Team", "Participant"]
+
+_lock = threading.Lock()
+_cached = None  # (versions, SuggestionIndex)
+
+
+class SuggestionIndex:
+    """In-memory name and platform id indexes over teams and participants."""
+
+    def __init__(self, teams, participants):
+        self.teams = {team["id"]: team for team in teams}
+        self.names = TrigramIndex()
+        for team in teams:
+            self.names.add(team["id"], team["name"])
+            if team["school_name"]:
+                self.names.add(team["id"], team["school_name"])
+
+        # (field, value) -> [(team id, season id)]
+        self.ids = defaultdict(list)
+        for participant in participants:
+            for field in ID_FIELDS:
+                if participant[field]:
+                    self.ids[(field, participant[field])].append(
+                        (participant["team_id"], participant["season_id"])
+                    )
+
+    @classmethod
+    def build(cls):
+        teams = list(Team.objects.values("id", "name", "school_name", "picture"))
+        participants = Participant.objects.filter(team__isnull=False).values(
+            "team_id", "season_id", *ID_FIELDS
+        )
+        return cls(teams, participants)
+
+    def suggest(self, participant, limit=5, min_score=0.3):
+        """
+        Best teams for a participant (a dict with team_id, team__name,
+        season_id and the platform id fields), best first.
+        """
+        shared_ids = defaultdict(list)
+        for field in ID_FIELDS:
+            if not participant[field]:
+                continue
+            for team_id, season_id in self.ids.get((field, participant[field]), ()):
+                if season_id != participant["season_id"]:
+                    if field not in shared_ids[team_id]:
+                        shared_ids[team_id].append(field)
+
+        name_scores = {}
+        if participant["team__name"]:
+            # One extra in case the participant's own team is among them
+            name_scores = dict(
+                self.names.search(
+                    participant["team__name"], limit=limit + 1, min_score=min_score
+                )
+            )
+
+        suggestions = []
+        for team_id in set(name_scores) | set(shared_ids):
+            if team_id == participant["team_id"]:
+                continue
+            name_score = name_scores.get(team_id, 0.0)
+            score = 1.0 if shared_ids.get(team_id) else name_score
+            team = self.teams[team_id]
+            suggestions.append(
+                {
+                    "team_id": team_id,
+                    "team_name": team["name"],
+                    "school_name": team["school_name"],
+                    "picture": team["picture"],
+                    "score": round(score, 3),
+                    "name_score": round(name_score, 3),
+                    "shared_ids": shared_ids.get(team_id, []),
+                }
+            )
+
+        suggestions.sort(
+            key=lambda item: (-item["score"], -item["name_score"], item["team_name"])
+        )
+        return suggestions[:limit]
+
+
+def suggestion_index():
+    """The SuggestionIndex for the current data, rebuilt when it changed."""
+    global _cached
+    versions = data_versions(VERSION_TAGS)
+    cached = _cached
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+
+    with _lock:
+        if _cached is not None and _cached[0] == versions:
+            return _cached[1]
+        index = SuggestionIndex.build()
+        _cached = (versions, index)
+        return index
@@ -0,0 +1,118 @@
+"""
+In-process TTL cache with request coalescing for upstream API proxies.
+
+Entries are keyed by upstream URL. A fresh entry is served without contacting
+the upstream. Otherwise the first caller fetches ("single flight") while
+concurrent callers for the same key wait for its result instead of sending
+their own request. If the fetch fails, an expired entry that is still within
+its stale window is served instead of the error.
+
+The cache is per worker process and bounded to max_entries (least recently
+used entries are dropped first).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+HIT = "HIT"
+MISS = "MISS"
+STALE = "STALE"
+BYPASS = "BYPASS"
+
+
+class UpstreamError(Exception):
+    """An upstream response that should be reported with the given status."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _Entry:
+    def __init__(self, value, ttl, stale_seconds):
+        now = time.monotonic()
+        self.value = value
+        self.expires_at = now + ttl
+        self.stale_until = self.expires_at + stale_seconds
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ProxyCache:
+    def __init__(self, max_entries=1000, stale_seconds=86400):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.counts = {HIT: 0, MISS: 0, STALE: 0, BYPASS: 0, "coalesced": 0}
+
+    def get(self, key, ttl, fetch, refresh=False):
+        """
+        Return (value, state) for key, calling fetch() when it is missing,
+        expired or refresh is set. state is HIT, MISS, STALE or BYPASS.
+        Raises fetch()'s exception if there is no stale entry to fall back on.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not refresh and time.monotonic() < entry.expires_at:
+                self.entries.move_to_end(key)
+                self.counts[HIT] += 1
+                return entry.value, HIT
+
+            flight = self.inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.inflight[key] = _Flight()
+            else:
+                self.counts["coalesced"] += 1
+
+        if leader:
+            try:
+                flight.value = fetch()
+            except Exception as e:
+                flight.error = e
+            with self.lock:
+                if flight.error is None:
+                    self._store(key, flight.value, ttl)
+                del self.inflight[key]
+            flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is None:
+            state = BYPASS if refresh else MISS
+            with self.lock:
+                self.counts[state] += 1
+            return flight.value, state
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and time.monotonic() < entry.stale_until:
+                self.counts[STALE] += 1
+                logger.warning(f"Serving stale {key} after error: {flight.error}")
+                return entry.value, STALE
+        raise flight.error
+
+    def _store(self, key, value, ttl):
+        self.entries[key] = _Entry(value, ttl, self.stale_seconds)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), **self.counts}
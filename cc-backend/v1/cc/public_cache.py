@@ -0,0 +1,303 @@
+"""
+Tag-invalidated response cache and conditional GET for the public API.
+
+Each public endpoint is tagged with the model types it reads. Every tag has a
+DataVersion row that is bumped on post_save/post_delete (see cc.signals) or
+explicitly after bulk operations via invalidate_models. The tags a
+transaction changes are collected and bumped once, in sorted order, after it
+commits, so concurrent writers never hold locks on the shared version rows.
+A response built in between is stored under the old version and simply
+missed once the bump lands.
+
+A request costs one version lookup. The versions (plus endpoint, normalized
+query parameters and path arguments) give both the strong ETag and the cache
+key, so a matching If-None-Match is answered with 304 before the view runs,
+and a changed version makes every dependent cache entry unreachable without
+having to find and delete it.
+
+Views that depend on the current season, which changes with the date rather
+than with a write, add its id to the fingerprint and send no Last-Modified.
+
+The "public_api" cache alias is configured in settings and defaults to local
+memory per worker; entries expire after PUBLIC_API_CACHE_TIMEOUT.
+"""
+
+import hashlib
+import logging
+import threading
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import DataVersion
+from .seasons import current_season
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "public_api"
+
+# Endpoint name -> tags, filled in by the decorator
+_registry = {}
+
+# Tags changed by this thread's current transaction, bumped once it commits
+_pending = threading.local()
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _enabled():
+    return getattr(settings, "PUBLIC_API_CACHE_ENABLED", True)
+
+
+def _tag_for(model):
+    return model if isinstance(model, str) else model.__name__
+
+
+def _incr(key):
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key missing or evicted; add() keeps a concurrent first write intact
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def data_versions(tags):
+    """Return {tag: (version, updated_at)}; tags never written are (0, None)."""
+    rows = DataVersion.objects.filter(tag__in=tags).values_list(
+        "tag", "version", "updated_at"
+    )
+    versions = {tag: (version, updated_at) for tag, version, updated_at in rows}
+    return {tag: versions.get(tag, (0, None)) for tag in tags}
+
+
+def _fingerprint(name, request, kwargs, versions, season_id=None):
+    params = sorted(
+        (key, sorted(values))
+        for key, values in request.query_params.lists()
+        if any(values)
+    )
+    path_args = sorted((key, str(value)) for key, value in kwargs.items())
+    # updated_at is included so a version number reused after a rollback or a
+    # reset can never match an entry from before it
+    version_parts = [
+        (tag, version, updated_at.isoformat() if updated_at else None)
+        for tag, (version, updated_at) in sorted(versions.items())
+    ]
+    raw = repr((name, params, path_args, version_parts, season_id))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _last_modified(versions):
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at]
+    return max(timestamps) if timestamps else None
+
+
+def _not_modified(request, etag, last_modified):
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent."""
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        client_etags = parse_etags(if_none_match)
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        return "*" in client_etags or any(
+            client_etag.removeprefix("W/") == etag for client_etag in client_etags
+        )
+
+    if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+    if if_modified_since and last_modified:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(last_modified.timestamp()) <= since
+
+    return False
+
+
+def _add_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # Let clients store the payload but always revalidate it
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def cache_public_response(*models, uses_current_season=False):
+    """
+    Serve a public GET view with ETags, 304s and a tag-invalidated cache.
+
+    Apply below @api_view so the view receives a DRF request. Pass
+    uses_current_season=True when the response depends on current_season().
+    """
+    tags = sorted({_tag_for(model) for model in models})
+
+    def decorator(view_func):
+        name = view_func.__name__
+        _registry[name] = tags
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            versions = data_versions(tags)
+            season_id = None
+            last_modified = _last_modified(versions)
+            if uses_current_season:
+                season = current_season()
+                season_id = season.id if season else None
+                # The season rolls over without a write, so the version
+                # timestamps say nothing about when this response changed
+                last_modified = None
+            fingerprint = _fingerprint(name, request, kwargs, versions, season_id)
+            etag = quote_etag(fingerprint)
+
+            if _not_modified(request, etag, last_modified):
+                _incr(f"stats:not_modified:{name}")
+                return _add_validators(
+                    Response(status=status.HTTP_304_NOT_MODIFIED),
+                    etag,
+                    last_modified,
+                )
+
+            if not _enabled():
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    _add_validators(response, etag, last_modified)
+                return response
+
+            key = f"response:{name}:{fingerprint}"
+            cached = _cache().get(key)
+            if cached is not None:
+                _incr(f"stats:hits:{name}")
+                return _add_validators(Response(cached), etag, last_modified)
+
+            _incr(f"stats:misses:{name}")
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                _cache().set(
+                    key,
+                    response.data,
+                    timeout=getattr(settings, "PUBLIC_API_CACHE_TIMEOUT", 300),
+                )
+                _add_validators(response, etag, last_modified)
+            return response
+
+        return _wrapped
+
+    return decorator
+
+
+def _bump_pending():
+    tags = sorted(getattr(_pending, "tags", ()))
+    _pending.tags = set()
+    if not tags:
+        return
+
+    now = timezone.now()
+    try:
+        updated = DataVersion.objects.filter(tag__in=tags).update(
+            version=F("version") + 1, updated_at=now
+        )
+        if updated < len(tags):
+            DataVersion.objects.bulk_create(
+                [DataVersion(tag=tag, version=1, updated_at=now) for tag in tags],
+                ignore_conflicts=True,
+            )
+    except Exception as e:
+        # The data is already committed; entries expire after the timeout
+        logger.error(f"Failed to bump data versions of {tags}: {str(e)}")
+        return
+
+    try:
+        for tag in tags:
+            _incr(f"stats:invalidations:{tag}")
+    except Exception as e:
+        # Stats must never break a write path
+        logger.warning(f"Failed to record invalidation of {tags}: {str(e)}")
+
+
+def invalidate_tags(*tags):
+    """
+    Bump the data version of the given tags once the current transaction
+    commits (immediately outside a transaction).
+
+    Tags from every write of a transaction are bumped together by the first
+    of its commit callbacks; tags of a rolled back transaction are bumped
+    with the next commit, which only costs a cache miss.
+    """
+    if not tags:
+        return
+
+    if not hasattr(_pending, "tags"):
+        _pending.tags = set()
+    _pending.tags.update(tags)
+    transaction.on_commit(_bump_pending)
+
+
+def invalidate_models(*models):
+    """
+    Invalidate responses that depend on the given models.
+
+    Call this after QuerySet.update(), bulk_create(), bulk_update() or raw SQL,
+    none of which send post_save/post_delete.
+    """
+    invalidate_tags(*(_tag_for(model) for model in models))
+
+
+def cache_stats():
+    """Hit/miss/304 counters per endpoint and version/invalidations per tag."""
+    cache = _cache()
+    all_tags = sorted({tag for tags in _registry.values() for tag in tags})
+
+    counters = cache.get_many(
+        [
+            f"stats:{kind}:{name}"
+            for kind in ("hits", "misses", "not_modified")
+            for name in _registry
+        ]
+        + [f"stats:invalidations:{tag}" for tag in all_tags]
+    )
+    versions = data_versions(all_tags)
+
+    endpoints = {}
+    total_hits = 0
+    total_misses = 0
+    total_not_modified = 0
+    for name in sorted(_registry):
+        hits = counters.get(f"stats:hits:{name}", 0)
+        misses = counters.get(f"stats:misses:{name}", 0)
+        not_modified = counters.get(f"stats:not_modified:{name}", 0)
+        total_hits += hits
+        total_misses += misses
+        total_not_modified += not_modified
+        endpoints[name] = {
+            "hits": hits,
+            "misses": misses,
+            "not_modified": not_modified,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "tags": _registry[name],
+        }
+
+    return {
+        "enabled": _enabled(),
+        "backend": settings.CACHES[CACHE_ALIAS]["BACKEND"],
+        "hits": total_hits,
+        "misses": total_misses,
+        "not_modified": total_not_modified,
+        "endpoints": endpoints,
+        "tags": {
+            tag: {
+                "version": versions[tag][0],
+                "updated_at": versions[tag][1],
+                "invalidations": counters.get(f"stats:invalidations:{tag}", 0),
+            }
+            for tag in all_tags
+        },
+    }
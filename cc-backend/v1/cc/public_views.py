@@ -4,11 +4,13 @@ from rest_framework import status
 from django.db.models import Q
 from django.core.paginator import Paginator
 from django.utils.dateparse import parse_datetime
-from datetime import datetime
 import uuid
 
 from .models import (
     Team,
+    Competition,
+    CurrentRankingItem,
+    CustomEvent,
     Event,
     EventMatch,
     Player,
@@ -18,6 +20,9 @@ from .models import (
     Ranking,
     RankingItem,
 )
+from .pagination import InvalidCursor, paginate_by_cursor
+from .public_cache import cache_public_response
+from .seasons import current_season as get_current_season
 
 # Maximum items per page
 MAX_PAGE_SIZE = 100
@@ -30,7 +35,147 @@ def safe_uuid(value):
     return uuid.UUID(value)
 
 
+def paginate(request, queryset, sort_field, page, page_size):
+    """
+    Paginate a queryset for a public list endpoint.
+
+    Uses page/page_size by default. When the request carries a cursor parameter
+    (an empty value means the first page) it switches to keyset pagination,
+    which skips the COUNT query and returns next_cursor/prev_cursor instead.
+
+    Returns (items, result) where result is the response dict with an empty
+    "results" list. Raises InvalidCursor.
+    """
+    if "cursor" in request.query_params:
+        items, next_cursor, prev_cursor = paginate_by_cursor(
+            queryset, sort_field, request.query_params["cursor"], page_size
+        )
+        return items, {
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "results": [],
+        }
+
+    paginator = Paginator(queryset, page_size)
+
+    try:
+        items = paginator.page(page)
+    except Exception:
+        items = paginator.page(paginator.num_pages)
+
+    return items, {
+        "count": paginator.count,
+        "total_pages": paginator.num_pages,
+        "current_page": page,
+        "page_size": page_size,
+        "results": [],
+    }
+
+
+def resolve_team_context(team_ids, current_season):
+    """
+    Batch-resolve the per-team data shown alongside each team in one pass.
+
+    Returns (competitions_by_team, current_rankings_by_team) built from a
+    constant number of queries regardless of how many teams are passed.
+    """
+    competitions_by_team = {}
+    current_rankings_by_team = {}
+
+    if not team_ids or not current_season:
+        return competitions_by_team, current_rankings_by_team
+
+    participants = Participant.objects.filter(
+        team_id__in=team_ids, season=current_season, competition__isnull=False
+    ).select_related("competition")
+    for participant in participants:
+        competitions_by_team.setdefault(participant.team_id, []).append(
+            {
+                "id": participant.competition.id,
+                "name": participant.competition.name,
+            }
+        )
+
+    for item in CurrentRankingItem.objects.filter(
+        season=current_season, team_id__in=team_ids
+    ):
+        current_rankings_by_team[item.team_id] = item
+
+    return competitions_by_team, current_rankings_by_team
+
+
+def serialize_teams(teams):
+    """
+    Serialize a page of teams with captain, current competitions and current ranking.
+
+    Teams should be fetched with select_related("captain"). The current season is
+    resolved once and everything else comes from in-memory maps.
+    """
+    current_season = get_current_season()
+    team_ids = [team.id for team in teams]
+    competitions_by_team, current_rankings_by_team = resolve_team_context(
+        team_ids, current_season
+    )
+
+    results = []
+    for team in teams:
+        captain = None
+        if team.captain:
+            captain = {
+                "id": team.captain.id,
+                "name": team.captain.name,
+                "picture": team.captain.picture,
+                "picture_variants": team.captain.picture_variants,
+            }
+
+        current_ranking = None
+        ranking_item = current_rankings_by_team.get(team.id)
+        if ranking_item:
+            current_ranking = {
+                "id": ranking_item.ranking_item_id,
+                "rank": ranking_item.rank,
+                "previous_rank": ranking_item.previous_rank,
+                "elo": ranking_item.elo,
+                "ranking": {
+                    "id": ranking_item.ranking_id,
+                    "date": ranking_item.ranking_date,
+                },
+                "season": {
+                    "id": current_season.id,
+                    "name": current_season.name,
+                },
+            }
+
+        results.append(
+            {
+                "id": team.id,
+                "name": team.name,
+                "picture": team.picture,
+                "picture_variants": team.picture_variants,
+                "school_name": team.school_name,
+                "elo": team.elo,
+                "captain": captain,
+                "current_competitions": competitions_by_team.get(team.id, []),
+                "current_ranking": current_ranking,
+            }
+        )
+
+    return results
+
+
 @api_view(["GET"])
+@cache_public_response(
+    Team,
+    Player,
+    Participant,
+    Competition,
+    Season,
+    Ranking,
+    RankingItem,
+    CurrentRankingItem,
+    uses_current_season=True,
+)
 def public_teams(request):
     """
     Public API endpoint to fetch teams with various filters.
@@ -44,6 +189,8 @@ def public_teams(request):
     - event_id: Filter teams that have matches in a specific event
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Opt into cursor pagination (empty for the first page, then
+      next_cursor/prev_cursor from the previous response). Skips the total count.
     - sort: Sort field (default: name)
     - order: Sort order (asc or desc, default: asc)
     - season_id: Filter teams that participated in a specific season
@@ -154,113 +301,21 @@ def public_teams(request):
 
     query &= ~Q(name__icontains="bye")
 
-    teams = Team.objects.filter(query).order_by(sort_field)
+    teams = Team.objects.filter(query).select_related("captain").order_by(sort_field)
 
     # Paginate
-    paginator = Paginator(teams, page_size)
-
     try:
-        paginated_teams = paginator.page(page)
-    except Exception:
-        paginated_teams = paginator.page(paginator.num_pages)
-
-    # Format response
-    result = {
-        "count": paginator.count,
-        "total_pages": paginator.num_pages,
-        "current_page": page,
-        "page_size": page_size,
-        "results": [],
-    }
+        paginated_teams, result = paginate(request, teams, sort_field, page, page_size)
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
-    for team in paginated_teams:
-        captain = None
-        if team.captain:
-            captain = {
-                "id": team.captain.id,
-                "name": team.captain.name,
-                "picture": team.captain.picture,
-            }
-
-        # Get current competitions for the team
-        current_competitions = []
-        today = datetime.now().date()
-
-        # Find current season - convert datetime fields to dates for comparison
-        current_season = None
-        for season in Season.objects.all():
-            if (
-                season.start_date
-                and season.end_date
-                and season.start_date.date() <= today <= season.end_date.date()
-            ):
-                current_season = season
-                break
-
-        print(f"Today: {today}")
-        print(f"Current season: {current_season}")
-
-        if current_season:
-            # Get all the team's current participations in this season
-            current_participants = (
-                Participant.objects.filter(team=team, season=current_season)
-                .select_related("competition")
-                .all()
-            )
-
-            for participant in current_participants:
-                if participant.competition:
-                    current_competitions.append(
-                        {
-                            "id": participant.competition.id,
-                            "name": participant.competition.name,
-                        }
-                    )
-
-        # Get current ranking for the team
-        current_ranking = None
-        if current_season:
-            # Get the latest ranking for the current season
-            latest_ranking = (
-                Ranking.objects.filter(season=current_season).order_by("-date").first()
-            )
-            if latest_ranking:
-                # Get the team's ranking item in this ranking
-                ranking_item = RankingItem.objects.filter(
-                    ranking=latest_ranking, team=team
-                ).first()
-                if ranking_item:
-                    current_ranking = {
-                        "id": ranking_item.id,
-                        "rank": ranking_item.rank,
-                        "elo": ranking_item.elo,
-                        "ranking": {
-                            "id": latest_ranking.id,
-                            "date": latest_ranking.date,
-                        },
-                        "season": {
-                            "id": current_season.id,
-                            "name": current_season.name,
-                        },
-                    }
-
-        result["results"].append(
-            {
-                "id": team.id,
-                "name": team.name,
-                "picture": team.picture,
-                "school_name": team.school_name,
-                "elo": team.elo,
-                "captain": captain,
-                "current_competitions": current_competitions,
-                "current_ranking": current_ranking,
-            }
-        )
+    result["results"] = serialize_teams(list(paginated_teams))
 
     return Response(result)
 
 
 @api_view(["GET"])
+@cache_public_response(Player, Team, Season)
 def public_players(request):
     """
     Public API endpoint to fetch players with various filters.
@@ -275,6 +330,8 @@ def public_players(request):
     - benched: Filter by bench status (true/false)
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Opt into cursor pagination (empty for the first page, then
+      next_cursor/prev_cursor from the previous response). Skips the total count.
     - sort: Sort field (default: name)
     - order: Sort order (asc or desc, default: asc)
     - season_id: Filter players that participated in a specific season
@@ -358,21 +415,12 @@ def public_players(request):
     players = Player.objects.filter(query).order_by(sort_field)
 
     # Paginate
-    paginator = Paginator(players, page_size)
-
     try:
-        paginated_players = paginator.page(page)
-    except Exception:
-        paginated_players = paginator.page(paginator.num_pages)
-
-    # Format response
-    result = {
-        "count": paginator.count,
-        "total_pages": paginator.num_pages,
-        "current_page": page,
-        "page_size": page_size,
-        "results": [],
-    }
+        paginated_players, result = paginate(
+            request, players, sort_field, page, page_size
+        )
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     for player in paginated_players:
         team = None
@@ -381,6 +429,7 @@ def public_players(request):
                 "id": player.team.id,
                 "name": player.team.name,
                 "picture": player.team.picture,
+                "picture_variants": player.team.picture_variants,
             }
 
         result["results"].append(
@@ -388,6 +437,7 @@ def public_players(request):
                 "id": player.id,
                 "name": player.name,
                 "picture": player.picture,
+                "picture_variants": player.picture_variants,
                 "skill_level": player.skill_level,
                 "steam_id": player.steam_id,
                 "faceit_id": player.faceit_id,
@@ -402,6 +452,7 @@ def public_players(request):
 
 
 @api_view(["GET"])
+@cache_public_response(Match, Team, Season, Competition, Event, EventMatch)
 def public_matches(request):
     """
     Public API endpoint to fetch matches with various filters.
@@ -420,6 +471,8 @@ def public_matches(request):
     - event_id: Filter by event ID (matches that are part of a specific event)
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Opt into cursor pagination (empty for the first page, then
+      next_cursor/prev_cursor from the previous response). Skips the total count.
     - sort: Sort field (default: -date for most recent first)
     - order: Sort order (asc or desc, default: asc)
 
@@ -436,7 +489,7 @@ def public_matches(request):
     team_id = request.query_params.get("team_id", "")
     team_id_1 = request.query_params.get("team_id_1", "")
     team_id_2 = request.query_params.get("team_id_2", "")
-    status = request.query_params.get("status", "")
+    status_filter = request.query_params.get("status", "")
     platform = request.query_params.get("platform", "")
     date_from = request.query_params.get("date_from", "")
     date_to = request.query_params.get("date_to", "")
@@ -495,8 +548,8 @@ def public_matches(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    if status and status in ["scheduled", "in_progress", "completed", "cancelled"]:
-        query &= Q(status=status)
+    if status_filter in ["scheduled", "in_progress", "completed", "cancelled"]:
+        query &= Q(status=status_filter)
 
     if platform and platform in ["faceit", "playfly"]:
         query &= Q(platform=platform)
@@ -580,21 +633,12 @@ def public_matches(request):
     )
 
     # Paginate
-    paginator = Paginator(matches, page_size)
-
     try:
-        paginated_matches = paginator.page(page)
-    except Exception:
-        paginated_matches = paginator.page(paginator.num_pages)
-
-    # Format response
-    result = {
-        "count": paginator.count,
-        "total_pages": paginator.num_pages,
-        "current_page": page,
-        "page_size": page_size,
-        "results": [],
-    }
+        paginated_matches, result = paginate(
+            request, matches, sort_field, page, page_size
+        )
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     for match in paginated_matches:
         winner = None
@@ -631,12 +675,14 @@ def public_matches(request):
                     "id": match.team1.id,
                     "name": match.team1.name,
                     "picture": match.team1.picture,
+                    "picture_variants": match.team1.picture_variants,
                     "elo": match.team1.elo,
                 },
                 "team2": {
                     "id": match.team2.id,
                     "name": match.team2.name,
                     "picture": match.team2.picture,
+                    "picture_variants": match.team2.picture_variants,
                     "elo": match.team2.elo,
                 },
                 "date": match.date,
@@ -663,6 +709,7 @@ def public_matches(request):
 
 
 @api_view(["GET"])
+@cache_public_response(Season, uses_current_season=True)
 def public_seasons(request):
     """
     Public API endpoint to fetch seasons.
@@ -707,9 +754,10 @@ def public_seasons(request):
     if season_ids:
         query &= Q(id__in=season_ids)
 
+    current_season = get_current_season()
+
     if current.lower() == "true":
-        today = datetime.now().date()
-        query &= Q(start_date__lte=today, end_date__gte=today)
+        query &= Q(id=current_season.id) if current_season else Q(pk__in=[])
 
     seasons = Season.objects.filter(query).order_by(sort_field)
 
@@ -730,13 +778,7 @@ def public_seasons(request):
     }
 
     for season in paginated_seasons:
-        # Convert datetime to date for comparison if needed
-        current_date = datetime.now().date()
-        is_current = False
-        if season.start_date and season.end_date:
-            is_current = (
-                season.start_date.date() <= current_date <= season.end_date.date()
-            )
+        is_current = current_season is not None and season.id == current_season.id
 
         result["results"].append(
             {
@@ -752,6 +794,7 @@ def public_seasons(request):
 
 
 @api_view(["GET"])
+@cache_public_response(Ranking, Season)
 def public_rankings(request):
     """
     Public API endpoint to fetch rankings with various filters.
@@ -831,6 +874,7 @@ def public_rankings(request):
 
 
 @api_view(["GET"])
+@cache_public_response(RankingItem, Ranking, Team, Season)
 def public_ranking_items(request):
     """
     Public API endpoint to fetch ranking items for a specific ranking.
@@ -839,6 +883,8 @@ def public_ranking_items(request):
     - ranking_id: Filter by ranking ID (required)
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Opt into cursor pagination (empty for the first page, then
+      next_cursor/prev_cursor from the previous response). Skips the total count.
     - sort: Sort field (default: rank)
     - order: Sort order (asc or desc, default: asc)
 
@@ -885,21 +931,12 @@ def public_ranking_items(request):
         .order_by(sort_field)
     )
 
-    paginator = Paginator(ranking_items, page_size)
-
     try:
-        paginated_items = paginator.page(page)
-    except Exception:
-        paginated_items = paginator.page(paginator.num_pages)
-
-    # Format response
-    result = {
-        "count": paginator.count,
-        "total_pages": paginator.num_pages,
-        "current_page": page,
-        "page_size": page_size,
-        "results": [],
-    }
+        paginated_items, result = paginate(
+            request, ranking_items, sort_field, page, page_size
+        )
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     for item in paginated_items:
         result["results"].append(
@@ -911,6 +948,7 @@ def public_ranking_items(request):
                     "id": item.team.id,
                     "name": item.team.name,
                     "picture": item.team.picture,
+                    "picture_variants": item.team.picture_variants,
                     "school_name": item.team.school_name,
                 },
                 "ranking": {
@@ -924,6 +962,14 @@ def public_ranking_items(request):
 
 
 @api_view(["GET"])
+@cache_public_response(
+    CurrentRankingItem,
+    RankingItem,
+    Ranking,
+    Team,
+    Season,
+    uses_current_season=True,
+)
 def public_team_current_ranking(request):
     """
     Public API endpoint to fetch a team's current ranking by team ID.
@@ -953,19 +999,7 @@ def public_team_current_ranking(request):
 
     # Determine season
     if not season_id:
-        today = datetime.now().date()
-        current_season = None
-
-        # Find current season - convert datetime fields to dates for comparison
-        for season in Season.objects.all():
-            if (
-                season.start_date
-                and season.end_date
-                and season.start_date.date() <= today <= season.end_date.date()
-            ):
-                current_season = season
-                break
-
+        current_season = get_current_season()
         if not current_season:
             return Response(
                 {"error": "No current season found"},
@@ -981,52 +1015,50 @@ def public_team_current_ranking(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-    # Get latest ranking for season
-    ranking = Ranking.objects.filter(season_id=season_id).order_by("-date").first()
-    if not ranking:
-        return Response(
-            {"error": "No ranking found for this season"},
-            status=status.HTTP_404_NOT_FOUND,
-        )
-
-    # Get ranking item for team
+    # Team's entry in the season's latest ranking
     item = (
-        RankingItem.objects.filter(ranking_id=ranking.id, team_id=team_id)
-        .select_related("team", "ranking")
+        CurrentRankingItem.objects.filter(season_id=season_id, team_id=team_id)
+        .select_related("team", "season")
         .first()
     )
     if not item:
+        if not Ranking.objects.filter(season_id=season_id).exists():
+            return Response(
+                {"error": "No ranking found for this season"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         return Response(
             {"error": "No ranking item found for this team in the current ranking"},
             status=status.HTTP_404_NOT_FOUND,
         )
 
     result = {
-        "id": item.id,
+        "id": item.ranking_item_id,
         "rank": item.rank,
+        "previous_rank": item.previous_rank,
         "elo": item.elo,
         "team": {
             "id": item.team.id,
             "name": item.team.name,
             "picture": item.team.picture,
+            "picture_variants": item.team.picture_variants,
             "school_name": item.team.school_name,
         },
         "ranking": {
-            "id": item.ranking.id,
-            "date": item.ranking.date,
+            "id": item.ranking_id,
+            "date": item.ranking_date,
         },
         "season": {
-            "id": ranking.season.id,
-            "name": ranking.season.name,
-        }
-        if ranking.season
-        else None,
+            "id": item.season.id,
+            "name": item.season.name,
+        },
     }
 
     return Response(result)
 
 
 @api_view(["GET"])
+@cache_public_response(Event, CustomEvent, Team, Season)
 def public_events(request):
     """
     Public API endpoint to fetch events with various filters.
@@ -1039,6 +1071,8 @@ def public_events(request):
     - public_only: Only show public events (default: true)
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Opt into cursor pagination (empty for the first page, then
+      next_cursor/prev_cursor from the previous response). Skips the total count.
     - sort: Sort field (default: start_date)
     - order: Sort order (asc or desc, default: desc)
 
@@ -1117,14 +1151,17 @@ def public_events(request):
         order = "desc"
 
     order_prefix = "" if order == "asc" else "-"
-    queryset = queryset.order_by(f"{order_prefix}{sort_field}")
+    sort_field = f"{order_prefix}{sort_field}"
+    queryset = queryset.order_by(sort_field)
 
     # Paginate results
-    paginator = Paginator(queryset, page_size)
-    page_obj = paginator.get_page(page)
+    try:
+        page_obj, result = paginate(request, queryset, sort_field, page, page_size)
+    except InvalidCursor:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
     # Serialize results
-    results = []
+    results = result["results"]
     for event in page_obj:
         # Check if there's a custom event associated
         custom_event = getattr(event, "custom_details", None)
@@ -1140,6 +1177,7 @@ def public_events(request):
                 "id": event.winner.id,
                 "name": event.winner.name,
                 "picture": event.winner.picture,
+                "picture_variants": event.winner.picture_variants,
                 "school_name": event.winner.school_name,
             }
             if event.winner
@@ -1183,18 +1221,11 @@ def public_events(request):
 
         results.append(event_data)
 
-    return Response(
-        {
-            "count": paginator.count,
-            "total_pages": paginator.num_pages,
-            "current_page": page,
-            "page_size": page_size,
-            "results": results,
-        }
-    )
+    return Response(result)
 
 
 @api_view(["GET"])
+@cache_public_response(Event, CustomEvent, EventMatch, Match, Team, Season)
 def public_event_detail(request, event_id):
     """
     Public API endpoint to fetch a single event by ID.
@@ -1225,6 +1256,7 @@ def public_event_detail(request, event_id):
                 "id": event.winner.id,
                 "name": event.winner.name,
                 "picture": event.winner.picture,
+                "picture_variants": event.winner.picture_variants,
                 "school_name": event.winner.school_name,
             }
             if event.winner
@@ -1277,6 +1309,7 @@ def public_event_detail(request, event_id):
 
 
 @api_view(["GET"])
+@cache_public_response(Match, Team)
 def public_team_recent_form(request):
     """
     Public API endpoint to fetch a team's recent match form.
@@ -1335,6 +1368,7 @@ def public_team_recent_form(request):
                     "id": opponent.id,
                     "name": opponent.name,
                     "picture": opponent.picture,
+                    "picture_variants": opponent.picture_variants,
                 },
             }
         )
@@ -1342,6 +1376,7 @@ def public_team_recent_form(request):
 
 
 @api_view(["GET"])
+@cache_public_response(RankingItem, Ranking, Team, Season)
 def public_team_ranking_history(request):
     """
     Public API endpoint to fetch a team's ranking history.
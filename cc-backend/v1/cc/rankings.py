@@ -0,0 +1,93 @@
+"""
+Maintenance of the CurrentRankingItem projection.
+
+The projection holds, for each season, every team's entry in that season's
+latest ranking together with its rank in the ranking before it. It is rebuilt
+per season in one transaction, so readers see either the old or the new
+ranking, never a mix.
+"""
+
+import logging
+
+from django.db import transaction
+
+from .models import CurrentRankingItem, Ranking, RankingItem, Season
+from .public_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_current_rankings(season):
+    """
+    Rebuild the projection rows of one season from its ranking snapshots.
+
+    Accepts a Season or a season id. Returns the number of rows written.
+    """
+    season_id = getattr(season, "pk", season)
+
+    # Read the snapshots in the same transaction that replaces the rows, so a
+    # ranking saved meanwhile is never overwritten by an older one
+    with transaction.atomic():
+        # Serializes concurrent rebuilds of the same season
+        Season.objects.select_for_update().filter(pk=season_id).exists()
+
+        rankings = list(
+            Ranking.objects.filter(season_id=season_id).order_by("-date", "-id")[:2]
+        )
+        latest = rankings[0] if rankings else None
+        previous = rankings[1] if len(rankings) > 1 else None
+
+        rows = []
+        if latest:
+            previous_ranks = {}
+            if previous:
+                previous_ranks = dict(
+                    RankingItem.objects.filter(ranking=previous).values_list(
+                        "team_id", "rank"
+                    )
+                )
+
+            seen_teams = set()
+            for item_id, team_id, rank, elo in (
+                RankingItem.objects.filter(ranking=latest)
+                .order_by("rank", "id")
+                .values_list("id", "team_id", "rank", "elo")
+            ):
+                # A snapshot should rank each team once; keep the best entry if not
+                if team_id in seen_teams:
+                    continue
+                seen_teams.add(team_id)
+                rows.append(
+                    CurrentRankingItem(
+                        season_id=season_id,
+                        team_id=team_id,
+                        ranking=latest,
+                        ranking_item_id=item_id,
+                        ranking_date=latest.date,
+                        rank=rank,
+                        elo=elo,
+                        previous_rank=previous_ranks.get(team_id),
+                    )
+                )
+
+        CurrentRankingItem.objects.filter(season_id=season_id).delete()
+        CurrentRankingItem.objects.bulk_create(rows, batch_size=500)
+        invalidate_models(CurrentRankingItem)
+
+    return len(rows)
+
+
+def rebuild_all_current_rankings():
+    """Rebuild the projection for every season. Returns {season_id: rows}."""
+    results = {}
+    for season_id in Season.objects.values_list("id", flat=True):
+        results[season_id] = rebuild_current_rankings(season_id)
+
+    # Drop rows of seasons that no longer exist (normally removed by cascade)
+    CurrentRankingItem.objects.exclude(season_id__in=list(results)).delete()
+
+    logger.info(
+        f"Rebuilt current rankings for {len(results)} seasons "
+        f"({sum(results.values())} rows)"
+    )
+    return results
@@ -0,0 +1,69 @@
+"""
+Current season resolution.
+
+"What is the current season" is asked on almost every public request, so the
+answer is cached in-process per calendar day. The cache is cleared by the Season
+save/delete signals in cc.signals, and entries also expire after
+CURRENT_SEASON_TTL seconds so other worker processes pick up admin changes.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from datetime import timezone as dt_timezone
+
+from django.utils import timezone
+
+from .models import Season
+
+# Upper bound on how long another worker process can serve a stale answer
+CURRENT_SEASON_TTL = 300
+
+_lock = threading.Lock()
+_cache = {"date": None, "season": None, "expires_at": 0.0}
+
+
+def _lookup_current_season(today):
+    """Query the season whose date range contains the given (UTC) day."""
+    day_start = datetime.combine(today, dt_time.min, tzinfo=dt_timezone.utc)
+    next_day = day_start + timedelta(days=1)
+
+    # Range comparisons on the raw columns so the (start_date, end_date) index is usable
+    return (
+        Season.objects.filter(start_date__lt=next_day, end_date__gte=day_start)
+        .order_by("-start_date")
+        .first()
+    )
+
+
+def current_season():
+    """
+    Return the season whose date range contains today, or None.
+
+    Answers from the in-process cache when possible and falls back to an
+    indexed query on start_date/end_date.
+    """
+    today = timezone.now().date()
+    now = time.monotonic()
+
+    with _lock:
+        if _cache["date"] == today and _cache["expires_at"] > now:
+            return _cache["season"]
+
+    season = _lookup_current_season(today)
+
+    with _lock:
+        _cache["date"] = today
+        _cache["season"] = season
+        _cache["expires_at"] = now + CURRENT_SEASON_TTL
+
+    return season
+
+
+def invalidate_current_season(**kwargs):
+    """Drop the cached current season. Connected to Season save/delete signals."""
+    with _lock:
+        _cache["date"] = None
+        _cache["season"] = None
+        _cache["expires_at"] = 0.0
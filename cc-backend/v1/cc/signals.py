@@ -0,0 +1,54 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    CurrentRankingItem,
+    DataVersion,
+    EloHistory,
+    FaceitPlayerCache,
+    Job,
+    Player,
+    Ranking,
+    Season,
+)
+from .public_cache import invalidate_models
+from .rankings import rebuild_current_rankings
+from .seasons import invalidate_current_season
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def season_changed(sender, **kwargs):
+    invalidate_current_season()
+
+
+@receiver(post_delete, sender=Ranking)
+def ranking_deleted(sender, instance, **kwargs):
+    # The season's current ranking may now be an older snapshot
+    if instance.season_id:
+        season_id = instance.season_id
+        transaction.on_commit(lambda: rebuild_current_rankings(season_id))
+
+
+def model_changed(sender, **kwargs):
+    invalidate_models(sender)
+
+
+@receiver(m2m_changed, sender=Player.seasons.through)
+def player_seasons_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_models(Player)
+
+
+# Projections and history are maintained and invalidated explicitly, and
+# jobs and the FACEIT lookup cache are not served publicly
+UNCACHED_MODELS = (DataVersion, CurrentRankingItem, EloHistory, FaceitPlayerCache, Job)
+
+for model in apps.get_app_config("cc").get_models():
+    if model in UNCACHED_MODELS:
+        continue
+    dispatch_uid = f"public_cache_{model.__name__}"
+    post_save.connect(model_changed, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(model_changed, sender=model, dispatch_uid=dispatch_uid)
@@ -0,0 +1,158 @@
+"""
+Character-trigram name similarity.
+
+Names are normalized (case, accents, punctuation and filler words such as
+"University" or "Esports" removed) and broken into padded character
+trigrams. TrigramIndex keeps an inverted index from trigram to the entries
+containing it, so the entries similar to a name are found by walking the
+postings of its trigrams instead of comparing against every entry.
+
+Similarity is the Jaccard index of the two trigram sets. For a minimum score
+only the postings of a name's rarest trigrams need to be read (prefix
+filtering), which keeps lookups fast even when common trigrams such as
+" st" appear in thousands of names.
+"""
+
+import math
+import re
+import unicodedata
+
+FILLER_WORDS = {
+    "the",
+    "of",
+    "at",
+    "and",
+    "university",
+    "college",
+    "esports",
+    "gaming",
+    "team",
+    "club",
+}
+
+
+def normalize_name(name):
+    """Lowercase, ASCII-only words of a name, without filler words."""
+    if not name:
+        return ""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    words = re.findall(r"[a-z0-9]+", name.lower())
+    kept = [word for word in words if word not in FILLER_WORDS]
+    # A name made only of filler words ("The University") is kept as is
+    return " ".join(kept or words)
+
+
+def trigrams(name):
+    """Set of padded character trigrams of a normalized name."""
+    name = normalize_name(name)
+    if not name:
+        return frozenset()
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class TrigramIndex:
+    """Inverted trigram index over (key, name) entries."""
+
+    def __init__(self):
+        self.postings = {}
+        # entry id -> (key, trigram set)
+        self.entries = []
+
+    def add(self, key, name):
+        grams = trigrams(name)
+        if not grams:
+            return
+        entry_id = len(self.entries)
+        self.entries.append((key, grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(entry_id)
+
+    def _candidates(self, grams, min_score):
+        """
+        Entries that may score at least min_score against grams.
+
+        An entry reaching min_score shares at least min_score * len(grams)
+        trigrams with grams, so it must contain one of the
+        len(grams) - ceil(min_score * len(grams)) + 1 rarest ones; only
+        their postings are read.
+        """
+        prefix_length = len(grams) - math.ceil(min_score * len(grams)) + 1
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:prefix_length]:
+            candidates.update(self.postings.get(gram, ()))
+        return candidates
+
+    def search(self, name, limit=10, min_score=0.3):
+        """
+        Best-matching keys for a name, as [(key, score)] sorted by score.
+        A key with several entries (e.g. name and school) scores its best.
+        """
+        grams = trigrams(name)
+        if not grams:
+            return []
+        best = {}
+        for entry_id in self._candidates(grams, min_score):
+            key, entry_grams = self.entries[entry_id]
+            score = jaccard(grams, entry_grams)
+            if score >= min_score and score > best.get(key, 0):
+                best[key] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def similar_pairs(self, min_score=0.6):
+        """
+        Every pair of different keys whose entries score at least min_score,
+        as {(key_a, key_b): score} with each pair reported once.
+
+        Entries are visited from fewest to most trigrams. Two entries reaching
+        min_score must share one of their prefix trigrams (as in _candidates,
+        with trigrams ordered rarest first) and the smaller may have no fewer
+        than min_score times the larger's trigrams, so only prefixes are
+        indexed and only entries of a close enough size are compared.
+        """
+        frequency = {gram: len(posting) for gram, posting in self.postings.items()}
+        keys = [key for key, _ in self.entries]
+        gram_sets = [grams for _, grams in self.entries]
+        sizes = [len(grams) for grams in gram_sets]
+        prefix_postings = {}
+        pairs = {}
+        for entry_id in sorted(range(len(sizes)), key=sizes.__getitem__):
+            key = keys[entry_id]
+            grams = gram_sets[entry_id]
+            size = sizes[entry_id]
+            min_size = min_score * size
+            prefix_length = size - math.ceil(min_score * size) + 1
+            prefix = sorted(grams, key=lambda gram: (frequency[gram], gram))
+            prefix = prefix[:prefix_length]
+
+            candidates = set()
+            for gram in prefix:
+                candidates.update(prefix_postings.get(gram, ()))
+            for other_id in candidates:
+                other_size = sizes[other_id]
+                other_key = keys[other_id]
+                if other_size < min_size or other_key == key:
+                    continue
+                shared = len(grams & gram_sets[other_id])
+                score = shared / (size + other_size - shared)
+                if score < min_score:
+                    continue
+                if str(key) <= str(other_key):
+                    pair = (key, other_key)
+                else:
+                    pair = (other_key, key)
+                if score > pairs.get(pair, 0):
+                    pairs[pair] = score
+
+            for gram in prefix:
+                prefix_postings.setdefault(gram, []).append(entry_id)
+        return pairs
@@ -0,0 +1,47 @@
+"""
+Test doubles shared by the test modules: an HTTP response and a match
+updater for views.MATCH_UPDATERS.
+"""
+
+import requests
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the code under test."""
+
+    def __init__(self, status_code, data=None, headers=None, body=b""):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+        self.body = body
+        self.closed = False
+
+    def json(self):
+        return self.data
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def close(self):
+        self.closed = True
+
+
+def fake_fetch(match):
+    """Match updater fetch: every match is completed, except broken links."""
+    if match.url == "https://example.com/broken":
+        raise ValueError("upstream error")
+    return {"status": "completed"}
+
+
+def fake_apply(match, data):
+    """Match updater apply: team1 wins; False when nothing changed."""
+    if match.status == data["status"]:
+        return False
+    match.status = data["status"]
+    match.winner = match.team1
+    return True
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cc import competition_deletion
+from cc.elo import sync_match_rating
+from cc.models import (
+    Competition,
+    CustomEvent,
+    EloHistory,
+    Event,
+    EventMatch,
+    Match,
+    Participant,
+    Season,
+    Team,
+)
+
+
+@override_settings(DEBUG=True)
+class DeleteCompetitionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.now = timezone.now()
+        self.season = Season.objects.create(
+            name="2025", start_date=self.now, end_date=self.now
+        )
+        self.league = Competition.objects.create(name="League")
+        self.cup = Competition.objects.create(name="Cup")
+        self.alpha = Team.objects.create(name="Alpha")
+        self.beta = Team.objects.create(name="Beta")
+        for competition in (self.league, self.cup):
+            for team in (self.alpha, self.beta):
+                Participant.objects.create(
+                    team=team, competition=competition, season=self.season
+                )
+
+        self.league_matches = [self.match(self.league, days) for days in (1, 2, 3)]
+        self.cup_match = self.match(self.cup, 4)
+
+        # Only league matches, and a mix of both competitions
+        self.playoffs = self.event("Playoffs", self.league_matches[:2])
+        CustomEvent.objects.create(event=self.playoffs)
+        self.finals = self.event("Finals", [self.league_matches[2], self.cup_match])
+
+    def match(self, competition, days):
+        match = Match.objects.create(
+            team1=self.alpha,
+            team2=self.beta,
+            winner=self.alpha,
+            date=self.now + timedelta(days=days),
+            status="completed",
+            competition=competition,
+            season=self.season,
+        )
+        for team in (self.alpha, self.beta):
+            EloHistory.objects.create(
+                match=match,
+                team=team,
+                match_date=match.date,
+                elo_before=1000,
+                elo_after=1000,
+            )
+        return match
+
+    def event(self, name, matches):
+        event = Event.objects.create(
+            name=name, start_date=self.now, end_date=self.now, season=self.season
+        )
+        for position, match in enumerate(matches):
+            EventMatch.objects.create(
+                event=event, match=match, round=1, num_in_bracket=position
+            )
+        return event
+
+    def delete(self, **data):
+        return self.client.delete(
+            reverse("delete_competition", args=[self.league.id]),
+            data,
+            format="json",
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+    def test_deletes_only_rows_scoped_to_the_competition(self):
+        with mock.patch.object(competition_deletion, "replay_from") as replay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.delete(security_key="confirm-delete-competition-789")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["deleted_data"],
+            {
+                "custom_events": 1,
+                "event_matches": 3,
+                "elo_history": 6,
+                "events": 1,
+                "matches": 3,
+                "participants": 2,
+                "competition": 1,
+            },
+        )
+        self.assertEqual(response.data["total_records_deleted"], 17)
+        self.assertFalse(Competition.objects.filter(id=self.league.id).exists())
+        self.assertEqual(list(Match.objects.all()), [self.cup_match])
+        self.assertEqual(list(Event.objects.all()), [self.finals])
+        self.assertEqual(EventMatch.objects.get().match, self.cup_match)
+        self.assertEqual(EloHistory.objects.count(), 2)
+        self.assertEqual(Participant.objects.count(), 2)
+        replay.assert_called_once_with(
+            since=self.league_matches[0].date,
+            team_ids={self.alpha.id, self.beta.id},
+            base_ratings={self.alpha.id: 1000, self.beta.id: 1000},
+        )
+
+    def test_dry_run_reports_the_same_counts_without_deleting(self):
+        response = self.delete(dry_run=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["dry_run"])
+        self.assertEqual(response.data["total_records_deleted"], 17)
+        self.assertEqual(Match.objects.count(), 4)
+        self.assertTrue(Competition.objects.filter(id=self.league.id).exists())
+
+    def test_query_count_does_not_grow_with_matches(self):
+        with CaptureQueriesContext(connection) as small:
+            competition_deletion.purge_competition(self.league)
+
+        big = Competition.objects.create(name="Big")
+        for days in range(10):
+            self.event(f"Week {days}", [self.match(big, days)])
+        with CaptureQueriesContext(connection) as large:
+            competition_deletion.purge_competition(big)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(list(Match.objects.all()), [self.cup_match])
+
+    def test_ratings_of_teams_without_other_matches_are_restored(self):
+        showmatch = Competition.objects.create(name="Showmatch")
+        gamma = Team.objects.create(name="Gamma")
+        delta = Team.objects.create(name="Delta")
+        match = Match.objects.create(
+            team1=gamma,
+            team2=delta,
+            winner=gamma,
+            date=self.now,
+            status="completed",
+            competition=showmatch,
+            season=self.season,
+        )
+        sync_match_rating(match)
+        self.assertEqual(Team.objects.get(id=gamma.id).elo, 1075)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            competition_deletion.purge_competition(showmatch)
+
+        self.assertEqual(Team.objects.get(id=gamma.id).elo, 1000)
+        self.assertEqual(Team.objects.get(id=delta.id).elo, 1000)
+
+    def test_requires_security_key(self):
+        response = self.delete(security_key="wrong")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Competition.objects.filter(id=self.league.id).exists())
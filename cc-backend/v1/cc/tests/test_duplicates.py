@@ -0,0 +1,133 @@
+import itertools
+import random
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cc.duplicates import find_duplicate_teams
+from cc.models import FaceitPlayerCache, Player, Team
+from cc.similarity import TrigramIndex, jaccard, normalize_name, trigrams
+
+
+class SimilarityTestCase(SimpleTestCase):
+    def test_normalize_name_drops_filler_words(self):
+        self.assertEqual(normalize_name("The University of Iowa Esports"), "iowa")
+        self.assertEqual(normalize_name("Université Laval"), "universite laval")
+        self.assertEqual(normalize_name("The University"), "the university")
+
+    def test_search_ranks_best_match_first(self):
+        index = TrigramIndex()
+        index.add("osu", "Ohio State University")
+        index.add("psu", "Penn State")
+        index.add("iowa", "Iowa State Esports")
+
+        results = index.search("Ohio State", min_score=0.2)
+
+        self.assertEqual(results[0][0], "osu")
+
+    def test_similar_pairs_matches_brute_force(self):
+        rng = random.Random(7)
+        words = ["north", "south", "state", "tech", "penn", "ohio", "iowa"]
+        words += ["lakers", "rams", "owls", "blue", "gold", "a", "b"]
+        index = TrigramIndex()
+        names = {}
+        for key in range(150):
+            names[key] = " ".join(rng.sample(words, rng.randint(1, 3)))
+            index.add(key, names[key])
+
+        pairs = index.similar_pairs(0.5)
+
+        expected = {}
+        for a, b in itertools.combinations(names, 2):
+            score = jaccard(trigrams(names[a]), trigrams(names[b]))
+            if score >= 0.5:
+                expected[tuple(sorted((a, b), key=str))] = score
+        self.assertEqual(pairs.keys(), expected.keys())
+        for pair, score in expected.items():
+            self.assertAlmostEqual(pairs[pair], score)
+
+    def test_similar_pairs_skips_entries_of_the_same_key(self):
+        index = TrigramIndex()
+        index.add("a", "Iowa State")
+        index.add("a", "Iowa State Esports")
+
+        self.assertEqual(index.similar_pairs(0.5), {})
+
+
+class FindDuplicateTeamsTestCase(TestCase):
+    def test_similar_names_are_ranked_first(self):
+        state = Team.objects.create(name="Ohio State University")
+        Player.objects.create(name="p1", team=state)
+        copy = Team.objects.create(name="Ohio State")
+        Team.objects.create(name="Penn State")
+
+        candidates = find_duplicate_teams()
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0]["primary_team"]["id"], state.id)
+        self.assertEqual(candidates[0]["secondary_team"]["id"], copy.id)
+        self.assertEqual(candidates[0]["name_score"], 1.0)
+
+    def test_roster_overlap_finds_differently_named_teams(self):
+        bobcats = Team.objects.create(name="Bobcats")
+        ghosts = Team.objects.create(name="Ghost Squad")
+        Team.objects.create(name="Unrelated")
+        Player.objects.create(name="alice", steam_id="steam-1", team=bobcats)
+        Player.objects.create(name="bob", steam_id="steam-2", team=bobcats)
+        # Same people, imported from another platform under other rows
+        Player.objects.create(name="ALICE", faceit_id="faceit-1", team=ghosts)
+        Player.objects.create(name="robert", faceit_id="faceit-2", team=ghosts)
+        FaceitPlayerCache.objects.create(
+            game_player_id="steam-2", data={"player_id": "faceit-2"}
+        )
+
+        candidates = find_duplicate_teams(min_score=0.5)
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0]["roster_score"], 1.0)
+        pair = {
+            candidates[0]["primary_team"]["id"],
+            candidates[0]["secondary_team"]["id"],
+        }
+        self.assertEqual(pair, {bobcats.id, ghosts.id})
+
+    def test_shared_school_alone_is_not_enough(self):
+        Team.objects.create(name="Bobcats Blue", school_name="Ohio University")
+        Team.objects.create(name="Bobcats Gold", school_name="Ohio University")
+        Team.objects.create(name="Lakers", school_name="Ohio University")
+
+        candidates = find_duplicate_teams(min_score=0.7)
+
+        # Similar names plus the same school add up; the school alone does not
+        self.assertEqual(len(candidates), 1)
+        names = {
+            candidates[0]["primary_team"]["name"],
+            candidates[0]["secondary_team"]["name"],
+        }
+        self.assertEqual(names, {"Bobcats Blue", "Bobcats Gold"})
+
+
+@override_settings(DEBUG=True)
+class MergeCandidatesViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("merge_candidates")
+
+    def test_returns_ranked_candidates(self):
+        Team.objects.create(name="Iowa State")
+        Team.objects.create(name="Iowa State Esports")
+
+        response = self.client.get(
+            self.url, {"limit": 5}, HTTP_AUTHORIZATION="Bearer dev"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["candidates"]), 1)
+
+    def test_rejects_invalid_min_score(self):
+        response = self.client.get(
+            self.url, {"min_score": "2"}, HTTP_AUTHORIZATION="Bearer dev"
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,296 @@
+from datetime import timedelta
+
+import statistics
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cc.elo import (
+    calculate_new_elo,
+    rating_state,
+    replay_from,
+    sync_deleted_match,
+    sync_match_rating,
+)
+from cc.models import EloHistory, Match, Player, Team
+from cc.views import recalculate_all_elos
+
+
+class RecalculateAllElosTestCase(TestCase):
+    def setUp(self):
+        self.team_a = Team.objects.create(name="Team A", elo=1234)
+        self.team_b = Team.objects.create(name="Team B", elo=1000)
+        self.team_c = Team.objects.create(name="Team C", elo=1000)
+        self.bye = Team.objects.create(name="BYE", elo=1000)
+
+        start = timezone.now() - timedelta(days=10)
+        self.results = [
+            (self.team_a, self.team_b, self.team_a),
+            (self.team_b, self.team_c, self.team_b),
+            (self.team_a, self.team_c, self.team_c),
+        ]
+        self.matches = []
+        for day, (team1, team2, winner) in enumerate(self.results):
+            match = Match.objects.create(
+                team1=team1,
+                team2=team2,
+                winner=winner,
+                status="completed",
+                date=start + timedelta(days=day),
+            )
+            self.matches.append(match)
+
+        # Neither byes nor unfinished matches are rated
+        Match.objects.create(
+            team1=self.team_a,
+            team2=self.bye,
+            winner=self.team_a,
+            status="completed",
+            date=start,
+        )
+        Match.objects.create(
+            team1=self.team_b, team2=self.team_c, status="scheduled", date=start
+        )
+
+    def expected_ratings(self, start):
+        ratings = {team.id: start for team in (self.team_a, self.team_b, self.team_c)}
+        for team1, team2, winner in self.results:
+            team1_elo = ratings[team1.id]
+            team2_elo = ratings[team2.id]
+            team1_result = 1.0 if winner == team1 else 0.0
+            ratings[team1.id] = calculate_new_elo(team1_elo, team2_elo, team1_result)
+            ratings[team2.id] = calculate_new_elo(
+                team2_elo, team1_elo, 1.0 - team1_result
+            )
+        return ratings
+
+    def test_replays_matches_in_date_order(self):
+        result = recalculate_all_elos(reset_to_default=True, default_elo=1000)
+
+        self.assertEqual(result["total_matches"], 3)
+        self.assertEqual(result["processed_count"], 3)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(result["elo_changes"][0]["team1"], "Team A")
+        self.assertEqual(result["elo_changes"][0]["winner"], "Team A")
+
+        for team_id, elo in self.expected_ratings(1000).items():
+            self.assertEqual(Team.objects.get(id=team_id).elo, elo)
+        self.assertEqual(Team.objects.get(id=self.bye.id).elo, 1000)
+
+    def test_query_count_does_not_grow_with_matches(self):
+        with CaptureQueriesContext(connection) as three_matches:
+            recalculate_all_elos(reset_to_default=True, default_elo=1000)
+
+        for day in range(5):
+            Match.objects.create(
+                team1=self.team_b,
+                team2=self.team_c,
+                winner=self.team_c,
+                status="completed",
+                date=timezone.now() - timedelta(days=day),
+            )
+
+        with CaptureQueriesContext(connection) as eight_matches:
+            recalculate_all_elos(reset_to_default=True, default_elo=1000)
+
+        self.assertEqual(len(three_matches), len(eight_matches))
+
+    def test_full_replay_records_history(self):
+        recalculate_all_elos(reset_to_default=True, default_elo=1000)
+
+        self.assertEqual(EloHistory.objects.count(), 6)
+        first = EloHistory.objects.get(match=self.matches[0], team=self.team_a)
+        self.assertEqual(first.elo_before, 1000)
+        self.assertEqual(first.elo_after, calculate_new_elo(1000, 1000, 1.0))
+
+    def test_incremental_replay_matches_full_replay(self):
+        recalculate_all_elos(reset_to_default=True, default_elo=1000)
+        untouched = EloHistory.objects.get(match=self.matches[0], team=self.team_a)
+
+        # Correct the result of the second match
+        self.results[1] = (self.team_b, self.team_c, self.team_c)
+        self.matches[1].winner = self.team_c
+        self.matches[1].save()
+
+        summary = replay_from(match_ids=[self.matches[1].id])
+        self.assertEqual(summary["processed_count"], 2)
+
+        for team_id, elo in self.expected_ratings(1000).items():
+            self.assertEqual(Team.objects.get(id=team_id).elo, elo)
+        self.assertTrue(EloHistory.objects.filter(id=untouched.id).exists())
+        self.assertEqual(EloHistory.objects.count(), 6)
+
+    def test_incremental_replay_drops_uncompleted_match(self):
+        recalculate_all_elos(reset_to_default=True, default_elo=1000)
+
+        self.results.pop()
+        self.matches[2].status = "scheduled"
+        self.matches[2].winner = None
+        self.matches[2].save()
+
+        replay_from(match_ids=[self.matches[2].id])
+
+        for team_id, elo in self.expected_ratings(1000).items():
+            self.assertEqual(Team.objects.get(id=team_id).elo, elo)
+        self.assertFalse(EloHistory.objects.filter(match=self.matches[2]).exists())
+
+    def test_incremental_replay_without_history_replays_everything(self):
+        # Ratings from before EloHistory was recorded
+        recalculate_all_elos(reset_to_default=True, default_elo=1000)
+        EloHistory.objects.all().delete()
+
+        self.results[1] = (self.team_b, self.team_c, self.team_c)
+        self.matches[1].winner = self.team_c
+        self.matches[1].save()
+
+        summary = replay_from(match_ids=[self.matches[1].id])
+
+        self.assertTrue(summary["full_replay"])
+        for team_id, elo in self.expected_ratings(1000).items():
+            self.assertEqual(Team.objects.get(id=team_id).elo, elo)
+        self.assertEqual(EloHistory.objects.count(), 6)
+
+
+class SyncMatchRatingTestCase(TestCase):
+    def setUp(self):
+        self.team_a = Team.objects.create(name="Team A", elo=1000)
+        self.team_b = Team.objects.create(name="Team B", elo=1000)
+        self.start = timezone.now() - timedelta(days=10)
+
+    def create_match(self, days, winner=None):
+        match = Match.objects.create(
+            team1=self.team_a,
+            team2=self.team_b,
+            winner=winner,
+            status="completed" if winner else "scheduled",
+            date=self.start + timedelta(days=days),
+        )
+        sync_match_rating(match)
+        return match
+
+    def complete(self, match, winner):
+        previous = rating_state(match)
+        match.status = "completed"
+        match.winner = winner
+        match.save()
+        return sync_match_rating(match, previous)
+
+    def elo(self, team):
+        return Team.objects.get(id=team.id).elo
+
+    def test_latest_match_is_applied_directly(self):
+        self.create_match(0, winner=self.team_a)
+        match = self.create_match(1)
+
+        self.assertEqual(self.complete(match, self.team_b), "applied")
+        self.assertEqual(EloHistory.objects.filter(match=match).count(), 2)
+        # Saving the same result again must not apply it twice
+        elo = self.elo(self.team_b)
+        self.assertIsNone(self.complete(match, self.team_b))
+        self.assertEqual(self.elo(self.team_b), elo)
+
+    def test_winner_correction_replays(self):
+        first = self.create_match(0, winner=self.team_a)
+        self.create_match(1, winner=self.team_a)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.complete(first, self.team_b), "replay")
+
+        after_first = calculate_new_elo(1000, 1000, 1.0)
+        expected_a = calculate_new_elo(
+            calculate_new_elo(1000, 1000, 0.0), after_first, 1.0
+        )
+        self.assertEqual(self.elo(self.team_a), expected_a)
+
+    def test_winner_correction_without_history_is_not_counted_twice(self):
+        # Rated before EloHistory was recorded
+        match = Match.objects.create(
+            team1=self.team_a,
+            team2=self.team_b,
+            winner=self.team_a,
+            status="completed",
+            date=self.start,
+        )
+        Team.objects.filter(id=self.team_a.id).update(elo=1075)
+        Team.objects.filter(id=self.team_b.id).update(elo=925)
+
+        previous = rating_state(match)
+        match.winner = self.team_b
+        match.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(sync_match_rating(match, previous), "replay")
+
+        self.assertEqual(self.elo(self.team_a), 925)
+        self.assertEqual(self.elo(self.team_b), 1075)
+
+    def test_deleting_only_match_restores_ratings(self):
+        match = self.create_match(0, winner=self.team_a)
+        self.assertEqual(self.elo(self.team_a), 1075)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(sync_deleted_match(match), "replay")
+            match.delete()
+
+        self.assertEqual(self.elo(self.team_a), 1000)
+        self.assertEqual(self.elo(self.team_b), 1000)
+
+
+@override_settings(DEBUG=True)
+class PlayerBasedTeamEloTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.full = Team.objects.create(name="Full", elo=1000)
+        self.rated = Team.objects.create(name="Rated", elo=1500)
+        self.solo = Team.objects.create(name="Solo", elo=1000)
+        for elo in (2000, 1800, 1600, 1400, 1200, 1000):
+            Player.objects.create(name=f"full-{elo}", elo=elo, team=self.full)
+        Player.objects.create(name="benched", elo=3000, team=self.full, benched=True)
+        Player.objects.create(name="unrated", elo=0, team=self.full)
+        for elo in (1100, 900):
+            Player.objects.create(name=f"rated-{elo}", elo=elo, team=self.rated)
+        Player.objects.create(name="solo", elo=1700, team=self.solo)
+
+    def post(self, name, data=None):
+        return self.client.post(
+            reverse(name), data or {}, format="json", HTTP_AUTHORIZATION="Bearer dev"
+        )
+
+    def test_team_elo_from_top_five_active_players(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post("calculate_team_elos")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated_teams"], 2)
+        self.assertEqual(response.data["teams_without_enough_players"], 1)
+        self.assertEqual(
+            set(response.data["timings"]),
+            {"load_seconds", "compute_seconds", "write_seconds", "total_seconds"},
+        )
+        top = [2000, 1800, 1600, 1400, 1200]
+        expected = round(statistics.mean(top) - 0.1 * statistics.stdev(top))
+        self.full.refresh_from_db()
+        self.assertEqual(self.full.elo, expected)
+        self.solo.refresh_from_db()
+        self.assertEqual(self.solo.elo, 1000)
+        # Teams, players, one bulk update and the cache version bump
+        self.assertLessEqual(len(queries), 6)
+
+    def test_only_default_elo_skips_rated_teams(self):
+        response = self.post("calculate_team_elos", {"only_default_elo": True})
+
+        self.assertEqual(response.data["total_teams_processed"], 2)
+        self.rated.refresh_from_db()
+        self.assertEqual(self.rated.elo, 1500)
+
+    def test_reset_player_elo_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post("reset_player_elo", {"default_elo": 1200})
+
+        self.assertEqual(response.data["updated_players"], Player.objects.count())
+        self.assertEqual(set(Player.objects.values_list("elo", flat=True)), {1200})
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "cc_player"')]
+        self.assertEqual(len(updates), 1)
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cc import http_client
+from cc.faceit import lookup_players, refresh_player_elos
+from cc.models import FaceitPlayerCache, Player
+from cc.tests.fakes import FakeResponse
+
+
+def cs2(elo, level):
+    return FakeResponse(
+        200, {"games": {"cs2": {"faceit_elo": elo, "skill_level": level}}}
+    )
+
+
+@override_settings(FACEIT_API_KEY="test", FACEIT_REQUESTS_PER_SECOND=1000)
+class RefreshPlayerElosTestCase(TestCase):
+    def setUp(self):
+        self.found = Player.objects.create(name="Found", steam_id="1", elo=1000)
+        self.limited = Player.objects.create(name="Limited", steam_id="2", elo=1000)
+        self.missing = Player.objects.create(name="Missing", steam_id="3", elo=1000)
+        Player.objects.create(name="No Steam", elo=1000)
+
+        self.responses = {
+            "1": [cs2(2100, 10)],
+            "2": [FakeResponse(429, headers={"Retry-After": "1"}), cs2(1500, 6)],
+            "3": [FakeResponse(404)],
+        }
+
+        http_client.reset_client()
+
+    def fake_request(self, method, url, params=None, **kwargs):
+        return self.responses[params["game_player_id"]].pop(0)
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_refresh_updates_players_in_bulk(self, sleep):
+        session = mock.Mock(request=self.fake_request)
+        with mock.patch.object(http_client.HttpClient, "_session", return_value=session):
+            result = refresh_player_elos(max_workers=3)
+
+        self.assertEqual(result["total_players"], 3)
+        self.assertEqual(result["updated_players"], 2)
+        self.assertEqual(result["not_found"], 1)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(result["rate_limited"], 1)
+        self.assertEqual(result["requests"], 4)
+        sleep.assert_called_with(1.0)
+
+        self.found.refresh_from_db()
+        self.limited.refresh_from_db()
+        self.missing.refresh_from_db()
+        self.assertEqual((self.found.elo, self.found.skill_level), (2100, 10))
+        self.assertEqual((self.limited.elo, self.limited.skill_level), (1500, 6))
+        self.assertEqual(self.missing.elo, 1000)
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_rejected_api_key_counts_as_failed(self, sleep):
+        def unauthorized(method, url, **kwargs):
+            return FakeResponse(401)
+
+        session = mock.Mock(request=unauthorized)
+        with mock.patch.object(http_client.HttpClient, "_session", return_value=session):
+            result = refresh_player_elos(max_workers=3)
+
+        self.assertEqual(result["failed"], 3)
+        self.assertEqual(result["not_found"], 0)
+        self.assertEqual(result["updated_players"], 0)
+
+    @override_settings(DEBUG=True, FACEIT_MAX_WORKERS=4)
+    def test_request_cannot_raise_configured_limits(self):
+        with mock.patch("cc.views.refresh_player_elos") as refresh:
+            refresh.return_value = {
+                "updated_players": 0,
+                "not_found": 0,
+                "failed": 0,
+            }
+            response = APIClient().post(
+                reverse("update_player_elo"),
+                {"max_workers": 10000, "requests_per_second": -5},
+                format="json",
+                HTTP_AUTHORIZATION="Bearer dev",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        refresh.assert_called_once_with(max_workers=4, requests_per_second=0.1)
+
+
+@override_settings(
+    FACEIT_API_KEY="test",
+    FACEIT_REQUESTS_PER_SECOND=1000,
+    FACEIT_PLAYER_CACHE_SECONDS=3600,
+    HTTP_CIRCUIT_FAILURES=100,
+)
+class LookupPlayersTestCase(TestCase):
+    def setUp(self):
+        self.calls = []
+        http_client.reset_client()
+
+    def fake_request(self, method, url, params=None, **kwargs):
+        steam_id = params["game_player_id"]
+        self.calls.append(steam_id)
+        if steam_id == "missing":
+            return FakeResponse(404)
+        if steam_id == "down":
+            return FakeResponse(500)
+        if steam_id == "forbidden":
+            return FakeResponse(403)
+        return FakeResponse(200, {"player_id": f"faceit-{steam_id}"})
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_each_id_is_fetched_once_and_cached(self, sleep):
+        session = mock.Mock(request=self.fake_request)
+        with mock.patch.object(http_client.HttpClient, "_session", return_value=session):
+            first = lookup_players(
+                ["1", "1", "missing", "down", "forbidden", "", None]
+            )
+            fetched = sorted(self.calls)
+            self.calls.clear()
+            second = lookup_players(["1", "missing", "down", "forbidden"])
+
+        self.assertEqual(first, {"1": {"player_id": "faceit-1"}, "missing": None})
+        self.assertEqual(second, first)
+        self.assertEqual(fetched.count("1"), 1)
+        self.assertEqual(fetched.count("missing"), 1)
+        # Failed lookups are not cached and are retried on the next import
+        self.assertEqual(set(self.calls), {"down", "forbidden"})
+        self.assertEqual(FaceitPlayerCache.objects.count(), 2)
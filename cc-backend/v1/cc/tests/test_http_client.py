@@ -0,0 +1,108 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from cc.http_client import CircuitOpenError, HttpClient
+from cc.tests.fakes import FakeResponse
+
+
+class HttpClientTestCase(SimpleTestCase):
+    def client_with(self, outcomes, **options):
+        """A client whose session returns (or raises) outcomes in order."""
+        client = HttpClient(backoff_base=0.1, **options)
+        session = mock.Mock()
+        session.request.side_effect = outcomes
+        patcher = mock.patch.object(HttpClient, "_session", return_value=session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return client, session
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_retries_server_errors_then_returns_response(self, sleep):
+        client, session = self.client_with(
+            [
+                FakeResponse(503),
+                FakeResponse(429, headers={"Retry-After": "2"}),
+                FakeResponse(200),
+            ]
+        )
+
+        response = client.get("https://api.example.com/a")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.request.call_count, 3)
+        self.assertEqual(sleep.call_args_list[1], mock.call(2.0))
+        # Jittered backoff never exceeds the exponential ceiling
+        self.assertLessEqual(sleep.call_args_list[0].args[0], 0.1)
+
+        stats = client.stats()["api.example.com"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["circuit"], "closed")
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_retried_responses_are_closed(self, sleep):
+        retried = FakeResponse(503)
+        final = FakeResponse(200)
+        client, session = self.client_with([retried, final])
+
+        client.get("https://cdn.example.com/a.png", stream=True)
+
+        self.assertTrue(retried.closed)
+        self.assertFalse(final.closed)
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_post_is_not_retried_by_default(self, sleep):
+        client, session = self.client_with([FakeResponse(502)])
+
+        response = client.post("https://hooks.example.com/", json={})
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(session.request.call_count, 1)
+        sleep.assert_not_called()
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_default_timeout_is_applied(self, sleep):
+        client, session = self.client_with([FakeResponse(200), FakeResponse(200)])
+
+        client.get("https://api.example.com/a")
+        client.get("https://api.example.com/a", timeout=3)
+
+        self.assertEqual(session.request.call_args_list[0].kwargs["timeout"], (5, 30))
+        self.assertEqual(session.request.call_args_list[1].kwargs["timeout"], 3)
+
+    @mock.patch("cc.http_client.time.sleep")
+    def test_circuit_opens_after_consecutive_failures(self, sleep):
+        client, session = self.client_with(
+            [requests.ConnectionError("down")] * 3 + [FakeResponse(200)],
+            failure_threshold=3,
+            reset_seconds=60,
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            client.get("https://down.example.com/", retries=2)
+        with self.assertRaises(CircuitOpenError):
+            client.get("https://down.example.com/")
+
+        self.assertEqual(session.request.call_count, 3)
+        stats = client.stats()["down.example.com"]
+        self.assertEqual(stats["circuit"], "open")
+        self.assertEqual(stats["rejected"], 1)
+
+        # After the reset window one trial request is let through
+        client.breakers["down.example.com"].opened_at -= 60
+        self.assertEqual(client.get("https://down.example.com/").status_code, 200)
+        self.assertEqual(client.stats()["down.example.com"]["circuit"], "closed")
+
+    def test_only_recent_hosts_are_tracked(self):
+        client, session = self.client_with([FakeResponse(200)] * 4, max_tracked_hosts=2)
+
+        for host in ["a.example.com", "b.example.com", "a.example.com"]:
+            client.get(f"https://{host}/")
+        client.get("https://c.example.com/")
+
+        self.assertEqual(sorted(client.stats()), ["a.example.com", "c.example.com"])
+        self.assertEqual(client.stats()["a.example.com"]["requests"], 2)
+        self.assertEqual(len(client.host_stats), 2)
@@ -0,0 +1,147 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from cc.image_cache import ImageCache, ImageTooLarge, reset_image_cache
+from cc.tests.fakes import FakeResponse
+
+
+def png_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 255)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImageProxyTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        settings = override_settings(
+            IMAGE_PROXY_CACHE_DIR=self.cache_dir,
+            IMAGE_PROXY_CACHE_MAX_BYTES=10 * 1024 * 1024,
+            IMAGE_PROXY_REVALIDATE_SECONDS=3600,
+            IMAGE_PROXY_MAX_DOWNLOAD_BYTES=len(png_bytes(400, 200)),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_image_cache()
+        self.addCleanup(reset_image_cache)
+
+        self.client = APIClient()
+        self.image = png_bytes(400, 200)
+        self.url = reverse("proxy_image")
+        self.headers = {"Content-Type": "image/png", "ETag": '"v1"'}
+
+    @mock.patch("cc.admin_views.http_client.get")
+    def test_streams_original_then_serves_from_disk(self, get):
+        get.return_value = FakeResponse(200, body=self.image, headers=self.headers)
+
+        first = self.client.get(self.url, {"url": "https://cdn.example.com/a.png"})
+        self.assertTrue(first.streaming)
+        self.assertEqual(b"".join(first.streaming_content), self.image)
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        second = self.client.get(self.url, {"url": "https://cdn.example.com/a.png"})
+        self.assertEqual(b"".join(second.streaming_content), self.image)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second["Content-Type"], "image/png")
+        self.assertEqual(get.call_count, 1)
+
+    @mock.patch("cc.admin_views.http_client.get")
+    def test_resized_variant(self, get):
+        get.return_value = FakeResponse(200, body=self.image, headers=self.headers)
+
+        response = self.client.get(
+            self.url, {"url": "https://cdn.example.com/a.png", "w": "100"}
+        )
+
+        self.assertEqual(response["Content-Type"], "image/webp")
+        with Image.open(io.BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (100, 50))
+
+    @mock.patch("cc.admin_views.http_client.get")
+    def test_revalidates_with_etag(self, get):
+        params = {"url": "https://cdn.example.com/a.png"}
+        get.return_value = FakeResponse(200, body=self.image, headers=self.headers)
+        b"".join(self.client.get(self.url, params).streaming_content)
+
+        get.return_value = FakeResponse(304)
+        with override_settings(IMAGE_PROXY_REVALIDATE_SECONDS=0):
+            reset_image_cache()
+            response = self.client.get(self.url, params)
+
+        self.assertEqual(response["X-Cache"], "REVALIDATED")
+        self.assertEqual(b"".join(response.streaming_content), self.image)
+        self.assertEqual(get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+
+    @mock.patch("cc.admin_views.http_client.get")
+    def test_refuses_announced_oversized_image(self, get):
+        upstream = FakeResponse(
+            200,
+            body=self.image + b"x",
+            headers={**self.headers, "Content-Length": str(len(self.image) + 1)},
+        )
+        get.return_value = upstream
+
+        response = self.client.get(self.url, {"url": "https://cdn.example.com/a.png"})
+
+        self.assertEqual(response.status_code, 502)
+        self.assertTrue(upstream.closed)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    @mock.patch("cc.admin_views.http_client.get")
+    def test_oversized_download_is_not_cached(self, get):
+        # No Content-Length: the limit is enforced on the bytes received
+        get.return_value = FakeResponse(
+            200, body=self.image + b"x", headers=self.headers
+        )
+        params = {"url": "https://cdn.example.com/a.png"}
+
+        resized = self.client.get(self.url, {**params, "w": "100"})
+        self.assertEqual(resized.status_code, 502)
+
+        streamed = self.client.get(self.url, params)
+        with self.assertRaises(ImageTooLarge):
+            b"".join(streamed.streaming_content)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_rejects_invalid_size(self):
+        response = self.client.get(
+            self.url, {"url": "https://cdn.example.com/a.png", "w": "0"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ImageCacheEvictionTestCase(SimpleTestCase):
+    def test_evicts_least_recently_used_files(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = ImageCache(cache_dir, max_bytes=10**6, revalidate_seconds=3600)
+
+        for index, name in enumerate(["a", "b", "c"]):
+            response = FakeResponse(200, body=b"x" * 100, headers={"ETag": name})
+            cache.store(f"https://cdn.example.com/{name}", response)
+            meta = cache.lookup(f"https://cdn.example.com/{name}")
+            os.utime(cache.body_path(meta), (index, index))
+
+        # Body and metadata of one entry, all three being the same size
+        entry_bytes = sum(
+            os.path.getsize(os.path.join(cache_dir, name))
+            for name in os.listdir(cache_dir)
+        ) // 3
+        cache.max_bytes = int(entry_bytes * 2.5)
+        cache.evict()
+
+        self.assertIsNone(cache.lookup("https://cdn.example.com/a"))
+        self.assertIsNotNone(cache.lookup("https://cdn.example.com/b"))
+        self.assertIsNotNone(cache.lookup("https://cdn.example.com/c"))
+        # The metadata of the evicted entry went with its body
+        self.assertEqual(len(os.listdir(cache_dir)), 4)
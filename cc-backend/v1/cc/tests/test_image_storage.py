@@ -0,0 +1,84 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from cc.image_storage import PICTURE_VARIANT_SIZES
+from cc.models import Team
+
+
+def png_upload(width, height, name="logo.png"):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (0, 128, 255, 255)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class PictureUploadTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.media_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_dir)
+        settings = override_settings(
+            DEBUG=True,
+            IMAGE_STORAGE_BACKEND="local",
+            IMAGE_STORAGE_LOCAL_DIR=self.media_dir,
+            IMAGE_STORAGE_LOCAL_URL="/media/",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.team = Team.objects.create(name="Logo Team")
+
+    def local_path(self, url):
+        return os.path.join(self.media_dir, url.removeprefix("/media/"))
+
+    def test_upload_stores_original_and_webp_variants(self):
+        response = self.client.post(
+            reverse("upload_team_picture", args=[self.team.id]),
+            {"picture": png_upload(1000, 500)},
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.team.refresh_from_db()
+        prefix = f"/media/teams/{self.team.id}/"
+        self.assertTrue(self.team.picture.startswith(prefix))
+        self.assertTrue(self.team.picture.endswith("/original.png"))
+        self.assertEqual(set(self.team.picture_variants), set(PICTURE_VARIANT_SIZES))
+
+        for name, size in PICTURE_VARIANT_SIZES.items():
+            url = self.team.picture_variants[name]
+            expected = self.team.picture.replace("original.png", f"{name}.webp")
+            self.assertEqual(url, expected)
+            with Image.open(self.local_path(url)) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(image.size, (size, size // 2))
+
+    def test_undecodable_picture_is_stored_without_variants(self):
+        upload = SimpleUploadedFile(
+            "logo.svg", b"<svg xmlns='http://www.w3.org/2000/svg'/>", "image/svg+xml"
+        )
+        response = self.client.post(
+            reverse("upload_team_picture", args=[self.team.id]),
+            {"picture": upload},
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.team.refresh_from_db()
+        self.assertTrue(self.team.picture.endswith("/original.svg"))
+        self.assertEqual(self.team.picture_variants, {})
+
+    def test_public_teams_expose_variants(self):
+        self.team.picture_variants = {"small": "/media/small.webp"}
+        self.team.save()
+
+        response = self.client.get(reverse("public_teams"))
+
+        team = response.json()["results"][0]
+        self.assertEqual(team["picture_variants"], {"small": "/media/small.webp"})
@@ -0,0 +1,140 @@
+import uuid
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cc import importing, views
+from cc.models import Competition, Event, EventMatch, Match, Participant, Player
+from cc.models import Season, Team
+
+
+def team_payload(name, faction_id, players):
+    return {
+        "name": name,
+        "faction_id": faction_id,
+        "roster": [
+            {
+                "player_id": f"faceit-{nickname}",
+                "game_player_id": f"steam-{nickname}",
+                "nickname": nickname,
+            }
+            for nickname in players
+        ],
+    }
+
+
+def match_payload(team1, team2, winner="faction1"):
+    return {
+        "match_id": f"1-{uuid.uuid4()}",
+        "status": "FINISHED",
+        "finished_at": "2025-01-01T18:00:00Z",
+        "teams": {"faction1": team1, "faction2": team2},
+        "results": {"winner": winner, "score": {"faction1": 1, "faction2": 0}},
+    }
+
+
+@override_settings(FACEIT_API_KEY=None)
+class ImportMatchDataTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.season = Season.objects.create(
+            name="2025", start_date=now, end_date=now
+        )
+        self.competition = Competition.objects.create(name="League")
+        self.alpha = team_payload("Alpha", "faction-a", ["a1", "a2"])
+        self.beta = team_payload("Beta", "faction-b", ["b1", "b2"])
+        self.gamma = team_payload("Gamma", "faction-c", ["c1", "c2"])
+
+    def import_items(self, items, **kwargs):
+        return views.import_match_data(
+            {"items": items}, self.competition, self.season, "faceit", **kwargs
+        )
+
+    def test_teams_and_players_resolved_once_per_batch(self):
+        items = [
+            match_payload(self.alpha, self.beta),
+            match_payload(self.beta, self.gamma),
+            match_payload(self.gamma, self.alpha),
+        ]
+
+        result = self.import_items(items)
+
+        self.assertEqual(len(result["imported"]), 3)
+        self.assertEqual(Team.objects.count(), 3)
+        self.assertEqual(Participant.objects.count(), 3)
+        self.assertEqual(Player.objects.count(), 6)
+        self.assertEqual(
+            Player.objects.get(steam_id="steam-a1").seasons.get(), self.season
+        )
+        match = Match.objects.get(id=items[1]["match_id"][2:])
+        self.assertEqual(match.winner.name, "Beta")
+
+    def test_query_count_does_not_grow_with_matches(self):
+        with CaptureQueriesContext(connection) as small:
+            self.import_items([match_payload(self.alpha, self.beta)])
+
+        # A fresh competition so the large import creates its participants too
+        self.competition = Competition.objects.create(name="League 2")
+        items = [match_payload(self.alpha, self.beta) for _ in range(20)]
+        items.append(match_payload(self.beta, self.gamma))
+        with CaptureQueriesContext(connection) as large:
+            self.import_items(items)
+
+        self.assertLessEqual(len(large), len(small) + 2)
+
+    def test_reuses_existing_teams_and_players(self):
+        team = Team.objects.create(name="Alpha")
+        Participant.objects.create(
+            team=team,
+            competition=self.competition,
+            season=self.season,
+            faceit_id="faction-a",
+        )
+        free_agent = Player.objects.create(name="B1")
+        moved = Player.objects.create(name="b2-renamed", steam_id="steam-b2")
+
+        self.import_items([match_payload(self.alpha, self.beta)])
+
+        self.assertEqual(Team.objects.filter(name="Alpha").count(), 1)
+        # Roster of a team found through its participant is left alone
+        self.assertFalse(Player.objects.filter(steam_id="steam-a1").exists())
+        free_agent.refresh_from_db()
+        self.assertEqual(free_agent.team.name, "Beta")
+        self.assertEqual(free_agent.steam_id, "steam-b1")
+        moved.refresh_from_db()
+        self.assertEqual(moved.name, "b2-renamed")
+        self.assertEqual(moved.team.name, "Beta")
+
+    def test_existing_matches_are_skipped_and_linked_to_event(self):
+        items = [match_payload(self.alpha, self.beta)]
+        self.import_items(items)
+        now = timezone.now()
+        event = Event.objects.create(name="Playoffs", start_date=now, end_date=now)
+
+        result = self.import_items(
+            items + [items[0]], event=event, import_type="event"
+        )
+
+        self.assertEqual(result["skipped"], [items[0]["match_id"][2:]] * 2)
+        self.assertEqual(EventMatch.objects.filter(event=event).count(), 1)
+
+    def test_unchanged_matches_skip_identity_resolution(self):
+        items = [match_payload(self.alpha, self.beta)]
+        self.import_items(items)
+
+        with mock.patch.object(
+            views.ImportIdentities, "resolve_teams", return_value=[]
+        ) as resolve_teams:
+            result = self.import_items(items)
+        resolve_teams.assert_called_once_with([])
+        self.assertEqual(result["skipped"], [items[0]["match_id"][2:]])
+
+        changed = dict(items[0], status="ONGOING")
+        self.import_items([changed])
+        match = Match.objects.get(id=items[0]["match_id"][2:])
+        self.assertEqual(match.import_hash, importing.payload_hash(changed))
+        # Updates still go through update_matches, not the importer
+        self.assertEqual(match.status, "completed")
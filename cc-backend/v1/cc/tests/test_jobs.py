@@ -0,0 +1,171 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+import json
+
+from cc import jobs, views
+from cc.models import Job, Match, Team
+from cc.tests.fakes import fake_apply, fake_fetch
+
+
+def cancellable_job(data):
+    Job.objects.update(cancel_requested=True)
+    jobs.report_progress(1, 2, "halfway")
+    return Response({"message": "should not finish"})
+
+
+@override_settings(DEBUG=True)
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.team1 = Team.objects.create(name="Team 1", elo=1000)
+        self.team2 = Team.objects.create(name="Team 2", elo=1000)
+        self.match = Match.objects.create(
+            team1=self.team1,
+            team2=self.team2,
+            date=timezone.now() - timedelta(hours=2),
+            platform="faceit",
+        )
+
+    def post(self, name, data):
+        return self.client.post(
+            reverse(name), data, format="json", HTTP_AUTHORIZATION="Bearer dev"
+        )
+
+    @mock.patch.dict(views.MATCH_UPDATERS, {"faceit": (fake_fetch, fake_apply)})
+    def test_async_request_is_queued_and_run_by_worker(self):
+        response = self.post("update_matches", {"async": True})
+
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        job = Job.objects.get(id=data["job_id"])
+        self.assertEqual(job.kind, "update_matches")
+        self.assertEqual(job.status, "queued")
+        self.assertNotIn("async", job.payload)
+        # Nothing ran yet
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, "scheduled")
+
+        claimed = jobs.claim_next("test-worker")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, "running")
+        self.assertIsNone(jobs.claim_next("test-worker"))
+
+        jobs.run_job(claimed)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.result["status_code"], 200)
+        self.assertEqual(job.result["data"]["updated_count"], 1)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, "completed")
+
+        response = self.client.get(data["status_url"], HTTP_AUTHORIZATION="Bearer dev")
+        self.assertEqual(json.loads(response.content)["status"], "succeeded")
+
+    @mock.patch.dict(views.MATCH_UPDATERS, {"faceit": (fake_fetch, fake_apply)})
+    def test_sync_request_runs_inline(self):
+        response = self.post("update_matches", {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_handler_response_fails_job(self):
+        job = jobs.enqueue("merge_teams", {"primary_team_id": str(self.team1.id)})
+
+        jobs.run_job(jobs.claim_next())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.result["status_code"], 400)
+        self.assertIn("required", job.error)
+
+    def test_cancel_queued_job(self):
+        job = jobs.enqueue("update_matches", {})
+
+        response = self.client.post(
+            reverse("cancel_job", args=[job.id]), HTTP_AUTHORIZATION="Bearer dev"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "cancelled")
+        self.assertIsNone(jobs.claim_next())
+
+        response = self.client.post(
+            reverse("cancel_job", args=[job.id]), HTTP_AUTHORIZATION="Bearer dev"
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_running_job_stops_at_progress_report(self):
+        with mock.patch.dict(jobs.JOB_HANDLERS, {"cancellable": cancellable_job}):
+            job = jobs.enqueue("cancellable")
+            jobs.run_job(jobs.claim_next())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "cancelled")
+        self.assertEqual(job.progress, 1)
+        self.assertEqual(job.progress_total, 2)
+        self.assertIsNone(job.result)
+
+    def test_cancelled_handler_is_not_reported_as_failure(self):
+        def cancel_during_fetch(matches):
+            Job.objects.update(cancel_requested=True)
+            jobs.report_progress(1, len(matches), "Fetching match updates")
+            return {}, {}
+
+        job = jobs.enqueue("update_matches", {})
+        # The real handler, whose broad except turns errors into a 500
+        with mock.patch.object(views, "fetch_match_updates", cancel_during_fetch):
+            jobs.run_job(jobs.claim_next())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "cancelled")
+        self.assertIsNone(job.result)
+
+    def test_heartbeat_is_written_while_handler_runs(self):
+        beats = []
+
+        def slow_job(data):
+            time.sleep(0.2)
+            return Response({"message": "done"})
+
+        with mock.patch.dict(jobs.JOB_HANDLERS, {"slow": slow_job}):
+            job = jobs.enqueue("slow")
+            with override_settings(JOB_HEARTBEAT_SECONDS=0.05):
+                with mock.patch.object(jobs.Job.objects, "filter") as filter_jobs:
+                    filter_jobs.return_value.exists.return_value = False
+                    filter_jobs.return_value.update.side_effect = lambda **kw: beats.append(kw)
+                    jobs.run_job(jobs.claim_next())
+
+        self.assertGreaterEqual(len(beats), 2)
+        self.assertIn("heartbeat_at", beats[0])
+
+    def test_stale_jobs_requeued_and_old_jobs_purged(self):
+        stale = jobs.enqueue("update_matches", {}, max_attempts=2)
+        jobs.claim_next()
+        Job.objects.filter(id=stale.id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        old = Job.objects.create(
+            kind="update_matches",
+            status="succeeded",
+            finished_at=timezone.now() - timedelta(days=30),
+        )
+        recent = Job.objects.create(
+            kind="update_matches", status="failed", finished_at=timezone.now()
+        )
+
+        self.assertEqual(jobs.requeue_stale(timeout=60), 1)
+        self.assertEqual(jobs.purge_finished(days=14), 1)
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, "queued")
+        self.assertFalse(Job.objects.filter(id=old.id).exists())
+        self.assertTrue(Job.objects.filter(id=recent.id).exists())
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from cc import views
+from cc.management.commands import poll_matches
+from cc.match_polling import MatchSchedule, poll_interval
+from cc.models import Match, Team
+from cc.tests.fakes import fake_apply, fake_fetch
+
+
+class FakeMatch:
+    def __init__(self, match_id, status="scheduled", date=None):
+        self.id = match_id
+        self.status = status
+        self.date = date
+
+
+@override_settings(
+    MATCH_POLL_LIVE_SECONDS=60,
+    MATCH_POLL_SOON_SECONDS=900,
+    MATCH_POLL_IDLE_SECONDS=21600,
+)
+class MatchScheduleTestCase(SimpleTestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def test_interval_follows_kickoff_distance(self):
+        live = FakeMatch(1, status="in_progress")
+        kickoff = FakeMatch(2, date=self.now + timedelta(minutes=30))
+        soon = FakeMatch(3, date=self.now + timedelta(hours=5))
+        later = FakeMatch(4, date=self.now + timedelta(days=5))
+
+        self.assertEqual(poll_interval(live, self.now), 60)
+        self.assertEqual(poll_interval(kickoff, self.now), 60)
+        self.assertEqual(poll_interval(soon, self.now), 900)
+        self.assertEqual(poll_interval(later, self.now), 21600)
+        # Still "scheduled" days after kickoff: most likely never played
+        abandoned = FakeMatch(5, date=self.now - timedelta(days=2))
+        self.assertEqual(poll_interval(abandoned, self.now), 21600)
+        # Unchanged checks back off, up to 8x and never past the idle interval
+        self.assertEqual(poll_interval(live, self.now, unchanged=2), 240)
+        self.assertEqual(poll_interval(live, self.now, unchanged=10), 480)
+        self.assertEqual(poll_interval(soon, self.now, unchanged=10), 7200)
+        self.assertEqual(poll_interval(later, self.now, unchanged=3), 21600)
+
+    def test_due_matches_come_out_in_order(self):
+        schedule = MatchSchedule()
+        live = FakeMatch(1, status="in_progress")
+        later = FakeMatch(2, date=self.now + timedelta(days=5))
+        schedule.sync([live, later], self.now)
+
+        self.assertEqual(schedule.pop_due(self.now, 10), [1])
+        schedule.reschedule(live, changed=False, now=self.now)
+        self.assertEqual(schedule.next_due(), self.now + timedelta(seconds=120))
+
+        in_a_day = self.now + timedelta(days=1)
+        self.assertEqual(schedule.pop_due(in_a_day, 10), [1, 2])
+
+    def test_sync_drops_closed_and_reschedules_changed_matches(self):
+        schedule = MatchSchedule()
+        match = FakeMatch(1, date=self.now + timedelta(days=5))
+        other = FakeMatch(2, date=self.now + timedelta(days=5))
+        schedule.sync([match, other], self.now)
+
+        match.date = self.now + timedelta(minutes=10)
+        schedule.sync([match], self.now)
+
+        self.assertEqual(len(schedule), 1)
+        self.assertEqual(schedule.pop_due(self.now, 10), [1])
+
+    def test_failed_checks_are_deferred_with_backoff(self):
+        schedule = MatchSchedule()
+        live = FakeMatch(1, status="in_progress")
+        schedule.sync([live], self.now)
+
+        match_ids = schedule.pop_due(self.now, 10)
+        schedule.defer(match_ids, self.now)
+        schedule.defer(schedule.pop_due(self.now + timedelta(minutes=2), 10), self.now)
+
+        self.assertEqual(len(schedule), 1)
+        self.assertEqual(schedule.next_due(), self.now + timedelta(seconds=240))
+
+
+class PollMatchesCommandTestCase(TestCase):
+    @mock.patch.dict(views.MATCH_UPDATERS, {"faceit": (fake_fetch, fake_apply)})
+    def test_once_polls_due_matches(self):
+        team1 = Team.objects.create(name="Team 1")
+        team2 = Team.objects.create(name="Team 2")
+        now = timezone.now()
+        live = Match.objects.create(
+            team1=team1, team2=team2, date=now, status="in_progress", platform="faceit"
+        )
+        later = Match.objects.create(
+            team1=team1, team2=team2, date=now + timedelta(days=5), platform="faceit"
+        )
+
+        out = StringIO()
+        call_command("poll_matches", "--once", stdout=out)
+
+        live.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(live.status, "completed")
+        self.assertEqual(later.status, "scheduled")
+        self.assertIn("Checked 1 matches: 1 updated", out.getvalue())
+
+    def test_failed_poll_does_not_stop_the_poller(self):
+        team1 = Team.objects.create(name="Team 1")
+        team2 = Team.objects.create(name="Team 2")
+        Match.objects.create(
+            team1=team1,
+            team2=team2,
+            date=timezone.now(),
+            status="in_progress",
+            platform="faceit",
+        )
+
+        fetch = mock.Mock(side_effect=RuntimeError("database went away"))
+        with mock.patch.object(poll_matches, "fetch_match_updates", fetch):
+            with self.assertLogs(poll_matches.logger, "ERROR"):
+                call_command("poll_matches", "--once", stdout=StringIO())
+
+        fetch.assert_called_once()
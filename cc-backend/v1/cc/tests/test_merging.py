@@ -0,0 +1,116 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cc.models import (
+    Competition,
+    EloHistory,
+    Event,
+    Match,
+    Participant,
+    Player,
+    Ranking,
+    RankingItem,
+    Season,
+    Team,
+)
+
+
+@override_settings(DEBUG=True)
+class MergeTeamsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        now = timezone.now()
+        self.season = Season.objects.create(name="2025", start_date=now, end_date=now)
+        self.league = Competition.objects.create(name="League")
+        self.cup = Competition.objects.create(name="Cup")
+
+        self.primary = Team.objects.create(name="State")
+        self.secondary = Team.objects.create(name="State University")
+        self.other = Team.objects.create(name="Tech")
+
+        Player.objects.create(name="p1", team=self.primary)
+        Player.objects.create(name="s1", team=self.secondary)
+        Player.objects.create(name="s2", team=self.secondary)
+
+        self.shared = Participant.objects.create(
+            team=self.primary, competition=self.league, season=self.season
+        )
+        Participant.objects.create(
+            team=self.secondary,
+            competition=self.league,
+            season=self.season,
+            faceit_id="faction-s",
+        )
+        self.cup_participant = Participant.objects.create(
+            team=self.secondary, competition=self.cup, season=self.season
+        )
+
+        self.match = Match.objects.create(
+            team1=self.secondary, team2=self.other, winner=self.secondary, date=now
+        )
+        Match.objects.create(team1=self.other, team2=self.secondary, date=now)
+        EloHistory.objects.create(
+            match=self.match,
+            team=self.secondary,
+            match_date=now,
+            elo_before=1000,
+            elo_after=1016,
+        )
+
+        ranking = Ranking.objects.create(season=self.season, date=now)
+        RankingItem.objects.create(ranking=ranking, team=self.primary, rank=1)
+        RankingItem.objects.create(ranking=ranking, team=self.secondary, rank=2)
+        self.event = Event.objects.create(
+            name="Open", start_date=now, end_date=now, winner=self.secondary
+        )
+
+    def merge(self, **extra):
+        return self.client.post(
+            reverse("merge_teams"),
+            {
+                "primary_team_id": str(self.primary.id),
+                "secondary_team_id": str(self.secondary.id),
+                **extra,
+            },
+            format="json",
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+    def test_merge_moves_everything_to_primary(self):
+        response = self.merge()
+
+        self.assertEqual(response.status_code, 200)
+        merged = response.json()["merged_data"]
+        self.assertEqual(merged["players_moved"], 2)
+        self.assertEqual(merged["participants_moved"], 1)
+        self.assertEqual(merged["participants_merged"], 1)
+        self.assertEqual(merged["matches_updated"], 2)
+        self.assertEqual(merged["ranking_items_dropped"], 1)
+
+        self.assertFalse(Team.objects.filter(id=self.secondary.id).exists())
+        self.assertEqual(self.primary.roster.count(), 3)
+        self.shared.refresh_from_db()
+        self.assertEqual(self.shared.faceit_id, "faction-s")
+        self.cup_participant.refresh_from_db()
+        self.assertEqual(self.cup_participant.team, self.primary)
+        self.match.refresh_from_db()
+        self.assertEqual(
+            (self.match.team1, self.match.winner), (self.primary, self.primary)
+        )
+        self.assertEqual(self.match.elo_history.get().team, self.primary)
+        self.assertEqual(RankingItem.objects.get().team, self.primary)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.winner, self.primary)
+
+    def test_dry_run_reports_counts_without_changes(self):
+        response = self.merge(dry_run=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["dry_run"])
+        self.assertEqual(response.json()["merged_data"]["players_moved"], 2)
+        self.assertTrue(Team.objects.filter(id=self.secondary.id).exists())
+        self.assertEqual(self.secondary.roster.count(), 2)
+        self.assertEqual(Participant.objects.count(), 3)
+        self.assertEqual(RankingItem.objects.count(), 2)
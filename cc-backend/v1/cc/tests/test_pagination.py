@@ -0,0 +1,83 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+import json
+
+from cc.models import Team, Player
+from cc.public_cache import CACHE_ALIAS
+
+
+class CursorPaginationTestCase(TestCase):
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.team = Team.objects.create(name="Cursor Team")
+
+        # Duplicate elo values exercise the id tiebreaker
+        for i in range(7):
+            Player.objects.create(
+                name=f"Player {i}", elo=1000 + (i // 2) * 100, team=self.team
+            )
+
+    def fetch(self, **params):
+        response = self.client.get(reverse("public_players"), params)
+        return response, json.loads(response.content)
+
+    def walk_forward(self, **params):
+        ids = []
+        _, content = self.fetch(cursor="", page_size=3, **params)
+        ids.extend(player["id"] for player in content["results"])
+        while content["next_cursor"]:
+            _, content = self.fetch(
+                cursor=content["next_cursor"], page_size=3, **params
+            )
+            ids.extend(player["id"] for player in content["results"])
+        return ids
+
+    def test_cursor_mode_visits_every_row_once_in_order(self):
+        for order in ("asc", "desc"):
+            ids = self.walk_forward(sort="elo", order=order)
+
+            sort_field = "elo" if order == "asc" else "-elo"
+            id_order = "id" if order == "asc" else "-id"
+            expected = [
+                str(pk)
+                for pk in Player.objects.order_by(sort_field, id_order).values_list(
+                    "id", flat=True
+                )
+            ]
+            self.assertEqual(ids, expected)
+
+    def test_cursor_mode_skips_count(self):
+        response, content = self.fetch(cursor="", page_size=3)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", content)
+        self.assertNotIn("total_pages", content)
+        self.assertIsNone(content["prev_cursor"])
+        self.assertIsNotNone(content["next_cursor"])
+
+    def test_prev_cursor_returns_previous_page(self):
+        _, first = self.fetch(cursor="", page_size=3, sort="elo")
+        _, second = self.fetch(cursor=first["next_cursor"], page_size=3, sort="elo")
+        _, back = self.fetch(cursor=second["prev_cursor"], page_size=3, sort="elo")
+
+        self.assertEqual(back["results"], first["results"])
+        self.assertIsNone(back["prev_cursor"])
+
+    def test_invalid_cursor(self):
+        response, content = self.fetch(cursor="not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(content["error"], "Invalid cursor")
+
+        # A cursor is tied to the ordering it was issued for
+        _, first = self.fetch(cursor="", page_size=3, sort="elo")
+        response, _ = self.fetch(cursor=first["next_cursor"], sort="name")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_page_mode_is_default(self):
+        _, content = self.fetch(page_size=3)
+        self.assertEqual(content["count"], 7)
+        self.assertEqual(content["total_pages"], 3)
@@ -0,0 +1,108 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cc import participant_matching
+from cc.models import Competition, Participant, Season, Team
+
+
+@override_settings(DEBUG=True)
+class ParticipantSuggestionsTestCase(TestCase):
+    def setUp(self):
+        participant_matching._cached = None
+        self.client = APIClient()
+        self.url = reverse("participant_suggestions")
+        now = timezone.now()
+        self.old_season = Season.objects.create(
+            name="2024", start_date=now, end_date=now
+        )
+        self.season = Season.objects.create(name="2025", start_date=now, end_date=now)
+        self.league = Competition.objects.create(name="League")
+
+        self.iowa = Team.objects.create(name="Iowa State", school_name="ISU")
+        self.ohio = Team.objects.create(name="Ohio Bobcats")
+        Participant.objects.create(
+            team=self.iowa, competition=self.league, season=self.old_season
+        )
+        Participant.objects.create(
+            team=self.iowa, competition=self.league, season=self.season
+        )
+        Participant.objects.create(
+            team=self.ohio,
+            competition=self.league,
+            season=self.old_season,
+            faceit_id="faction-ohio",
+        )
+        Participant.objects.create(
+            team=self.ohio, competition=self.league, season=self.season
+        )
+
+    def get(self, **params):
+        response = self.client.get(
+            self.url, params, HTTP_AUTHORIZATION="Bearer dev"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_suggests_similar_names_and_shared_platform_ids(self):
+        # Created by an import under another spelling
+        copy = Team.objects.create(name="Iowa State University Esports")
+        imported = Participant.objects.create(
+            team=copy, competition=self.league, season=self.season
+        )
+        unnamed = Participant.objects.create(
+            competition=self.league, season=self.season, faceit_id="faction-ohio"
+        )
+
+        data = self.get()
+
+        self.assertEqual(data["count"], 2)
+        results = {item["id"]: item for item in data["results"]}
+        suggestions = results[imported.id]["suggestions"]
+        self.assertEqual(suggestions[0]["team_id"], self.iowa.id)
+        self.assertNotIn(copy.id, [item["team_id"] for item in suggestions])
+        suggestions = results[unnamed.id]["suggestions"]
+        self.assertEqual(suggestions[0]["team_id"], self.ohio.id)
+        self.assertEqual(suggestions[0]["shared_ids"], ["faceit_id"])
+        self.assertEqual(suggestions[0]["score"], 1.0)
+
+    def test_index_is_rebuilt_when_teams_change(self):
+        copy = Team.objects.create(name="Ohio Bobcat")
+        Participant.objects.create(
+            team=copy, competition=self.league, season=self.season
+        )
+        self.get()
+        index = participant_matching._cached[1]
+
+        self.get()
+        self.assertIs(participant_matching._cached[1], index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.create(name="Ohio Bobcats Esports")
+        data = self.get()
+        self.assertIsNot(participant_matching._cached[1], index)
+        names = [item["team_name"] for item in data["results"][0]["suggestions"]]
+        self.assertIn("Ohio Bobcats Esports", names)
+
+    def test_paginates_participants(self):
+        for _ in range(3):
+            Participant.objects.create(competition=self.league, season=self.season)
+
+        data = self.get(page=2, page_size=2)
+
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["total_pages"], 2)
+        self.assertEqual(len(data["results"]), 1)
+
+    def test_out_of_range_parameters_are_clamped(self):
+        copy = Team.objects.create(name="Ohio Bobcat")
+        Participant.objects.create(
+            team=copy, competition=self.league, season=self.season
+        )
+
+        data = self.get(page=-3, page_size=0, limit=-1)
+
+        self.assertEqual(data["page_size"], 1)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(len(data["results"][0]["suggestions"]), 1)
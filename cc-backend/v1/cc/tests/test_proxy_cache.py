@@ -0,0 +1,92 @@
+import threading
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cc import views
+from cc.proxy_cache import BYPASS, HIT, MISS, STALE, ProxyCache
+from cc.tests.fakes import FakeResponse
+
+
+class ProxyCacheTestCase(SimpleTestCase):
+    def test_fresh_entries_are_served_without_fetching(self):
+        cache = ProxyCache()
+        fetch = mock.Mock(return_value={"id": 1})
+
+        self.assertEqual(cache.get("a", 60, fetch), ({"id": 1}, MISS))
+        self.assertEqual(cache.get("a", 60, fetch), ({"id": 1}, HIT))
+        self.assertEqual(cache.get("a", 60, fetch, refresh=True), ({"id": 1}, BYPASS))
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_concurrent_requests_share_one_fetch(self):
+        cache = ProxyCache()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("a", 60, fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let every thread reach the cache before the fetch completes
+        while cache.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([value for value, _ in results], ["value"] * 5)
+
+    def test_serves_stale_entry_when_fetch_fails(self):
+        cache = ProxyCache(stale_seconds=60)
+        cache.get("a", 0, lambda: "old")
+
+        def failing_fetch():
+            raise requests.ConnectionError("down")
+
+        self.assertEqual(cache.get("a", 60, failing_fetch), ("old", STALE))
+        with self.assertRaises(requests.ConnectionError):
+            cache.get("b", 60, failing_fetch)
+
+
+class LeagueSpotProxyTestCase(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        views.leaguespot_cache.clear()
+        self.url = reverse("proxy_leaguespot_stage", args=["stage-1"])
+
+    @mock.patch("cc.views.http_client.get")
+    def test_stage_is_cached_and_refreshable(self, get):
+        get.return_value = FakeResponse(200, {"id": "stage-1"})
+
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        refreshed = self.client.get(self.url, HTTP_X_PROXY_REFRESH="1")
+
+        self.assertEqual(first.json(), {"id": "stage-1"})
+        self.assertEqual(
+            [first["X-Cache"], second["X-Cache"], refreshed["X-Cache"]],
+            [MISS, HIT, BYPASS],
+        )
+        self.assertEqual(get.call_count, 2)
+
+    @mock.patch("cc.views.http_client.get")
+    def test_upstream_error_without_cached_copy(self, get):
+        get.return_value = FakeResponse(503)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("Failed to fetch stage data", response.json()["error"])
@@ -1,14 +1,33 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 import json
-
-from cc.models import Team, Player, Match, Season, Event, EventMatch
+from datetime import timedelta
+
+from cc.models import (
+    Team,
+    Player,
+    Match,
+    Season,
+    Event,
+    EventMatch,
+    Competition,
+    Participant,
+    Ranking,
+    RankingItem,
+)
+from cc.public_cache import CACHE_ALIAS
+from cc.rankings import rebuild_current_rankings
 
 
 class PublicAPITestCase(TestCase):
     def setUp(self):
+        caches[CACHE_ALIAS].clear()
         self.client = APIClient()
 
         # Create test data
@@ -140,3 +159,72 @@ class PublicAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         content = json.loads(response.content)
         self.assertEqual(content["count"], 1)  # Our test season is current
+
+
+# Measure the view itself rather than the response cache
+@override_settings(PUBLIC_API_CACHE_ENABLED=False)
+class PublicTeamsBatchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        now = timezone.now()
+        self.season = Season.objects.create(
+            name="Current Season",
+            start_date=now - timedelta(days=30),
+            end_date=now + timedelta(days=30),
+        )
+        self.competition = Competition.objects.create(name="Test League")
+        self.ranking = Ranking.objects.create(season=self.season)
+
+        for i in range(5):
+            team = Team.objects.create(name=f"Batch Team {i}", elo=1000 + i)
+            captain = Player.objects.create(name=f"Captain {i}", team=team)
+            team.captain = captain
+            team.save()
+            Participant.objects.create(
+                team=team, competition=self.competition, season=self.season
+            )
+            RankingItem.objects.create(
+                ranking=self.ranking, team=team, rank=5 - i, elo=team.elo
+            )
+        rebuild_current_rankings(self.season)
+
+    def test_public_teams_includes_batched_context(self):
+        """Captain, competitions and ranking are resolved for every team"""
+        response = self.client.get(reverse("public_teams"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)
+        self.assertEqual(content["count"], 5)
+
+        for team in content["results"]:
+            self.assertIsNotNone(team["captain"])
+            self.assertEqual(
+                team["current_competitions"][0]["name"], self.competition.name
+            )
+            self.assertEqual(
+                team["current_ranking"]["ranking"]["id"], str(self.ranking.id)
+            )
+
+    def test_public_teams_query_count_is_constant(self):
+        """Adding teams to the page must not add queries"""
+        url = reverse("public_teams")
+        self.client.get(url)  # warm the current season cache
+
+        with CaptureQueriesContext(connection) as five_teams:
+            self.client.get(url)
+
+        for i in range(5, 10):
+            team = Team.objects.create(name=f"Batch Team {i}")
+            Participant.objects.create(
+                team=team, competition=self.competition, season=self.season
+            )
+            RankingItem.objects.create(
+                ranking=self.ranking, team=team, rank=i + 1, elo=team.elo
+            )
+        rebuild_current_rankings(self.season)
+
+        with CaptureQueriesContext(connection) as ten_teams:
+            self.client.get(url)
+
+        self.assertEqual(len(five_teams), len(ten_teams))
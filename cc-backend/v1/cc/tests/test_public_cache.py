@@ -0,0 +1,135 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+import json
+
+from cc.models import Season, Team
+from cc.public_cache import (
+    CACHE_ALIAS,
+    cache_stats,
+    data_versions,
+    invalidate_models,
+)
+
+
+class PublicCacheTestCase(TestCase):
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.team = Team.objects.create(name="Cached Team", elo=1200)
+
+    def get_teams(self, **params):
+        response = self.client.get(reverse("public_teams"), params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_repeat_request_served_from_cache(self):
+        first = self.get_teams()
+        with self.assertNumQueries(1):
+            second = self.get_teams()
+        self.assertEqual(first, second)
+
+        stats = cache_stats()["endpoints"]["public_teams"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_query_params_are_normalized(self):
+        self.get_teams(sort="name", page_size=10)
+        with self.assertNumQueries(1):
+            self.get_teams(page_size=10, sort="name", search="")
+
+    def test_save_invalidates_dependent_responses(self):
+        self.get_teams()
+        self.team.name = "Renamed Team"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.save()
+
+        data = self.get_teams()
+        self.assertEqual(data["results"][0]["name"], "Renamed Team")
+        self.assertGreaterEqual(cache_stats()["tags"]["Team"]["invalidations"], 1)
+
+    def test_bulk_update_needs_explicit_invalidation(self):
+        self.get_teams()
+        Team.objects.all().update(elo=900)
+        self.assertEqual(self.get_teams()["results"][0]["elo"], 1200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_models(Team)
+        self.assertEqual(self.get_teams()["results"][0]["elo"], 900)
+
+    def test_versions_are_bumped_once_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.save()
+        version = data_versions(["Team"])["Team"][0]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.team.save()
+            Team.objects.create(name="Another Team")
+            # Nothing is written to the shared version rows before the commit
+            self.assertEqual(data_versions(["Team"])["Team"][0], version)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(data_versions(["Team"])["Team"][0], version + 1)
+
+    def test_unrelated_writes_keep_entries(self):
+        self.get_teams()
+        self.client.get(reverse("public_seasons"))
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.create(name="Another Team")
+
+        # public_seasons does not depend on teams
+        with self.assertNumQueries(1):
+            self.client.get(reverse("public_seasons"))
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get(reverse("public_teams"))
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("public_teams"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(reverse("public_teams"))["ETag"]
+        self.team.elo = 1300
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.save()
+
+        response = self.client.get(reverse("public_teams"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_season_rollover_changes_etag(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            Season.objects.create(
+                name="Ending Season",
+                start_date=now - timedelta(days=30),
+                end_date=now,
+            )
+            Season.objects.create(
+                name="Next Season",
+                start_date=now + timedelta(days=1),
+                end_date=now + timedelta(days=30),
+            )
+
+        response = self.client.get(reverse("public_seasons"), {"current": "true"})
+        etag = response["ETag"]
+        self.assertFalse(response.has_header("Last-Modified"))
+        self.assertEqual(response.data["results"][0]["name"], "Ending Season")
+
+        # No write happens at the boundary, only the date moves on
+        with patch("cc.seasons.timezone.now", return_value=now + timedelta(days=2)):
+            response = self.client.get(
+                reverse("public_seasons"), {"current": "true"}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["name"], "Next Season")
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+import json
+
+from cc.models import CurrentRankingItem, Ranking, RankingItem, Season, Team
+from cc.rankings import rebuild_current_rankings
+
+
+class CurrentRankingTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        now = timezone.now()
+        self.season = Season.objects.create(
+            name="Current Season",
+            start_date=now - timedelta(days=30),
+            end_date=now + timedelta(days=30),
+        )
+        self.team_a = Team.objects.create(name="Team A", elo=1100)
+        self.team_b = Team.objects.create(name="Team B", elo=1000)
+
+        self.old_ranking = self.snapshot([self.team_b, self.team_a])
+        self.new_ranking = self.snapshot([self.team_a, self.team_b])
+
+    def snapshot(self, teams):
+        ranking = Ranking.objects.create(season=self.season)
+        for rank, team in enumerate(teams, start=1):
+            RankingItem.objects.create(
+                ranking=ranking, team=team, rank=rank, elo=team.elo
+            )
+        return ranking
+
+    def test_rebuild_uses_latest_ranking_with_previous_rank(self):
+        self.assertEqual(rebuild_current_rankings(self.season), 2)
+
+        item = CurrentRankingItem.objects.get(season=self.season, team=self.team_a)
+        self.assertEqual(item.ranking, self.new_ranking)
+        self.assertEqual(item.rank, 1)
+        self.assertEqual(item.previous_rank, 2)
+
+    def test_rebuild_replaces_existing_rows(self):
+        rebuild_current_rankings(self.season)
+        rebuild_current_rankings(self.season)
+        self.assertEqual(
+            CurrentRankingItem.objects.filter(season=self.season).count(), 2
+        )
+
+    def test_management_command_rebuilds_all_seasons(self):
+        call_command("rebuild_current_rankings", stdout=StringIO())
+        self.assertEqual(
+            CurrentRankingItem.objects.filter(season=self.season).count(), 2
+        )
+
+    def test_migration_backfills_existing_rankings(self):
+        migration = import_module("cc.migrations.0019_backfill_current_ranking_items")
+        migration.backfill_current_ranking_items(apps, None)
+
+        item = CurrentRankingItem.objects.get(season=self.season, team=self.team_b)
+        self.assertEqual(item.ranking, self.new_ranking)
+        self.assertEqual(item.rank, 2)
+        self.assertEqual(item.previous_rank, 1)
+        self.assertEqual(
+            CurrentRankingItem.objects.filter(season=self.season).count(), 2
+        )
+
+    def test_team_current_ranking_reads_projection(self):
+        rebuild_current_rankings(self.season)
+
+        response = self.client.get(
+            reverse("public_team_current_ranking"), {"team_id": str(self.team_b.id)}
+        )
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(response.content)
+        self.assertEqual(content["rank"], 2)
+        self.assertEqual(content["previous_rank"], 1)
+        self.assertEqual(content["ranking"]["id"], str(self.new_ranking.id))
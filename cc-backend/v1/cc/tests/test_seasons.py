@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from cc.models import Season
+from cc.seasons import current_season, invalidate_current_season
+
+
+class CurrentSeasonTestCase(TestCase):
+    def setUp(self):
+        invalidate_current_season()
+        now = timezone.now()
+        self.past = Season.objects.create(
+            name="Past Season",
+            start_date=now - timedelta(days=400),
+            end_date=now - timedelta(days=200),
+        )
+        self.current = Season.objects.create(
+            name="Current Season",
+            start_date=now - timedelta(days=10),
+            end_date=now + timedelta(days=10),
+        )
+
+    def test_returns_season_containing_today(self):
+        self.assertEqual(current_season(), self.current)
+
+    def test_answers_from_cache(self):
+        current_season()
+        with self.assertNumQueries(0):
+            self.assertEqual(current_season(), self.current)
+
+    def test_season_writes_invalidate_cache(self):
+        self.assertEqual(current_season(), self.current)
+
+        self.current.end_date = timezone.now() - timedelta(days=1)
+        self.current.save()
+        self.assertIsNone(current_season())
+
+        now = timezone.now()
+        replacement = Season.objects.create(
+            name="Replacement Season",
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=100),
+        )
+        self.assertEqual(current_season(), replacement)
+
+        replacement.delete()
+        self.assertIsNone(current_season())
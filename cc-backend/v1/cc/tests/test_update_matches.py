@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+import json
+
+from cc import views
+from cc.elo import calculate_new_elo
+from cc.models import EloHistory, Match, Team
+from cc.tests.fakes import fake_apply, fake_fetch
+
+
+@override_settings(DEBUG=True)
+class UpdateMatchesTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.team1 = Team.objects.create(name="Team 1", elo=1000)
+        self.team2 = Team.objects.create(name="Team 2", elo=1000)
+        date = timezone.now() - timedelta(hours=2)
+
+        self.match = Match.objects.create(
+            team1=self.team1,
+            team2=self.team2,
+            date=date,
+            platform="faceit",
+            url="https://example.com/match",
+        )
+        self.broken = Match.objects.create(
+            team1=self.team1,
+            team2=self.team2,
+            date=date - timedelta(days=1),
+            platform="faceit",
+            url="https://example.com/broken",
+        )
+
+    @mock.patch.dict(views.MATCH_UPDATERS, {"faceit": (fake_fetch, fake_apply)})
+    def test_fetches_then_applies_in_one_pass(self):
+        response = self.client.post(
+            reverse("update_matches"),
+            {},
+            format="json",
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(response.content)
+        self.assertEqual(content["updated_count"], 1)
+        self.assertEqual(content["error_count"], 1)
+        statuses = {r["match_id"]: r["status"] for r in content["results"]}
+        self.assertEqual(statuses[str(self.match.id)], "updated")
+        self.assertEqual(statuses[str(self.broken.id)], "error")
+        self.assertEqual(content["timing"]["platforms"]["faceit"]["matches"], 2)
+
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.status, "completed")
+        self.assertEqual(self.match.winner, self.team1)
+        # The newly completed match was rated
+        self.assertEqual(EloHistory.objects.filter(match=self.match).count(), 2)
+        self.team1.refresh_from_db()
+        self.assertGreater(self.team1.elo, 1000)
+
+    @mock.patch.dict(views.MATCH_UPDATERS, {"faceit": (fake_fetch, fake_apply)})
+    def test_team_finishing_two_matches_in_one_batch_is_rated_twice(self):
+        self.broken.delete()
+        team3 = Team.objects.create(name="Team 3", elo=1000)
+        second = Match.objects.create(
+            team1=self.team1,
+            team2=team3,
+            date=self.match.date + timedelta(minutes=30),
+            platform="faceit",
+            url="https://example.com/second",
+        )
+
+        response = self.client.post(
+            reverse("update_matches"),
+            {},
+            format="json",
+            HTTP_AUTHORIZATION="Bearer dev",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        after_first = calculate_new_elo(1000, 1000, 1.0)
+        after_second = calculate_new_elo(after_first, 1000, 1.0)
+        self.team1.refresh_from_db()
+        self.assertEqual(self.team1.elo, after_second)
+        history = EloHistory.objects.get(match=second, team=self.team1)
+        self.assertEqual(history.elo_before, after_first)
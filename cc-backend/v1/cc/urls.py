@@ -2,6 +2,7 @@ from django.urls import path, include
 
 from . import views
 from . import admin_views
+from . import image_views
 from . import webhooks
 
 urlpatterns = [
@@ -26,6 +27,11 @@ urlpatterns = [
     path("matches/update/", views.update_matches, name="update_matches"),
     path("clear-database/", views.clear_database, name="clear_database"),
     path("participants/", views.match_participants, name="match_participants"),
+    path(
+        "participants/suggestions/",
+        views.participant_suggestions,
+        name="participant_suggestions",
+    ),
     path("player-elo/update/", views.update_player_elo, name="update_player_elo"),
     path("player-elo/reset/", views.reset_player_elo, name="reset_player_elo"),
     path("team-elo/calculate/", views.calculate_team_elos, name="calculate_team_elos"),
@@ -36,6 +42,11 @@ urlpatterns = [
         name="create_ranking_snapshot",
     ),
     path("merge-teams/", views.merge_teams, name="merge_teams"),
+    path(
+        "merge-teams/candidates/",
+        views.merge_candidates,
+        name="merge_candidates",
+    ),
     path("competitions/", views.list_competitions, name="list_competitions"),
     path(
         "competitions/create/",
@@ -55,6 +66,17 @@ urlpatterns = [
         name="import_team_from_faceit",
     ),
     path("players/<uuid:player_id>/", admin_views.update_player, name="update_player"),
+    # Picture uploads with resized variants
+    path(
+        "teams/<uuid:team_id>/picture/",
+        image_views.upload_team_picture,
+        name="upload_team_picture",
+    ),
+    path(
+        "players/<uuid:player_id>/picture/",
+        image_views.upload_player_picture,
+        name="upload_player_picture",
+    ),
     # Image proxy endpoint for CORS-free image access
     path("proxy/image/", admin_views.proxy_image, name="proxy_image"),
     # Custom events endpoints
@@ -91,6 +113,23 @@ urlpatterns = [
         name="proxy_leaguespot_participants",
     ),
     path("proxy/nwes/", views.proxy_nwes, name="proxy_nwes"),
+    path(
+        "public-cache/stats/",
+        admin_views.public_cache_stats,
+        name="public_cache_stats",
+    ),
+    path(
+        "outbound-http/stats/",
+        admin_views.outbound_http_stats,
+        name="outbound_http_stats",
+    ),
+    path("jobs/", admin_views.list_jobs, name="list_jobs"),
+    path("jobs/<uuid:job_id>/", admin_views.job_detail, name="job_detail"),
+    path(
+        "jobs/<uuid:job_id>/cancel/",
+        admin_views.cancel_job_view,
+        name="cancel_job",
+    ),
     path(
         "sanity-webhook/",
         webhooks.SanityWebhookView.as_view(),
@@ -10,7 +10,8 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone as dt_timezone
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.shortcuts import get_object_or_404
 from .models import (
     Team,
@@ -24,11 +25,37 @@ from .models import (
     Ranking,
     RankingItem,
 )
+from . import http_client
 from .middleware import firebase_auth_required
-
+from .elo import (
+    rating_state,
+    replay_all,
+    replay_from,
+    sync_deleted_match,
+    sync_match_rating,
+)
+from .competition_deletion import (
+    plan_competition_deletion,
+    preview_deletion,
+    purge_competition,
+)
+from .duplicates import find_duplicate_teams
+from .faceit import refresh_player_elos
+from .importing import ImportIdentities, payload_hash
+from .jobs import job_handler, report_progress, run_or_enqueue
+from .merging import merge_team
+from .participant_matching import suggestion_index
+from .proxy_cache import ProxyCache, UpstreamError
+from .public_cache import invalidate_models
+from .rankings import rebuild_current_rankings
+from .seasons import current_season
+
+import heapq
 import logging
 import requests
 import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -58,74 +85,14 @@ def safe_parse_datetime(dt):
     return None
 
 
-def calculate_new_elo(current_elo, opponent_elo, result):
-    """
-    Calculate new ELO rating after a match.
-
-    Args:
-        current_elo (int): Current ELO of the team
-        opponent_elo (int): ELO of the opponent team
-        result (float): Match result (1.0 for win, 0.0 for loss, 0.5 for draw)
-
-    Returns:
-        int: New ELO rating
-    """
-    k = 150  # K-factor, determines the maximum possible adjustment per game
-    expected_score = 1 / (1 + 10 ** ((opponent_elo - current_elo) / 800))
-    new_elo = current_elo + k * (result - expected_score)
-    return round(new_elo)
-
-
-def update_match_elos(match):
-    """
-    Update team ELOs based on match result.
-    Only updates if the match is completed and has a winner.
-
-    Args:
-        match (Match): The completed match to process
-
-    Returns:
-        bool: True if ELOs were updated, False otherwise
-    """
-    if match.status != "completed" or not match.winner:
-        return False
-
-    # Get current ELOs
-    team1_elo = match.team1.elo
-    team2_elo = match.team2.elo
-
-    # Determine results (1.0 for win, 0.0 for loss)
-    if match.winner == match.team1:
-        team1_result = 1.0
-        team2_result = 0.0
-    elif match.winner == match.team2:
-        team1_result = 0.0
-        team2_result = 1.0
-    else:
-        return False
-
-    # Calculate new ELOs
-    new_team1_elo = calculate_new_elo(team1_elo, team2_elo, team1_result)
-    new_team2_elo = calculate_new_elo(team2_elo, team1_elo, team2_result)
-
-    # Update teams
-    match.team1.elo = new_team1_elo
-    match.team2.elo = new_team2_elo
-    match.team1.save()
-    match.team2.save()
-
-    logger.info(
-        f"Updated ELOs for match {match.id}: {match.team1.name} {team1_elo}→{new_team1_elo}, {match.team2.name} {team2_elo}→{new_team2_elo}"
-    )
-
-    return True
-
-
 def recalculate_all_elos(reset_to_default=False, default_elo=1000):
     """
     Recalculate ELO ratings for all teams based on completed matches in chronological order.
     This is useful when importing historical match data.
 
+    The whole replay runs in memory (see cc.elo); the final ratings and the
+    rebuilt EloHistory are written back in one transaction.
+
     Args:
         reset_to_default (bool): Whether to reset all team ELOs to default before recalculating
         default_elo (int): Default ELO to reset teams to if reset_to_default is True
@@ -133,61 +100,35 @@ def recalculate_all_elos(reset_to_default=False, default_elo=1000):
     Returns:
         dict: Summary of the recalculation process
     """
-    # Reset all team ELOs to default if requested
-    if reset_to_default:
-        Team.objects.all().update(elo=default_elo)
-        logger.info(f"Reset all team ELOs to {default_elo}")
-
-    # Get all completed matches with winners, ordered by date
-    completed_matches = (
-        Match.objects.filter(status="completed", winner__isnull=False)
-        .exclude(
-            models.Q(team1__name__iexact="bye") | models.Q(team2__name__iexact="bye")
-        )
-        .order_by("date")
+    names = dict(Team.objects.values_list("id", "name"))
+    rows, applied, teams_updated = replay_all(
+        default_elo if reset_to_default else None
     )
 
-    processed_count = 0
-    error_count = 0
     elo_changes = []
+    for row, team1_before, team1_after, team2_before, team2_after in applied:
+        match_id, date, team1_id, team2_id, winner_id = row
+        elo_changes.append(
+            {
+                "match_id": str(match_id),
+                "date": date.isoformat() if date else None,
+                "team1": names[team1_id],
+                "team2": names[team2_id],
+                "winner": names.get(winner_id, "Unknown"),
+                "team1_elo_change": f"{team1_before} → {team1_after}",
+                "team2_elo_change": f"{team2_before} → {team2_after}",
+            }
+        )
 
-    for match in completed_matches:
-        try:
-            # Store ELOs before update for logging
-            old_team1_elo = match.team1.elo
-            old_team2_elo = match.team2.elo
-
-            # Update ELOs for this match
-            if update_match_elos(match):
-                processed_count += 1
-
-                # Log the change
-                elo_changes.append(
-                    {
-                        "match_id": str(match.id),
-                        "date": match.date.isoformat() if match.date else None,
-                        "team1": match.team1.name,
-                        "team2": match.team2.name,
-                        "winner": match.winner.name if match.winner else "Unknown",
-                        "team1_elo_change": f"{old_team1_elo} → {match.team1.elo}",
-                        "team2_elo_change": f"{old_team2_elo} → {match.team2.elo}",
-                    }
-                )
-
-                logger.info(
-                    f"Processed match {match.id}: {match.team1.name} vs {match.team2.name}, "
-                    f"winner: {match.winner.name if match.winner else 'Unknown'}, "
-                    f"ELO changes: {match.team1.name} {old_team1_elo}→{match.team1.elo}, "
-                    f"{match.team2.name} {old_team2_elo}→{match.team2.elo}"
-                )
-        except Exception as e:
-            error_count += 1
-            logger.error(f"Error processing match {match.id}: {str(e)}")
+    logger.info(
+        f"Recalculated ELOs from {len(applied)} matches, updated {teams_updated} teams"
+        + (f" (reset to {default_elo})" if reset_to_default else "")
+    )
 
     return {
-        "total_matches": completed_matches.count(),
-        "processed_count": processed_count,
-        "error_count": error_count,
+        "total_matches": len(rows),
+        "processed_count": len(applied),
+        "error_count": 0,
         "reset_to_default": reset_to_default,
         "default_elo": default_elo if reset_to_default else None,
         "elo_changes": elo_changes,
@@ -212,11 +153,17 @@ def import_matches(request):
         "data": {...}, // API response data
         "participant_matches": { "participant_id": "team_id", ... }, // Optional
         "event_id": "uuid", // Optional - if provided, imports as event matches
-        "import_type": "league" | "event" // Optional - specifies import type
+        "import_type": "league" | "event", // Optional - specifies import type
+        "async": true // Optional - run as a background job, returns a job_id
     }
     """
+    return run_or_enqueue(request, run_import_matches)
+
+
+@job_handler("import_matches")
+def run_import_matches(data):
+    """Import the matches described by import_matches request data."""
     try:
-        data = request.data
         platform = data.get("platform", "").lower()
         competition_name = data.get("competition_name", "")
         season_id = data.get("season_id")
@@ -351,6 +298,33 @@ def import_matches(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def preload_matches(match_ids, event=None):
+    """
+    Load the import hashes of the matches of an import batch that already
+    exist, plus the ids of those already linked to the event, with one query
+    each. Returns ({match id: import hash}, {linked match id}).
+    """
+    existing = dict(
+        Match.objects.filter(id__in=match_ids).values_list("id", "import_hash")
+    )
+    linked = set()
+    if event:
+        linked = set(
+            EventMatch.objects.filter(
+                event=event, match_id__in=list(existing)
+            ).values_list("match_id", flat=True)
+        )
+    return existing, linked
+
+
+def parse_match_id(match_id):
+    """The UUID of an upstream match id, or None if it isn't one."""
+    try:
+        return uuid.UUID(str(match_id))
+    except (TypeError, ValueError):
+        return None
+
+
 def import_regentsleague_match_data(
     matches: list[dict], competition, season
 ):
@@ -368,18 +342,53 @@ def import_regentsleague_match_data(
     updated_matches = []
     skipped_matches = []
 
-    for match_data in matches:
+    match_ids = [
+        uuid.uuid5(uuid.NAMESPACE_DNS, f"regentsleague-{match_data.get('id')}")
+        for match_data in matches
+    ]
+    digests = [payload_hash(match_data) for match_data in matches]
+    import_hashes, _ = preload_matches(match_ids)
+
+    # Resolve the teams of every new or changed match up front
+    pending = [
+        index
+        for index, match_id in enumerate(match_ids)
+        if import_hashes.get(match_id) != digests[index]
+    ]
+    report_progress(0, len(matches), "Resolving teams and players")
+    identities = ImportIdentities(competition, season, "regentsleague")
+    teams = identities.resolve_teams(
+        [matches[index][key] for index in pending for key in ("team1", "team2")]
+    )
+    match_teams = {
+        index: (teams[2 * n], teams[2 * n + 1]) for n, index in enumerate(pending)
+    }
+
+    new_matches = []
+    changed_matches = []
+
+    for index, match_data in enumerate(matches):
+        report_progress(index, len(matches), "Importing matches")
         regentsleague_match_id = match_data.get("id")
-        match_id = uuid.uuid5(uuid.NAMESPACE_DNS, f"regentsleague-{regentsleague_match_id}") # Create a UUID based on the Regents League match ID. In the miniscule offchance this conflicts with an existing ID from a different league out of pure unluckiness I'll do a backflip.
+        match_id = match_ids[index] # Create a UUID based on the Regents League match ID. In the miniscule offchance this conflicts with an existing ID from a different league out of pure unluckiness I'll do a backflip.
+
+        if match_id in import_hashes:
+            # Skip updating existing matches - only import new matches
+            # Updates should be done separately through the update_matches endpoint
+            skipped_matches.append(str(match_id))
+            if import_hashes[match_id] != digests[index]:
+                changed_matches.append(Match(id=match_id, import_hash=digests[index]))
+                import_hashes[match_id] = digests[index]
+            logger.info(
+                f"Skipped existing match {match_id} - use update endpoint to modify"
+            )
+            continue  # Move to next match
+
         team1_data: dict = match_data.get("team1")
         team2_data: dict = match_data.get("team2")
         team1_key = team1_data.get("id")
         team2_key = team2_data.get("id")
-        team1, _ = get_or_create_team(team1_data, competition, season, "regentsleague")
-        team2, _ = get_or_create_team(team2_data, competition, season, "regentsleague")
-
-        if not team1 or not team2:
-            continue  # Skip if teams could not be created
+        team1, team2 = match_teams[index]
 
         # Extract results if available
         score_team1 = 0
@@ -404,35 +413,32 @@ def import_regentsleague_match_data(
             elif winner_key == team2_key:
                 winner = team2
 
-        # Check if match already exists
-        existing_match = Match.objects.filter(id=match_id).first()
-
-        if existing_match:
-            # Skip updating existing matches - only import new matches
-            # Updates should be done separately through the update_matches endpoint
-            skipped_matches.append(str(existing_match.id))
-            logger.info(
-                f"Skipped existing match {match_id} - use update endpoint to modify"
-            )
-            continue  # Move to next match
-
         # Create the match (only if it doesn't exist)
         match_date = match_data.get("date")
-        match = Match.objects.create(
-            id=match_id,
-            regentsleague_id=regentsleague_match_id,
-            team1=team1,
-            team2=team2,
-            date=safe_parse_datetime(match_date) if match_date else None,
-            status=status,
-            winner=winner,
-            score_team1=score_team1,
-            score_team2=score_team2,
-            platform="regentsleague",
-            season=season,
-            competition=competition,
+        new_matches.append(
+            Match(
+                id=match_id,
+                regentsleague_id=regentsleague_match_id,
+                team1=team1,
+                team2=team2,
+                date=safe_parse_datetime(match_date) if match_date else None,
+                status=status,
+                winner=winner,
+                score_team1=score_team1,
+                score_team2=score_team2,
+                platform="regentsleague",
+                season=season,
+                competition=competition,
+                import_hash=digests[index],
+            )
         )
-        imported_matches.append(str(match.id))
+        import_hashes[match_id] = digests[index]
+        imported_matches.append(str(match_id))
+
+    with transaction.atomic():
+        Match.objects.bulk_create(new_matches)
+        Match.objects.bulk_update(changed_matches, ["import_hash"], batch_size=500)
+    invalidate_models(Match)
 
     return {
         "imported": imported_matches,
@@ -440,12 +446,83 @@ def import_regentsleague_match_data(
         "skipped": skipped_matches,
     }
 
+
+def event_match_for(
+    event, match_id, match_data, platform, team1_data, team2_data, position
+):
+    """
+    Build the EventMatch linking an imported match to the event.
+    position is the num_in_bracket used when the payload has none.
+    """
+    status_value = match_data.get("status")
+
+    # Check for LeagueSpot event metadata first, then fall back to Faceit
+    event_metadata = match_data.get("_event_match_metadata", {})
+
+    if event_metadata and platform == "leaguespot":
+        # Use LeagueSpot round metadata
+        round_num = event_metadata.get("round", 1)
+        num_in_bracket = event_metadata.get("num_in_bracket", position)
+
+        # Extra info contains LeagueSpot round metadata
+        extra_info = {
+            "leaguespot_match_id": match_id,
+            "original_status": status_value,
+            "round_name": event_metadata.get("round_name", ""),
+            "round_state": event_metadata.get("round_state", 0),
+            "best_of": event_metadata.get("best_of", 1),
+        }
+    else:
+        # Faceit or legacy format
+        round_num = match_data.get("round", 1)  # Default to round 1 if not provided
+        num_in_bracket = match_data.get("position", position)
+
+        # Extra info can contain bracket-specific data
+        extra_info = {
+            "faceit_match_id": match_id,
+            "faceit_url": match_data.get("faceit_url"),
+            "original_status": status_value,
+        }
+
+        # Add any additional bracket metadata from Faceit
+        if "round" in match_data:
+            extra_info["round_name"] = match_data.get("round")
+        if "group" in match_data:
+            extra_info["group"] = match_data.get("group")
+
+    # Check for bye matches (TBD or Bye team names)
+    is_bye = False
+    team1_name = team1_data.get("name", "").lower()
+    team2_name = team2_data.get("name", "").lower()
+    if team1_name in ["bye", "tbd", "unknown team 1"] or team2_name in [
+        "bye",
+        "tbd",
+        "unknown team 2",
+    ]:
+        is_bye = True
+
+    return EventMatch(
+        match_id=match_id,
+        event=event,
+        round=round_num,
+        num_in_bracket=num_in_bracket,
+        is_bye=is_bye,
+        extra_info=extra_info,
+    )
+
+
 def import_match_data(
     api_data, competition, season, platform, event=None, import_type="league"
 ):
     """
     Process Faceit/LeagueSpot API data and import matches
 
+    Matches already imported from an identical payload (same import_hash)
+    are skipped outright. Teams, participants and players of the remaining
+    ones are resolved first by ImportIdentities, so the per-match loop below
+    only does dictionary lookups. New matches and event links are written
+    with bulk_create.
+
     Args:
         api_data: The API response data containing match information
         competition: Competition object
@@ -460,19 +537,98 @@ def import_match_data(
     imported_matches = []
     updated_matches = []
     skipped_matches = []
+    link_event = event and import_type == "event"
 
-    # Extract matches from the API response
-    matches = api_data.get("items", [])
-
-    for match_data in matches:
-        # Extract match details
-        match_id = match_data.get("match_id")
-        faceit_url = match_data.get("faceit_url")
-        status_value = match_data.get("status")
+    # Extract matches from the API response, skipping those without two teams
+    matches = []
+    for match_data in api_data.get("items", []):
+        teams_data = match_data.get("teams", {})
+        team_keys = list(teams_data.keys())
+        if len(team_keys) < 2:
+            continue  # Skip if not enough teams
 
         # Remove "1-" prefix from match_id if present
+        match_id = match_data.get("match_id")
         if match_id and str(match_id).startswith("1-"):
             match_id = str(match_id)[2:]
+        if parse_match_id(match_id) is None:
+            logger.warning(f"Skipped match with invalid id {match_id!r}")
+            continue
+
+        matches.append(
+            (
+                match_data,
+                parse_match_id(match_id),
+                team_keys[:2],
+                payload_hash(match_data),
+            )
+        )
+
+    import_hashes, linked_ids = preload_matches(
+        [match_id for _, match_id, _, _ in matches], event if link_event else None
+    )
+
+    # Resolve the teams of every new or changed match up front
+    pending = [
+        index
+        for index, (_, match_id, _, digest) in enumerate(matches)
+        if import_hashes.get(match_id) != digest
+    ]
+    report_progress(0, len(matches), "Resolving teams and players")
+    identities = ImportIdentities(competition, season, platform)
+    teams = identities.resolve_teams(
+        [
+            matches[index][0]["teams"][key]
+            for index in pending
+            for key in matches[index][2]
+        ]
+    )
+    match_teams = {
+        index: (teams[2 * n], teams[2 * n + 1]) for n, index in enumerate(pending)
+    }
+
+    new_matches = []
+    new_event_matches = []
+    changed_matches = []
+
+    for index, (match_data, match_id, team_keys, digest) in enumerate(matches):
+        report_progress(index, len(matches), "Importing matches")
+        team1_key, team2_key = team_keys
+        team1_data = match_data["teams"][team1_key]
+        team2_data = match_data["teams"][team2_key]
+
+        if match_id in import_hashes:
+            # Skip updating existing matches - only import new matches
+            # Updates should be done separately through the update_matches endpoint
+            skipped_matches.append(str(match_id))
+            if import_hashes[match_id] != digest:
+                changed_matches.append(Match(id=match_id, import_hash=digest))
+                import_hashes[match_id] = digest
+            logger.info(
+                f"Skipped existing match {match_id} - use update endpoint to modify"
+            )
+
+            # For event imports, link the existing match if it isn't yet
+            if link_event and match_id not in linked_ids:
+                new_event_matches.append(
+                    event_match_for(
+                        event,
+                        str(match_id),
+                        match_data,
+                        platform,
+                        team1_data,
+                        team2_data,
+                        len(imported_matches) + 1,
+                    )
+                )
+                linked_ids.add(match_id)
+                logger.info(f"Linked existing match {match_id} to event {event.id}")
+
+            continue  # Move to next match
+
+        # Extract match details
+        faceit_url = match_data.get("faceit_url")
+        status_value = match_data.get("status")
 
         # Convert Faceit status to our status format
         status_mapping = {
@@ -499,25 +655,7 @@ def import_match_data(
         else:
             match_date = None
 
-        # Process teams data
-        teams_data = match_data.get("teams", {})
-        team_keys = list(teams_data.keys())
-
-        if len(team_keys) < 2:
-            continue  # Skip if not enough teams
-
-        team1_key = team_keys[0]
-        team2_key = team_keys[1]
-
-        team1_data = teams_data.get(team1_key, {})
-        team2_data = teams_data.get(team2_key, {})
-
-        # Get or create teams
-        team1, _ = get_or_create_team(team1_data, competition, season, platform)
-        team2, _ = get_or_create_team(team2_data, competition, season, platform)
-
-        if not team1 or not team2:
-            continue  # Skip if teams could not be created
+        team1, team2 = match_teams[index]
 
         # Extract results if available
         score_team1 = 0
@@ -536,162 +674,48 @@ def import_match_data(
             elif winner_key == team2_key:
                 winner = team2
 
-        # Check if match already exists
-        existing_match = Match.objects.filter(id=match_id).first()
-
-        if existing_match:
-            # Skip updating existing matches - only import new matches
-            # Updates should be done separately through the update_matches endpoint
-            skipped_matches.append(str(existing_match.id))
-            logger.info(
-                f"Skipped existing match {match_id} - use update endpoint to modify"
-            )
-
-            # For event imports, check if EventMatch exists and create link if needed
-            if event and import_type == "event":
-                event_match = EventMatch.objects.filter(
-                    match=existing_match, event=event
-                ).first()
-
-                if not event_match:
-                    # Match exists but not linked to this event - create EventMatch
-                    # Extract event-specific data from match_data
-                    event_metadata = match_data.get("_event_match_metadata", {})
-
-                    if event_metadata and platform == "leaguespot":
-                        # Use LeagueSpot round metadata
-                        round_num = event_metadata.get("round", 1)
-                        num_in_bracket = event_metadata.get(
-                            "num_in_bracket", len(imported_matches) + 1
-                        )
-
-                        extra_info = {
-                            "leaguespot_match_id": match_id,
-                            "original_status": status_value,
-                            "round_name": event_metadata.get("round_name", ""),
-                            "round_state": event_metadata.get("round_state", 0),
-                            "best_of": event_metadata.get("best_of", 1),
-                        }
-                    else:
-                        # Faceit or legacy format
-                        round_num = match_data.get("round", 1)
-                        num_in_bracket = match_data.get(
-                            "position", len(imported_matches) + 1
-                        )
-
-                        extra_info = {
-                            "faceit_match_id": match_id,
-                            "faceit_url": faceit_url,
-                            "original_status": status_value,
-                        }
-
-                        if "round" in match_data:
-                            extra_info["round_name"] = match_data.get("round")
-                        if "group" in match_data:
-                            extra_info["group"] = match_data.get("group")
-
-                    # Check for bye matches
-                    is_bye = False
-                    team1_name = team1_data.get("name", "").lower()
-                    team2_name = team2_data.get("name", "").lower()
-                    if team1_name in ["bye", "tbd", "unknown team 1"] or team2_name in [
-                        "bye",
-                        "tbd",
-                        "unknown team 2",
-                    ]:
-                        is_bye = True
-
-                    EventMatch.objects.create(
-                        match=existing_match,
-                        event=event,
-                        round=round_num,
-                        num_in_bracket=num_in_bracket,
-                        is_bye=is_bye,
-                        extra_info=extra_info,
-                    )
-                    logger.info(f"Linked existing match {match_id} to event {event.id}")
-
-            continue  # Move to next match
-
         # Create the match (only if it doesn't exist)
-        match = Match.objects.create(
-            id=match_id,
-            team1=team1,
-            team2=team2,
-            date=safe_parse_datetime(match_date) if match_date else None,
-            status=match_status,
-            url=faceit_url,
-            winner=winner,
-            score_team1=score_team1,
-            score_team2=score_team2,
-            platform=platform,
-            season=season,
-            competition=competition,
+        new_matches.append(
+            Match(
+                id=match_id,
+                team1=team1,
+                team2=team2,
+                date=safe_parse_datetime(match_date) if match_date else None,
+                status=match_status,
+                url=faceit_url,
+                winner=winner,
+                score_team1=score_team1,
+                score_team2=score_team2,
+                platform=platform,
+                season=season,
+                competition=competition,
+                import_hash=digest,
+            )
         )
+        import_hashes[match_id] = digest
 
         # If this is an event import, create an EventMatch entry
-        if event and import_type == "event":
-            # Extract event-specific data from match_data
-            # Check for LeagueSpot event metadata first, then fall back to Faceit
-            event_metadata = match_data.get("_event_match_metadata", {})
-
-            if event_metadata and platform == "leaguespot":
-                # Use LeagueSpot round metadata
-                round_num = event_metadata.get("round", 1)
-                num_in_bracket = event_metadata.get(
-                    "num_in_bracket", len(imported_matches) + 1
+        if link_event:
+            new_event_matches.append(
+                event_match_for(
+                    event,
+                    str(match_id),
+                    match_data,
+                    platform,
+                    team1_data,
+                    team2_data,
+                    len(imported_matches) + 1,
                 )
-
-                # Extra info contains LeagueSpot round metadata
-                extra_info = {
-                    "leaguespot_match_id": match_id,
-                    "original_status": status_value,
-                    "round_name": event_metadata.get("round_name", ""),
-                    "round_state": event_metadata.get("round_state", 0),
-                    "best_of": event_metadata.get("best_of", 1),
-                }
-            else:
-                # Faceit or legacy format
-                round_num = match_data.get(
-                    "round", 1
-                )  # Default to round 1 if not provided
-                num_in_bracket = match_data.get("position", len(imported_matches) + 1)
-
-                # Extra info can contain bracket-specific data
-                extra_info = {
-                    "faceit_match_id": match_id,
-                    "faceit_url": faceit_url,
-                    "original_status": status_value,
-                }
-
-                # Add any additional bracket metadata from Faceit
-                if "round" in match_data:
-                    extra_info["round_name"] = match_data.get("round")
-                if "group" in match_data:
-                    extra_info["group"] = match_data.get("group")
-
-            # Check for bye matches (TBD or Bye team names)
-            is_bye = False
-            team1_name = team1_data.get("name", "").lower()
-            team2_name = team2_data.get("name", "").lower()
-            if team1_name in ["bye", "tbd", "unknown team 1"] or team2_name in [
-                "bye",
-                "tbd",
-                "unknown team 2",
-            ]:
-                is_bye = True
-
-            # Create EventMatch
-            EventMatch.objects.create(
-                match=match,
-                event=event,
-                round=round_num,
-                num_in_bracket=num_in_bracket,
-                is_bye=is_bye,
-                extra_info=extra_info,
             )
+            linked_ids.add(match_id)
+
+        imported_matches.append(str(match_id))
 
-        imported_matches.append(str(match.id))
+    with transaction.atomic():
+        Match.objects.bulk_create(new_matches)
+        Match.objects.bulk_update(changed_matches, ["import_hash"], batch_size=500)
+        EventMatch.objects.bulk_create(new_event_matches)
+    invalidate_models(Match, EventMatch)
 
     return {
         "imported": imported_matches,
@@ -699,272 +723,6 @@ def import_match_data(
         "skipped": skipped_matches,
     }
 
-def get_or_create_team(team_data, competition, season, platform):
-    """
-    Helper function to get or create a team from API data
-    """
-    team_name = team_data.get("name", "Unknown Team")
-    team_avatar = team_data.get("avatar")
-    team_faceit_id = team_data.get("faction_id")
-    team_regentsleague_id = None
-    if platform == "regentsleague":
-        team_avatar = team_data.get("picture")
-        team_regentsleague_id = team_data.get("id")
-
-    # Only process LeagueSpot/Playfly IDs if we're actually importing from those platforms
-    team_playfly_id = None
-    participant_id = None
-
-    # Check if this is LeagueSpot/Playfly data (not Faceit)
-    if platform == "leaguespot":
-        team_playfly_id = team_data.get("faction_id") or team_data.get("teamId")
-        participant_id = team_data.get("participantId")
-
-    # First, check if there's an existing participant for this team ID in this competition/season
-    existing_participant = None
-
-    # Try Faceit ID first
-    if team_faceit_id:
-        try:
-            existing_participant = (
-                Participant.objects.filter(competition=competition, season=season)
-                .filter(
-                    models.Q(faceit_id=team_faceit_id)
-                    | models.Q(faceit_id=team_playfly_id)
-                )
-                .first()
-            )
-        except Participant.DoesNotExist:
-            pass
-
-    # Try Playfly team ID if Faceit lookup failed
-    if not existing_participant and team_playfly_id:
-        try:
-            existing_participant = Participant.objects.get(
-                playfly_id=team_playfly_id, competition=competition, season=season
-            )
-        except Participant.DoesNotExist:
-            pass
-
-    # Try Playfly participant ID if team ID lookup failed
-    if not existing_participant and participant_id:
-        try:
-            existing_participant = Participant.objects.get(
-                playfly_participant_id=participant_id,
-                competition=competition,
-                season=season,
-            )
-        except Participant.DoesNotExist:
-            pass
-    
-    # Try Regents League ID if team Faceit and Playfly failed
-    if not existing_participant and team_regentsleague_id:
-        try:
-            existing_participant = Participant.objects.get(
-                regentsleague_id=team_regentsleague_id,
-                competition=competition,
-                season=season,
-            )
-        except Participant.DoesNotExist:
-            pass
-
-    # If we found a participant with a team, use that team
-    if existing_participant and existing_participant.team:
-        team = existing_participant.team
-        return team, False
-
-    # If no existing participant found, try to find an existing team by name
-    try:
-        team = Team.objects.get(name=team_name)
-    except Team.DoesNotExist:
-        # Create new team
-        team = Team.objects.create(name=team_name, picture=team_avatar)
-
-    # Create participant record to link team to competition and season
-    participant_defaults = {}
-
-    # Set the appropriate platform ID based on what's available
-    if team_faceit_id:
-        participant_defaults["faceit_id"] = team_faceit_id
-    if team_playfly_id:
-        participant_defaults["playfly_id"] = team_playfly_id
-    if participant_id:
-        participant_defaults["playfly_participant_id"] = participant_id
-    if team_regentsleague_id:
-        participant_defaults["regentsleague_id"] = team_regentsleague_id
-
-    participant, created = Participant.objects.get_or_create(
-        team=team, competition=competition, season=season, defaults=participant_defaults
-    )
-
-    # If participant already existed but was missing some IDs, update them
-    if not created:
-        updated = False
-        if team_faceit_id and not participant.faceit_id:
-            participant.faceit_id = team_faceit_id
-            updated = True
-        if team_playfly_id and not participant.playfly_id:
-            participant.playfly_id = team_playfly_id
-            updated = True
-        if participant_id and not participant.playfly_participant_id:
-            participant.playfly_participant_id = participant_id
-            updated = True
-        if team_regentsleague_id and not participant.regentsleague_id:
-            participant.regentsleague_id = team_regentsleague_id
-            updated = True
-
-        if updated:
-            participant.save()
-
-    # Process players if needed
-    roster = team_data.get("roster", [])
-    for player_data in roster:
-        process_player(player_data, team, season)
-
-    return team, created
-
-
-def process_player(player_data, team, season):
-    """
-    Process player data and associate with team.
-    Handles player transfers between teams and avoids unique constraint violations.
-    """
-    player_id = player_data.get("player_id")
-    game_player_id = player_data.get("game_player_id") or player_data.get("steam_id")
-    nickname = player_data.get("nickname", "Unknown Player")
-    avatar = player_data.get("avatar")
-
-    if game_player_id == "":
-        game_player_id = None
-
-    elo = 1000
-
-    # Try to fetch updated player data from Faceit API if we have a game_player_id
-    try:
-        print(f"Processing player {nickname} with game_player_id {game_player_id}")
-        # If we have a game_player_id (steam_id), fetch Faceit player ID from Faceit API
-        if game_player_id:
-            faceit_api_url = "https://open.faceit.com/data/v4/players"
-            api_key = getattr(settings, "FACEIT_API_KEY", None)
-            if api_key:
-                headers = {"Authorization": f"Bearer {api_key}"}
-                params = {"game": "cs2", "game_player_id": game_player_id}
-                response = requests.get(faceit_api_url, headers=headers, params=params)
-                if response.status_code == 200:
-                    faceit_data = response.json()
-                    player_id = faceit_data.get("player_id", player_id)
-                    nickname = faceit_data.get("nickname", nickname)
-                    avatar = faceit_data.get("avatar", avatar)
-                    elo = (
-                        faceit_data.get("games", {})
-                        .get("cs2", {})
-                        .get("faceit_elo", 1000)
-                    )
-                    print(f"Fetched Faceit ID {player_id} for player {nickname}")
-                    print(f"Player ELO is {elo}")
-                else:
-                    print(
-                        f"Failed to fetch Faceit player for game_player_id {game_player_id}: {response.status_code}"
-                    )
-    except Exception as e:
-        logger.warning(f"Could not fetch Faceit player ID for {nickname}: {str(e)}")
-
-    # Try to find existing player by multiple criteria
-    player = None
-
-    # Priority 1: Find by steam_id if available
-    if game_player_id:
-        try:
-            player = Player.objects.get(steam_id=game_player_id)
-            print(
-                f"Found existing player by steam_id: {player.name} -> moving to {team.name}"
-            )
-        except Player.DoesNotExist:
-            pass
-
-    # Priority 2: Find by faceit_id if not found by steam_id
-    if not player and player_id:
-        try:
-            player = Player.objects.get(faceit_id=player_id)
-            print(
-                f"Found existing player by faceit_id: {player.name} -> moving to {team.name}"
-            )
-        except Player.DoesNotExist:
-            pass
-
-    # Priority 3: Find by name if no unique identifiers found a match
-    if not player and nickname and nickname != "Unknown Player":
-        try:
-            # Look for player with same name (case insensitive)
-            player = Player.objects.get(name__iexact=nickname)
-            print(
-                f"Found existing player by name: {player.name} -> moving to {team.name}"
-            )
-        except Player.DoesNotExist:
-            pass
-        except Player.MultipleObjectsReturned:
-            # If multiple players with same name, don't risk picking the wrong one
-            print(f"Multiple players found with name {nickname}, creating new player")
-            pass
-
-    if player:
-        # Update existing player with new information and move to new team
-        old_team_name = player.team.name if player.team else "No team"
-
-        # Update player information (but preserve manually set name and picture)
-        # Don't update name or picture as they may have been set manually
-        if player_id and not player.faceit_id:
-            player.faceit_id = player_id
-        if game_player_id and not player.steam_id:
-            player.steam_id = game_player_id
-        player.elo = elo
-        player.team = team  # Move to new team
-        player.benched = False
-        player.seasons.add(season)
-
-        player.save()
-
-        print(f"Updated player {nickname}: {old_team_name} -> {team.name}")
-        return player
-
-    # If no existing player found, create a new one
-    try:
-        player = Player.objects.create(
-            name=nickname,
-            picture=avatar,
-            faceit_id=player_id,
-            team=team,
-            elo=elo,
-            steam_id=game_player_id,
-        )
-        player.seasons.set([season])
-        print(f"Created new player: {nickname} for team {team.name}")
-        return player
-    except Exception as e:
-        # If creation fails due to unique constraint, try one more time to find existing player
-        logger.error(f"Failed to create player {nickname}: {str(e)}")
-
-        # Last resort: try to find by any available identifier
-        if player_id:
-            try:
-                player = Player.objects.get(faceit_id=player_id)
-                print(f"Found existing player on retry by faceit_id: {player.name}")
-                # Update and move to new team (but preserve manually set name and picture)
-                # Don't update name or picture as they may have been set manually
-                if game_player_id and not player.steam_id:
-                    player.steam_id = game_player_id
-                player.elo = elo
-                player.team = team
-                player.benched = False
-                player.seasons.add(season)
-                player.save()
-                return player
-            except Player.DoesNotExist:
-                pass
-
-        # If still failing, raise the original error
-        raise e
-
 
 @api_view(["GET"])
 @firebase_auth_required(min_role="base")
@@ -1365,8 +1123,7 @@ def create_match(request):
                 )
 
         # Update ELOs if the match is completed and has a winner
-        if match.status == "completed" and match.winner:
-            update_match_elos(match)
+        sync_match_rating(match)
 
         # Return the created match
         winner_data = None
@@ -1569,8 +1326,7 @@ def create_event_match(request):
         )
 
         # Update ELOs if the match is completed and has a winner
-        if match.status == "completed" and match.winner:
-            update_match_elos(match)
+        sync_match_rating(match)
 
         # Return the created match with event match data
         winner_data = None
@@ -1663,8 +1419,7 @@ def update_event_match(request, match_id):
         is_full_update = request.method == "PUT"
 
         # Store old match state for ELO management
-        old_status = match.status
-        old_winner = match.winner
+        previous_rating_state = rating_state(match)
 
         # Handle team updates
         team1_id = request.data.get("team1_id")
@@ -1817,16 +1572,7 @@ def update_event_match(request, match_id):
         event_match.save()
 
         # Handle ELO updates if match status or winner changed
-        if old_status == "completed" and old_winner:
-            if match.status != "completed" or match.winner != old_winner:
-                logger.warning(
-                    f"Match {match.id} was updated from completed status. "
-                    f"Consider running ELO recalculation to ensure accuracy."
-                )
-
-        # Apply new ELO changes if the match is now completed
-        if match.status == "completed" and match.winner and old_status != "completed":
-            update_match_elos(match)
+        sync_match_rating(match, previous_rating_state)
 
         # Return the updated match with event match data
         winner_data = None
@@ -1914,8 +1660,7 @@ def update_match(request, match_id):
         is_full_update = request.method == "PUT"
 
         # Store old match state for ELO management
-        old_status = match.status
-        old_winner = match.winner
+        previous_rating_state = rating_state(match)
 
         # Handle team updates
         team1_id = request.data.get("team1_id")
@@ -2029,18 +1774,7 @@ def update_match(request, match_id):
         match.save()
 
         # Handle ELO updates if match status or winner changed
-        if old_status == "completed" and old_winner:
-            # If the match was previously completed, we need to reverse the old ELO changes
-            # This is complex, so for now we'll log a warning and suggest recalculating ELOs
-            if match.status != "completed" or match.winner != old_winner:
-                logger.warning(
-                    f"Match {match.id} was updated from completed status. "
-                    f"Consider running ELO recalculation to ensure accuracy."
-                )
-
-        # Apply new ELO changes if the match is now completed
-        if match.status == "completed" and match.winner and old_status != "completed":
-            update_match_elos(match)
+        sync_match_rating(match, previous_rating_state)
 
         # Return the updated match
         winner_data = None
@@ -2119,8 +1853,10 @@ def delete_match(request, match_id):
             "status": match.status,
         }
 
-        # Delete the match
-        match.delete()
+        # Delete the match, replaying ELOs without it if it was rated
+        with transaction.atomic():
+            sync_deleted_match(match)
+            match.delete()
 
         logger.info(
             f"Deleted match {match_info['id']}: {match_info['team1_name']} vs {match_info['team2_name']}"
@@ -2174,57 +1910,54 @@ def clear_database(request):
 def update_player_elo(request):
     """
     Update player ELO ratings from Faceit API.
-    This will fetch the latest ELO for all players with a faceit_id
+    This will fetch the latest ELO for all players with a steam_id
     and update the values in our database.
+
+    Lookups run concurrently under a shared rate limit (see cc.faceit). The
+    request can lower FACEIT_MAX_WORKERS and FACEIT_REQUESTS_PER_SECOND but
+    not raise them.
+
+    Expected request format:
+    {
+        "max_workers": 8, // Optional - concurrent lookups
+        "requests_per_second": 10, // Optional - Faceit API rate limit
+        "async": true // Optional - run as a background job, returns a job_id
+    }
     """
-    try:
-        # Get all players with faceit_id
-        players = Player.objects.filter(steam_id__isnull=False)
-        updated_count = 0
-        not_found_count = 0
-        faceit_api_url = "https://open.faceit.com/data/v4/players"
-
-        # Get the API key from request headers or use default
-        api_key = request.data.get("api_key", "3c0ddd87-ff50-45df-8d56-3cf62ef5fbc8")
-
-        for player in players:
-            if not player.steam_id:
-                print(f"Skipping player {player.name} with no STEAM ID")
-                continue
+    return run_or_enqueue(request, run_update_player_elo)
 
-            try:
-                api_key = getattr(settings, "FACEIT_API_KEY", None)
-                headers = {"Authorization": f"Bearer {api_key}"}
-                params = {"game": "cs2", "game_player_id": player.steam_id}
-                response = requests.get(faceit_api_url, headers=headers, params=params)
-
-                if response.status_code == 200:
-                    player_data = response.json()
-                    games = player_data.get("games", {})
-
-                    # Look for CS2 or CS:GO game data
-                    cs_data = games.get("cs2")
-
-                    if cs_data and "faceit_elo" in cs_data:
-                        player.elo = cs_data["faceit_elo"]
-                        player.skill_level = cs_data.get("skill_level", 1)
-                        player.save()
-                        updated_count += 1
-                        print(f"Updated {updated_count} of {players.count()} players")
-                    else:
-                        not_found_count += 1
-                else:
-                    not_found_count += 1
 
-            except Exception as e:
-                print(f"Error updating player {player.name}: {str(e)}")
-                not_found_count += 1
+@job_handler("update_player_elo")
+def run_update_player_elo(data):
+    """Refresh player ELOs from Faceit for update_player_elo."""
+    max_workers = data.get("max_workers")
+    requests_per_second = data.get("requests_per_second")
+    try:
+        if max_workers is not None:
+            max_workers = min(max(int(max_workers), 1), settings.FACEIT_MAX_WORKERS)
+        if requests_per_second is not None:
+            requests_per_second = min(
+                max(float(requests_per_second), 0.1),
+                settings.FACEIT_REQUESTS_PER_SECOND,
+            )
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "max_workers and requests_per_second must be numbers"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        result = refresh_player_elos(
+            max_workers=max_workers, requests_per_second=requests_per_second
+        )
 
         return Response(
             {
                 "message": "Player ELO update completed",
-                "updated_players": updated_count,
-                "not_found": not_found_count,
+                "updated_players": result["updated_players"],
+                "not_found": result["not_found"],
+                "failed": result["failed"],
+                "stats": result,
             }
         )
     except Exception as e:
@@ -2242,15 +1975,11 @@ def reset_player_elo(request):
         default_elo = request.data.get("default_elo", 1000)
         default_skill_level = request.data.get("default_skill_level", 1)
 
-        # Update all players
-        players = Player.objects.all()
-        updated_count = 0
-
-        for player in players:
-            player.elo = default_elo
-            player.skill_level = default_skill_level
-            player.save()
-            updated_count += 1
+        # One UPDATE for all players
+        updated_count = Player.objects.update(
+            elo=default_elo, skill_level=default_skill_level
+        )
+        invalidate_models(Player)
 
         return Response(
             {
@@ -2273,7 +2002,9 @@ def match_participants(request):
     """
     if request.method == "GET":
         # Get all participants
-        participants = Participant.objects.all()
+        participants = Participant.objects.select_related(
+            "team", "competition", "season"
+        )
 
         # Get teams
         teams = Team.objects.all()
@@ -2377,6 +2108,103 @@ def match_participants(request):
             )
 
 
+@api_view(["GET"])
+@firebase_auth_required(min_role="owner")
+def participant_suggestions(request):
+    """
+    Participants that still need matching, each with its likeliest teams
+    (see cc.participant_matching)
+
+    Query parameters:
+    - competition_id: Optional - only participants of this competition
+    - season_id: Optional - only participants of this season
+    - limit: Optional - suggestions per participant (default 5, max 20)
+    - page: Optional - page number (default 1)
+    - page_size: Optional - participants per page (default 20, max 100)
+    """
+    try:
+        limit = min(max(int(request.query_params.get("limit", 5)), 1), 20)
+        page = max(int(request.query_params.get("page", 1)), 1)
+        page_size = min(max(int(request.query_params.get("page_size", 20)), 1), 100)
+    except ValueError:
+        return Response(
+            {"error": "limit, page and page_size must be integers"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # No team, or a team that appears nowhere else
+    participants = (
+        Participant.objects.annotate(
+            team_participants=models.Count("team__participants")
+        )
+        .filter(team_participants__lte=1)
+        .order_by("competition__name", "season__start_date", "team__name", "id")
+    )
+    try:
+        if request.query_params.get("competition_id"):
+            participants = participants.filter(
+                competition_id=uuid.UUID(request.query_params["competition_id"])
+            )
+        if request.query_params.get("season_id"):
+            participants = participants.filter(
+                season_id=uuid.UUID(request.query_params["season_id"])
+            )
+    except ValueError:
+        return Response(
+            {"error": "Invalid competition_id or season_id format"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    paginator = Paginator(
+        participants.values(
+            "id",
+            "team_id",
+            "team__name",
+            "competition_id",
+            "competition__name",
+            "season_id",
+            "season__name",
+            "faceit_id",
+            "playfly_id",
+            "regentsleague_id",
+        ),
+        page_size,
+    )
+    try:
+        items = paginator.page(page)
+    except (EmptyPage, PageNotAnInteger):
+        items = paginator.page(paginator.num_pages)
+
+    index = suggestion_index()
+    results = []
+    for participant in items:
+        results.append(
+            {
+                "id": participant["id"],
+                "team_id": participant["team_id"],
+                "team_name": participant["team__name"],
+                "competition_id": participant["competition_id"],
+                "competition_name": participant["competition__name"],
+                "season_id": participant["season_id"],
+                "season_name": participant["season__name"],
+                "faceit_id": participant["faceit_id"],
+                "playfly_id": participant["playfly_id"],
+                "regentsleague_id": participant["regentsleague_id"],
+                "suggestions": index.suggest(participant, limit=limit),
+            }
+        )
+
+    return Response(
+        {
+            "count": paginator.count,
+            "total_pages": paginator.num_pages,
+            "current_page": items.number,
+            "page_size": page_size,
+            "results": results,
+        }
+    )
+
+
 @api_view(["POST"])
 @firebase_auth_required(min_role="owner")
 def recalculate_elos(request):
@@ -2384,15 +2212,53 @@ def recalculate_elos(request):
     Recalculate ELO ratings for all teams based on completed matches in chronological order.
     This is useful when importing historical match data.
 
+    With "incremental", only matches from the earliest affected one onwards
+    are replayed, starting from the ratings recorded in EloHistory (or all of
+    them from the default rating, while that history is incomplete).
+
     Expected request format:
     {
         "reset_to_default": true, // Optional - default true
-        "default_elo": 1000 // Optional - default 1000
+        "default_elo": 1000, // Optional - default 1000
+        "incremental": false, // Optional - replay only from the affected matches
+        "match_ids": ["uuid1", ...], // Optional - matches that changed (incremental)
+        "since": "2025-01-01T00:00:00Z", // Optional - replay from this date (incremental)
+        "async": true // Optional - run as a background job, returns a job_id
     }
     """
+    return run_or_enqueue(request, run_recalculate_elos)
+
+
+@job_handler("recalculate_elos")
+def run_recalculate_elos(data):
+    """Recalculate team ELOs for recalculate_elos request data."""
     try:
-        reset_to_default = request.data.get("reset_to_default", True)
-        default_elo = request.data.get("default_elo", 1000)
+        reset_to_default = data.get("reset_to_default", True)
+        default_elo = data.get("default_elo", 1000)
+
+        if data.get("incremental", False):
+            match_ids = data.get("match_ids", [])
+            since = data.get("since")
+            if since:
+                since = safe_parse_datetime(since)
+                if not since:
+                    return Response(
+                        {"error": "Invalid since date"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+            if not match_ids and not since:
+                return Response(
+                    {"error": "match_ids or since is required for incremental"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            result = replay_from(match_ids=match_ids, since=since)
+            return Response(
+                {
+                    "message": "Incremental ELO recalculation completed successfully",
+                    "summary": result,
+                }
+            )
 
         result = recalculate_all_elos(
             reset_to_default=reset_to_default, default_elo=default_elo
@@ -2441,54 +2307,58 @@ def calculate_team_elos(request):
         only_default_elo = request.data.get("only_default_elo", False)
         default_elo = request.data.get("default_elo", 1000)
 
-        # Get teams based on filter
+        # Load: the teams to update and every active player ELO, one query each
+        started = time.monotonic()
+        teams = Team.objects.all()
         if only_default_elo:
-            teams = Team.objects.filter(elo=default_elo)
-        else:
-            teams = Team.objects.all()
+            teams = teams.filter(elo=default_elo)
+        teams = list(teams.only("id", "elo"))
 
-        updated_count = 0
+        players = Player.objects.filter(benched=False, elo__gt=0, team__isnull=False)
+        if only_default_elo:
+            players = players.filter(team__elo=default_elo)
+        elos_by_team = {}
+        for team_id, elo in players.values_list("team_id", "elo"):
+            elos_by_team.setdefault(team_id, []).append(elo)
+        loaded = time.monotonic()
+
+        # Compute: top 5 active player ELOs of each team
+        updated_teams = []
         no_players_count = 0
-
         for team in teams:
-            # Get active (non-benched) players for this team
-            players = Player.objects.filter(team=team, benched=False)
-
-            # Get player ELOs
-            player_elos = [player.elo for player in players if player.elo > 0]
-
-            # Need at least 2 players to calculate standard deviation
-            if len(player_elos) < 2:
+            elo = team_elo_from_players(elos_by_team.get(team.id, []))
+            if elo is None:
                 no_players_count += 1
                 continue
+            team.elo = elo
+            updated_teams.append(team)
+        computed = time.monotonic()
 
-            # Take the highest 5 ELOs for this average
-            player_elos.sort(reverse=True)
-            player_elos = player_elos[:5]
+        # Write: one bulk UPDATE
+        Team.objects.bulk_update(updated_teams, ["elo"], batch_size=500)
+        if updated_teams:
+            invalidate_models(Team)
+        written = time.monotonic()
 
-            # Calculate team ELO
-            mean_elo = statistics.mean(player_elos)
-            std_dev = statistics.stdev(player_elos)
-            k = 0.1
-            team_elo = mean_elo - k * std_dev
-
-            # Round to integer
-            team_elo = round(team_elo)
-
-            # Update team
-            team.elo = team_elo
-            team.save()
-            logger.info(f"Updated ELO for team {team.name} to {team.elo}")
-            updated_count += 1
+        logger.info(
+            f"Calculated ELO for {len(updated_teams)} teams in "
+            f"{written - started:.2f}s"
+        )
 
         return Response(
             {
                 "message": "Team ELO calculation completed",
-                "updated_teams": updated_count,
+                "updated_teams": len(updated_teams),
                 "teams_without_enough_players": no_players_count,
                 "only_default_elo": only_default_elo,
                 "default_elo_value": default_elo,
-                "total_teams_processed": teams.count(),
+                "total_teams_processed": len(teams),
+                "timings": {
+                    "load_seconds": round(loaded - started, 3),
+                    "compute_seconds": round(computed - loaded, 3),
+                    "write_seconds": round(written - computed, 3),
+                    "total_seconds": round(written - started, 3),
+                },
             }
         )
 
@@ -2496,6 +2366,19 @@ def calculate_team_elos(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def team_elo_from_players(player_elos, top=5, k=0.1):
+    """
+    Team ELO from its active player ELOs:
+    mean(top 5) - 0.1 * stdev(top 5), rounded.
+
+    Returns None with fewer than 2 players, as stdev needs at least two.
+    """
+    if len(player_elos) < 2:
+        return None
+    best = heapq.nlargest(top, player_elos)
+    return round(statistics.mean(best) - k * statistics.stdev(best))
+
+
 @api_view(["POST"])
 @firebase_auth_required(min_role="admin")
 def create_ranking_snapshot(request):
@@ -2523,8 +2406,11 @@ def create_ranking_snapshot(request):
                     status=status.HTTP_404_NOT_FOUND,
                 )
         else:
-            # Use the most recent season if no season specified
-            season = Season.objects.order_by("-start_date").first()
+            # Use the current season, falling back to the most recent one
+            season = (
+                current_season()
+                or Season.objects.order_by("-start_date").first()
+            )
             if not season:
                 return Response(
                     {"error": "No seasons found in database"},
@@ -2540,16 +2426,23 @@ def create_ranking_snapshot(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Create the ranking record
-        ranking = Ranking.objects.create(season=season)
-
-        # Create ranking items for each team
-        ranking_items_created = 0
-        for rank, team in enumerate(teams, start=1):
-            RankingItem.objects.create(
-                ranking=ranking, team=team, rank=rank, elo=team.elo
+        with transaction.atomic():
+            # Create the ranking record
+            ranking = Ranking.objects.create(season=season)
+
+            # Create ranking items for each team
+            ranking_items = RankingItem.objects.bulk_create(
+                [
+                    RankingItem(ranking=ranking, team=team, rank=rank, elo=team.elo)
+                    for rank, team in enumerate(teams, start=1)
+                ],
+                batch_size=500,
             )
-            ranking_items_created += 1
+            ranking_items_created = len(ranking_items)
+            invalidate_models(RankingItem)
+
+            # Point the season's current ranking at the new snapshot
+            rebuild_current_rankings(season)
 
         logger.info(
             f"Created ranking snapshot with {ranking_items_created} teams for season {season.name}"
@@ -2574,6 +2467,168 @@ def create_ranking_snapshot(request):
         )
 
 
+def refresh_match(match, fetch, apply, platform_name):
+    """
+    Fetch, apply and save one match, then keep team ELOs in step.
+    Returns True if the match was updated, False if no changes
+    """
+    previous = rating_state(match)
+    data = fetch(match)
+    if data is None:
+        return False
+
+    updated = apply(match, data)
+    if updated:
+        match.save()
+        logger.info(f"Updated {platform_name} match {match.id}")
+
+        # Update team ELOs if the match result changed
+        sync_match_rating(match, previous)
+
+    return updated
+
+
+def fetch_match_updates(matches):
+    """
+    Fetch the remote state of matches concurrently, one pool per platform.
+
+    Fetchers only make HTTP requests, so they are safe to run off the request
+    thread. Returns (fetched, platform_stats) where fetched maps match id to
+    (data, error); matches on unsupported platforms are left out.
+    """
+    by_platform = {}
+    for match in matches:
+        if match.platform in MATCH_UPDATERS:
+            by_platform.setdefault(match.platform, []).append(match)
+
+    concurrency = getattr(settings, "MATCH_UPDATE_CONCURRENCY", {})
+    started = time.monotonic()
+
+    def timed_fetch(fetch, match):
+        request_started = time.monotonic()
+        try:
+            data, error = fetch(match), None
+        except Exception as e:
+            data, error = None, e
+        finished = time.monotonic()
+        return match.id, data, error, finished - request_started, finished
+
+    executors = []
+    futures = {}
+    try:
+        for platform, platform_matches in by_platform.items():
+            max_workers = concurrency.get(platform, 4)
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"update-{platform}"
+            )
+            executors.append(executor)
+            fetch = MATCH_UPDATERS[platform][0]
+            futures[platform] = [
+                executor.submit(timed_fetch, fetch, match) for match in platform_matches
+            ]
+
+        fetched = {}
+        platform_stats = {}
+        total = sum(len(platform_matches) for platform_matches in by_platform.values())
+        for platform, platform_futures in futures.items():
+            durations = []
+            last_finished = started
+            errors = 0
+            for future in platform_futures:
+                match_id, data, error, elapsed, finished = future.result()
+                fetched[match_id] = (data, error)
+                report_progress(len(fetched), total, "Fetching match updates")
+                durations.append(elapsed)
+                last_finished = max(last_finished, finished)
+                if error is not None:
+                    errors += 1
+
+            platform_stats[platform] = {
+                "matches": len(durations),
+                "errors": errors,
+                "concurrency": concurrency.get(platform, 4),
+                "fetch_seconds": round(last_finished - started, 2),
+                "avg_request_seconds": round(statistics.mean(durations), 3),
+                "max_request_seconds": round(max(durations), 3),
+            }
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    return fetched, platform_stats
+
+
+def apply_match_updates(matches, fetched):
+    """
+    Apply fetched remote state to matches in a single transaction.
+
+    fetched is the mapping returned by fetch_match_updates. Changed matches
+    are saved with one bulk_update and their ratings synced oldest first.
+    Returns (results, updated_count, error_count), with one result per match.
+    """
+    updated_count = 0
+    error_count = 0
+    results = []
+    changed = []
+    with transaction.atomic():
+        for index, match in enumerate(matches):
+            report_progress(index, len(matches), "Applying match updates")
+            if match.id not in fetched:
+                logger.warning(
+                    f"Unsupported platform for match {match.id}: {match.platform}"
+                )
+                continue
+
+            data, error = fetched[match.id]
+            previous = rating_state(match)
+            try:
+                if error is not None:
+                    raise error
+
+                updated = False
+                if data is not None:
+                    # Savepoint, so one bad match cannot abort the others
+                    with transaction.atomic():
+                        apply = MATCH_UPDATERS[match.platform][1]
+                        updated = apply(match, data)
+
+            except Exception as e:
+                error_count += 1
+                logger.error(f"Error updating match {match.id}: {str(e)}")
+                results.append(
+                    {"match_id": str(match.id), "status": "error", "error": str(e)}
+                )
+                continue
+
+            if updated:
+                updated_count += 1
+                changed.append((match, previous))
+                results.append(
+                    {
+                        "match_id": str(match.id),
+                        "status": "updated",
+                        "new_status": match.status,
+                        "new_date": match.date.isoformat() if match.date else None,
+                    }
+                )
+            else:
+                results.append({"match_id": str(match.id), "status": "no_changes"})
+
+        if changed:
+            Match.objects.bulk_update(
+                [match for match, _ in changed], MATCH_UPDATE_FIELDS, batch_size=500
+            )
+            invalidate_models(Match)
+
+            # Rate results oldest first so each can be applied in order. Each
+            # match has its own Team instances, so rating reads the current
+            # ratings from the database rather than from them
+            for match, previous in sorted(changed, key=lambda c: c[0].date):
+                sync_match_rating(match, previous)
+
+    return results, updated_count, error_count
+
+
 @api_view(["POST"])
 @firebase_auth_required(min_role="admin")
 def update_matches(request):
@@ -2581,16 +2636,25 @@ def update_matches(request):
     Update existing matches with fresh data from external APIs.
     This will fetch updated information for rescheduled times and match results.
 
+    Remote state is fetched concurrently (capped per platform by
+    MATCH_UPDATE_CONCURRENCY), then applied in a single transaction.
+
     Expected request format:
     {
         "match_ids": ["uuid1", "uuid2", ...], // Optional - specific matches to update
         "platform": "faceit" | "leaguespot", // Optional - filter by platform
         "status_filter": "scheduled" | "in_progress" | "completed", // Optional - filter by status
-        "auto_detect": true // Optional - automatically detect what needs updating
+        "auto_detect": true, // Optional - automatically detect what needs updating
+        "async": true // Optional - run as a background job, returns a job_id
     }
     """
+    return run_or_enqueue(request, run_update_matches)
+
+
+@job_handler("update_matches")
+def run_update_matches(data):
+    """Refresh matches from their platforms for update_matches."""
     try:
-        data = request.data
         match_ids = data.get("match_ids", [])
         platform_filter = data.get("platform", "").lower()
         status_filter = data.get("status_filter", "")
@@ -2625,46 +2689,19 @@ def update_matches(request):
             | models.Q(status="in_progress")  # Currently in progress matches
         )
 
-        matches = query
-        updated_count = 0
-        error_count = 0
-        results = []
+        matches = list(
+            query.select_related("team1", "team2", "winner", "competition", "season")
+        )
+        started = time.monotonic()
 
-        for match in matches:
-            try:
-                updated = False
+        # Fetch stage: remote state of every match, concurrently per platform
+        fetched, platform_stats = fetch_match_updates(matches)
+        fetch_seconds = time.monotonic() - started
 
-                if match.platform == "faceit":
-                    updated = update_faceit_match(match)
-                elif match.platform == "leaguespot":
-                    updated = update_leaguespot_match(match)
-                elif match.platform == "regentsleague":
-                    updated = update_regentsleague_match(match)
-                else:
-                    logger.warning(
-                        f"Unsupported platform for match {match.id}: {match.platform}"
-                    )
-                    continue
-
-                if updated:
-                    updated_count += 1
-                    results.append(
-                        {
-                            "match_id": str(match.id),
-                            "status": "updated",
-                            "new_status": match.status,
-                            "new_date": match.date.isoformat() if match.date else None,
-                        }
-                    )
-                else:
-                    results.append({"match_id": str(match.id), "status": "no_changes"})
+        # Apply stage: all changes in one transaction
+        results, updated_count, error_count = apply_match_updates(matches, fetched)
 
-            except Exception as e:
-                error_count += 1
-                logger.error(f"Error updating match {match.id}: {str(e)}")
-                results.append(
-                    {"match_id": str(match.id), "status": "error", "error": str(e)}
-                )
+        total_seconds = time.monotonic() - started
 
         return Response(
             {
@@ -2673,6 +2710,12 @@ def update_matches(request):
                 "error_count": error_count,
                 "total_processed": len(matches),
                 "results": results,
+                "timing": {
+                    "fetch_seconds": round(fetch_seconds, 2),
+                    "apply_seconds": round(total_seconds - fetch_seconds, 2),
+                    "total_seconds": round(total_seconds, 2),
+                    "platforms": platform_stats,
+                },
             }
         )
 
@@ -2680,14 +2723,14 @@ def update_matches(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def update_regentsleague_match(match: Match):
+def fetch_regentsleague_match(match: Match):
     """
-    Update a single Regents League match with fresh data from the API
-    Returns True if the match was updated, False if no changes
+    Fetch a single Regents League match from the API
+    Returns the match data, or None if it could not be fetched
     """
     try:
         regentsleague_match_id = match.regentsleague_id
-        response = requests.get(
+        response = http_client.get(
             f"https://regent-league-api.poopdealer.lol/cc/match?id={regentsleague_match_id}",
             timeout=30,
         )
@@ -2696,9 +2739,21 @@ def update_regentsleague_match(match: Match):
             logger.warning(
                 f"Regent League API returned {response.status_code} for match {regentsleague_match_id}"
             )
-            return False
+            return None
         
-        match_data: dict = response.json()
+        return response.json()
+
+    except Exception as e:
+        logger.error(f"Error updating Regents League match {match.id}: {str(e)}")
+        raise
+
+
+def apply_regentsleague_match(match: Match, match_data: dict):
+    """
+    Apply fetched Regents League data to a match without saving it
+    Returns True if the match changed, False if no changes
+    """
+    try:
         # Check if any updates are needed
         updated = False
 
@@ -2805,13 +2860,6 @@ def update_regentsleague_match(match: Match):
                 if new_winner != match.winner:
                     match.winner = new_winner
                     updated = True
-        if updated:
-            match.save()
-            logger.info(f"Updated Regent League match {match.id}")
-
-            # Update team ELOs if the match is now completed
-            if match.status == "completed":
-                update_match_elos(match)
 
         return updated
     
@@ -2820,13 +2868,26 @@ def update_regentsleague_match(match: Match):
         raise
         
 
-def update_faceit_match(match):
+def update_regentsleague_match(match: Match):
     """
-    Update a single Faceit match with fresh data from the API
+    Update a single Regents League match with fresh data from the API
     Returns True if the match was updated, False if no changes
     """
+    return refresh_match(
+        match,
+        fetch_regentsleague_match,
+        apply_regentsleague_match,
+        "Regent League",
+    )
+
+
+def fetch_faceit_match(match):
+    """
+    Fetch a single Faceit match from the API
+    Returns the match data, or None if it could not be fetched
+    """
     if not match.url:
-        return False
+        return None
 
     try:
         # Extract match ID from Faceit URL
@@ -2837,10 +2898,10 @@ def update_faceit_match(match):
         api_key = getattr(settings, "FACEIT_API_KEY", None)
         if not api_key:
             logger.error("FACEIT_API_KEY not configured")
-            return False
+            return None
 
         headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(
+        response = http_client.get(
             f"https://open.faceit.com/data/v4/matches/1-{faceit_match_id}",
             headers=headers,
             timeout=30,
@@ -2850,10 +2911,21 @@ def update_faceit_match(match):
             logger.warning(
                 f"Faceit API returned {response.status_code} for match {faceit_match_id}"
             )
-            return False
+            return None
 
-        match_data = response.json()
+        return response.json()
 
+    except Exception as e:
+        logger.error(f"Error updating Faceit match {match.id}: {str(e)}")
+        raise
+
+
+def apply_faceit_match(match, match_data):
+    """
+    Apply fetched Faceit data to a match without saving it
+    Returns True if the match changed, False if no changes
+    """
+    try:
         # Check if any updates are needed
         updated = False
 
@@ -2979,14 +3051,6 @@ def update_faceit_match(match):
                         f"Could not map factions to teams for match {match.id}. Team1: {match.team1.name}, Team2: {match.team2.name}, Faction1: {faction1_id}, Faction2: {faction2_id}"
                     )
 
-        if updated:
-            match.save()
-            logger.info(f"Updated Faceit match {match.id}")
-
-            # Update team ELOs if the match is now completed
-            if match.status == "completed":
-                update_match_elos(match)
-
         return updated
 
     except Exception as e:
@@ -2994,19 +3058,27 @@ def update_faceit_match(match):
         raise
 
 
-def update_leaguespot_match(match):
+def update_faceit_match(match):
     """
-    Update a single LeagueSpot match with fresh data from the API
+    Update a single Faceit match with fresh data from the API
     Returns True if the match was updated, False if no changes
     """
+    return refresh_match(match, fetch_faceit_match, apply_faceit_match, "Faceit")
 
+
+def fetch_leaguespot_match(match):
+    """
+    Fetch a single LeagueSpot match, and its participants once completed
+    Returns {"match", "participants_status", "participants"}, or None if the
+    match could not be fetched
+    """
     try:
         # Extract match ID from LeagueSpot URL or use the stored match ID
         leaguespot_match_id = match.id
 
         # First, get the match data to check status and timing
         headers = get_leaguespot_headers()
-        match_response = requests.get(
+        match_response = http_client.get(
             f"https://api.leaguespot.gg/api/v2/matches/{leaguespot_match_id}",
             headers=headers,
             timeout=30,
@@ -3016,9 +3088,44 @@ def update_leaguespot_match(match):
             print(
                 f"LeagueSpot API returned {match_response.status_code} for match {leaguespot_match_id}"
             )
-            return False
+            return None
+
+        data = {
+            "match": match_response.json(),
+            "participants_status": None,
+            "participants": None,
+        }
+
+        # Scores and winner are only needed once the match is completed
+        if data["match"].get("currentState", 0) != 3:
+            return data
+
+        print(f"Fetching participants for completed LeagueSpot match {match.id}")
+        # Get participants data to check scores and winner
+        participants_response = http_client.get(
+            f"https://api.leaguespot.gg/api/v1/matches/{leaguespot_match_id}/participants",
+            headers=headers,
+            timeout=30,
+        )
+        data["participants_status"] = participants_response.status_code
+        if participants_response.status_code == 200:
+            data["participants"] = participants_response.json()
+
+        return data
+
+    except Exception as e:
+        logger.error(f"Error updating LeagueSpot match {match.id}: {str(e)}")
+        raise
 
-        match_data = match_response.json()
+
+def apply_leaguespot_match(match, data):
+    """
+    Apply fetched LeagueSpot data to a match without saving it
+    Returns True if the match changed, False if no changes
+    """
+    try:
+        match_data = data["match"]
+        participants_status = data["participants_status"]
 
         # Check if any updates are needed
         updated = False
@@ -3040,9 +3147,7 @@ def update_leaguespot_match(match):
             updated = True
 
         # Update date/time
-        scheduled_time = match_data.get("scheduled_at") or match_data.get(
-            "startTimeUTC"
-        )
+        scheduled_time = match_data.get("scheduled_at") or match_data.get("startTimeUTC")
         if scheduled_time:
             parsed_date = safe_parse_datetime(scheduled_time)
             if parsed_date and parsed_date != match.date:
@@ -3051,20 +3156,10 @@ def update_leaguespot_match(match):
 
         if match.status != "completed":
             # If match is not completed, no need to update scores/winner
-            match.save()
-            print(f"Updated scheduled LeagueSpot match {match.id}")
             return updated
 
-        print(f"Fetching participants for completed LeagueSpot match {match.id}")
-        # Get participants data to check scores and winner
-        participants_response = requests.get(
-            f"https://api.leaguespot.gg/api/v1/matches/{leaguespot_match_id}/participants",
-            headers=headers,
-            timeout=30,
-        )
-
-        if participants_response.status_code == 200:
-            participants_data = participants_response.json()
+        if participants_status == 200:
+            participants_data = data["participants"]
 
             if len(participants_data) >= 2:
                 # Extract scores and winner from participants
@@ -3138,17 +3233,9 @@ def update_leaguespot_match(match):
 
         else:
             logger.warning(
-                f"LeagueSpot participants API returned {participants_response.status_code} for match {leaguespot_match_id}"
+                f"LeagueSpot participants API returned {participants_status} for match {match.id}"
             )
 
-        if updated:
-            match.save()
-            logger.info(f"Updated LeagueSpot match {match.id}")
-
-            # Update team ELOs if the match is now completed
-            if match.status == "completed":
-                update_match_elos(match)
-
         return updated
 
     except Exception as e:
@@ -3156,9 +3243,42 @@ def update_leaguespot_match(match):
         raise
 
 
+def update_leaguespot_match(match):
+    """
+    Update a single LeagueSpot match with fresh data from the API
+    Returns True if the match was updated, False if no changes
+    """
+    return refresh_match(
+        match, fetch_leaguespot_match, apply_leaguespot_match, "LeagueSpot"
+    )
+
+
+# Fetch/apply pairs used by update_matches, keyed by Match.platform
+MATCH_UPDATERS = {
+    "faceit": (fetch_faceit_match, apply_faceit_match),
+    "leaguespot": (fetch_leaguespot_match, apply_leaguespot_match),
+    "regentsleague": (fetch_regentsleague_match, apply_regentsleague_match),
+}
+
+# Match fields the apply functions may change
+MATCH_UPDATE_FIELDS = [
+    "status",
+    "date",
+    "score_team1",
+    "score_team2",
+    "winner",
+    "team1",
+    "team2",
+]
+
+
 # LeagueSpot API Proxy Views
 # These proxy the LeagueSpot API to avoid CORS issues in the frontend
 
+leaguespot_cache = ProxyCache(
+    stale_seconds=getattr(settings, "LEAGUESPOT_PROXY_STALE_SECONDS", 86400)
+)
+
 
 def get_leaguespot_headers():
     """Get the standard headers needed for LeagueSpot API requests"""
@@ -3182,139 +3302,127 @@ def get_leaguespot_headers():
     }
 
 
+def cached_leaguespot_response(request, resource, path, error_message, fetch=None):
+    """
+    Serve a LeagueSpot API path through the proxy cache.
+
+    Responses are cached per upstream URL for LEAGUESPOT_PROXY_TTLS[resource]
+    seconds, and concurrent requests for the same URL share one upstream
+    fetch. If the upstream fails, a stale copy is served when one exists.
+    Send "X-Proxy-Refresh: 1" or "Cache-Control: no-cache" to force a refetch.
+    The X-Cache response header reports HIT, MISS, STALE or BYPASS.
+    """
+    url = f"https://api.leaguespot.gg/api/{path}"
+
+    def fetch_json():
+        response = http_client.get(url, headers=get_leaguespot_headers(), timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    ttl = getattr(settings, "LEAGUESPOT_PROXY_TTLS", {}).get(resource, 60)
+    refresh = (
+        request.headers.get("X-Proxy-Refresh") == "1"
+        or "no-cache" in request.headers.get("Cache-Control", "")
+    )
+
+    try:
+        data, cache_state = leaguespot_cache.get(
+            url, ttl, fetch or fetch_json, refresh=refresh
+        )
+    except UpstreamError as e:
+        return Response({"error": str(e)}, status=e.status_code)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Error proxying LeagueSpot {path}: {str(e)}")
+        return Response(
+            {"error": f"{error_message}: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    response = Response(data)
+    response["X-Cache"] = cache_state
+    return response
+
+
 @api_view(["GET"])
 def proxy_leaguespot_season(request, season_id):
     """Proxy LeagueSpot season API to avoid CORS issues"""
-    headers = get_leaguespot_headers()
+    url = f"https://api.leaguespot.gg/api/v1/seasons/{season_id}"
 
-    try:
-        response = requests.get(
-            f"https://api.leaguespot.gg/api/v1/seasons/{season_id}",
-            headers=headers,
-            timeout=30,
-        )
+    def fetch_season():
+        response = http_client.get(url, headers=get_leaguespot_headers(), timeout=30)
 
         # Log the response details for debugging
         logger.info(f"LeagueSpot season API response status: {response.status_code}")
         logger.info(f"LeagueSpot season API response headers: {dict(response.headers)}")
         if response.status_code != 200:
-            return Response(
-                {
-                    "error": f"LeagueSpot API returned status {response.status_code}: {response.text}"
-                },
-                status=response.status_code,
+            raise UpstreamError(
+                f"LeagueSpot API returned status {response.status_code}: {response.text}",
+                response.status_code,
             )
 
         # Check if response is empty
         if not response.text.strip():
-            return Response(
-                {"error": "LeagueSpot API returned empty response"},
-                status=status.HTTP_502_BAD_GATEWAY,
+            raise UpstreamError(
+                "LeagueSpot API returned empty response",
+                status.HTTP_502_BAD_GATEWAY,
             )
 
         # Try to parse JSON
         try:
-            json_data = response.json()
-            return Response(json_data)
+            return response.json()
         except ValueError as json_error:
             logger.error(f"Failed to parse JSON from LeagueSpot: {json_error}")
             logger.error(f"Raw response: {response.text}")
-            return Response(
-                {
-                    "error": f"Invalid JSON response from LeagueSpot: {response.text[:200]}"
-                },
-                status=status.HTTP_502_BAD_GATEWAY,
+            raise UpstreamError(
+                f"Invalid JSON response from LeagueSpot: {response.text[:200]}",
+                status.HTTP_502_BAD_GATEWAY,
             )
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying LeagueSpot season {season_id}: {str(e)}")
-        return Response(
-            {"error": f"Failed to fetch season data: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return cached_leaguespot_response(
+        request,
+        "season",
+        f"v1/seasons/{season_id}",
+        "Failed to fetch season data",
+        fetch=fetch_season,
+    )
 
 
 @api_view(["GET"])
 def proxy_leaguespot_stage(request, stage_id):
     """Proxy LeagueSpot stage API to avoid CORS issues"""
-    headers = get_leaguespot_headers()
-
-    try:
-        response = requests.get(
-            f"https://api.leaguespot.gg/api/v1/stages/{stage_id}",
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        return Response(response.json())
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying LeagueSpot stage {stage_id}: {str(e)}")
-        return Response(
-            {"error": f"Failed to fetch stage data: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return cached_leaguespot_response(
+        request, "stage", f"v1/stages/{stage_id}", "Failed to fetch stage data"
+    )
 
 
 @api_view(["GET"])
 def proxy_leaguespot_round_matches(request, round_id):
     """Proxy LeagueSpot round matches API to avoid CORS issues"""
-    headers = get_leaguespot_headers()
-
-    try:
-        response = requests.get(
-            f"https://api.leaguespot.gg/api/v1/rounds/{round_id}/matches",
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        return Response(response.json())
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying LeagueSpot round matches {round_id}: {str(e)}")
-        return Response(
-            {"error": f"Failed to fetch round matches: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return cached_leaguespot_response(
+        request,
+        "round_matches",
+        f"v1/rounds/{round_id}/matches",
+        "Failed to fetch round matches",
+    )
 
 
 @api_view(["GET"])
 def proxy_leaguespot_match(request, match_id):
     """Proxy LeagueSpot match API to avoid CORS issues"""
-    headers = get_leaguespot_headers()
-
-    try:
-        response = requests.get(
-            f"https://api.leaguespot.gg/api/v2/matches/{match_id}",
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        return Response(response.json())
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying LeagueSpot match {match_id}: {str(e)}")
-        return Response(
-            {"error": f"Failed to fetch match data: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return cached_leaguespot_response(
+        request, "match", f"v2/matches/{match_id}", "Failed to fetch match data"
+    )
 
 
 @api_view(["GET"])
 def proxy_leaguespot_participants(request, match_id):
     """Proxy LeagueSpot match participants API to avoid CORS issues"""
-    headers = get_leaguespot_headers()
-    try:
-        response = requests.get(
-            f"https://api.leaguespot.gg/api/v1/matches/{match_id}/participants",
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        return Response(response.json())
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying LeagueSpot participants {match_id}: {str(e)}")
-        return Response(
-            {"error": f"Failed to fetch participants data: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return cached_leaguespot_response(
+        request,
+        "participants",
+        f"v1/matches/{match_id}/participants",
+        "Failed to fetch participants data",
+    )
 
 
 @api_view(["POST"])
@@ -3326,18 +3434,27 @@ def merge_teams(request):
     Expected request format:
     {
         "primary_team_id": "uuid",    // Team to keep
-        "secondary_team_id": "uuid"   // Team to merge into primary (will be deleted)
+        "secondary_team_id": "uuid",  // Team to merge into primary (will be deleted)
+        "dry_run": true,              // Optional - only report the rows it would change
+        "async": true                 // Optional - run as a background job
     }
 
-    This operation:
+    This operation, in one transaction (see cc.merging):
     1. Moves all players from secondary team to primary team
     2. Merges all participant records (preserving competition history)
-    3. Updates all matches to reference the primary team
+    3. Updates all matches, ranking items, Elo history and event wins to
+       reference the primary team
     4. Deletes the secondary team
     """
+    return run_or_enqueue(request, run_merge_teams)
+
+
+@job_handler("merge_teams")
+def run_merge_teams(data):
+    """Merge two teams as described by merge_teams request data."""
     try:
-        primary_team_id = request.data.get("primary_team_id")
-        secondary_team_id = request.data.get("secondary_team_id")
+        primary_team_id = data.get("primary_team_id")
+        secondary_team_id = data.get("secondary_team_id")
 
         if not primary_team_id or not secondary_team_id:
             return Response(
@@ -3368,187 +3485,30 @@ def merge_teams(request):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Count data before merge for response
-        players_to_move = Player.objects.filter(team=secondary_team).count()
-
-        # Start the merge process
-
-        # 1. Move all players from secondary team to primary team
-        players_moved = 0
-        for player in Player.objects.filter(team=secondary_team):
-            player.team = primary_team
-            player.save()
-            players_moved += 1
-            logger.info(
-                f"Moved player {player.name} from {secondary_team.name} to {primary_team.name}"
-            )
-
-        # 2. Merge participant records
-        participants_merged = 0
-        for secondary_participant in Participant.objects.filter(team=secondary_team):
-            # Check if primary team already has a participant for this competition/season
-            existing_participant = Participant.objects.filter(
-                team=primary_team,
-                competition=secondary_participant.competition,
-                season=secondary_participant.season,
-            ).first()
-
-            if existing_participant:
-                # Merge IDs from secondary participant into existing one
-                if (
-                    secondary_participant.faceit_id
-                    and not existing_participant.faceit_id
-                ):
-                    existing_participant.faceit_id = secondary_participant.faceit_id
-                if (
-                    secondary_participant.playfly_id
-                    and not existing_participant.playfly_id
-                ):
-                    existing_participant.playfly_id = secondary_participant.playfly_id
-                if (
-                    secondary_participant.playfly_participant_id
-                    and not existing_participant.playfly_participant_id
-                ):
-                    existing_participant.playfly_participant_id = (
-                        secondary_participant.playfly_participant_id
-                    )
-
-                existing_participant.save()
-                secondary_participant.delete()
-                comp_name = (
-                    secondary_participant.competition.name
-                    if secondary_participant.competition
-                    else "Unknown"
-                )
-                season_name = (
-                    secondary_participant.season.name
-                    if secondary_participant.season
-                    else "Unknown"
-                )
-                logger.info(f"Merged participant for {comp_name}/{season_name}")
-            else:
-                # Before transferring, check if there's already a participant with the same IDs
-                # that would cause a unique constraint violation
-                conflict_participant = None
-
-                # Check for faceit_id conflict
-                if secondary_participant.faceit_id:
-                    conflict_participant = (
-                        Participant.objects.filter(
-                            faceit_id=secondary_participant.faceit_id
-                        )
-                        .exclude(id=secondary_participant.id)
-                        .first()
-                    )
-
-                # Check for playfly_id conflict if no faceit conflict
-                if not conflict_participant and secondary_participant.playfly_id:
-                    conflict_participant = (
-                        Participant.objects.filter(
-                            playfly_id=secondary_participant.playfly_id
-                        )
-                        .exclude(id=secondary_participant.id)
-                        .first()
-                    )
-
-                # Check for playfly_participant_id conflict if no other conflicts
-                if (
-                    not conflict_participant
-                    and secondary_participant.playfly_participant_id
-                ):
-                    conflict_participant = (
-                        Participant.objects.filter(
-                            playfly_participant_id=secondary_participant.playfly_participant_id
-                        )
-                        .exclude(id=secondary_participant.id)
-                        .first()
-                    )
-
-                if conflict_participant:
-                    # There's a conflict - we need to clear the conflicting IDs before transfer
-                    logger.warning(
-                        f"Clearing conflicting IDs for participant transfer: "
-                        f"faceit_id={secondary_participant.faceit_id}, "
-                        f"playfly_id={secondary_participant.playfly_id}, "
-                        f"playfly_participant_id={secondary_participant.playfly_participant_id}"
-                    )
-
-                    # Clear the IDs that would cause conflicts
-                    if (
-                        conflict_participant.faceit_id
-                        == secondary_participant.faceit_id
-                    ):
-                        secondary_participant.faceit_id = None
-                    if (
-                        conflict_participant.playfly_id
-                        == secondary_participant.playfly_id
-                    ):
-                        secondary_participant.playfly_id = None
-                    if (
-                        conflict_participant.playfly_participant_id
-                        == secondary_participant.playfly_participant_id
-                    ):
-                        secondary_participant.playfly_participant_id = None
-
-                # Now transfer participant to primary team
-                secondary_participant.team = primary_team
-                secondary_participant.save()
-                comp_name = (
-                    secondary_participant.competition.name
-                    if secondary_participant.competition
-                    else "Unknown"
-                )
-                season_name = (
-                    secondary_participant.season.name
-                    if secondary_participant.season
-                    else "Unknown"
-                )
-                logger.info(f"Transferred participant for {comp_name}/{season_name}")
-
-            participants_merged += 1
-
-        # 3. Update all matches to reference primary team
-        matches_updated = 0
-
-        # Update matches where secondary team is team1
-        for match in Match.objects.filter(team1=secondary_team):
-            match.team1 = primary_team
-            match.save()
-            matches_updated += 1
-            logger.info(
-                f"Updated match {match.id} team1 from {secondary_team.name} to {primary_team.name}"
-            )
-
-        # Update matches where secondary team is team2
-        for match in Match.objects.filter(team2=secondary_team):
-            match.team2 = primary_team
-            match.save()
-            matches_updated += 1
-            logger.info(
-                f"Updated match {match.id} team2 from {secondary_team.name} to {primary_team.name}"
-            )
-
-        # Update matches where secondary team is the winner
-        for match in Match.objects.filter(winner=secondary_team):
-            match.winner = primary_team
-            match.save()
-            logger.info(
-                f"Updated match {match.id} winner from {secondary_team.name} to {primary_team.name}"
-            )
-
-        # 4. Store secondary team info for response, then delete it
         secondary_team_info = {
             "id": str(secondary_team.id),
             "name": secondary_team.name,
-            "player_count": players_to_move,
+            "player_count": Player.objects.filter(team=secondary_team).count(),
         }
 
-        secondary_team.delete()
-        logger.info(f"Deleted secondary team {secondary_team_info['name']}")
+        dry_run = bool(data.get("dry_run", False))
+        counts = merge_team(primary_team, secondary_team, dry_run=dry_run)
+
+        if dry_run:
+            message = (
+                f"Merging {secondary_team_info['name']} into {primary_team.name} "
+                f"would change the rows below"
+            )
+        else:
+            message = (
+                f"Successfully merged {secondary_team_info['name']} "
+                f"into {primary_team.name}"
+            )
 
         # Prepare response
         response_data = {
-            "message": f"Successfully merged {secondary_team_info['name']} into {primary_team.name}",
+            "message": message,
+            "dry_run": dry_run,
             "primary_team": {
                 "id": str(primary_team.id),
                 "name": primary_team.name,
@@ -3556,9 +3516,11 @@ def merge_teams(request):
             },
             "secondary_team": secondary_team_info,
             "merged_data": {
-                "players_moved": players_moved,
-                "participants_merged": participants_merged,
-                "matches_updated": matches_updated,
+                "players_moved": counts["players_moved"],
+                "participants_merged": counts["participants_moved"]
+                + counts["participants_merged"],
+                "matches_updated": counts["matches_team1"] + counts["matches_team2"],
+                **counts,
             },
         }
 
@@ -3572,24 +3534,65 @@ def merge_teams(request):
         )
 
 
+@api_view(["GET"])
+@firebase_auth_required(min_role="owner")
+def merge_candidates(request):
+    """
+    Pairs of teams that are likely duplicates, best first (see cc.duplicates)
+
+    Query parameters:
+    - min_score: Optional - lowest combined score to report (default 0.6)
+    - limit: Optional - maximum number of pairs to return (default 50)
+    """
+    try:
+        min_score = float(request.query_params.get("min_score", 0.6))
+        limit = min(int(request.query_params.get("limit", 50)), 500)
+    except ValueError:
+        return Response(
+            {"error": "min_score must be a number and limit an integer"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not 0 < min_score <= 1:
+        return Response(
+            {"error": "min_score must be between 0 and 1"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        return Response(
+            {"candidates": find_duplicate_teams(min_score=min_score, limit=limit)}
+        )
+    except Exception as e:
+        logger.error(f"Error finding merge candidates: {str(e)}")
+        return Response(
+            {"error": f"Failed to find merge candidates: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @api_view(["DELETE"])
 @firebase_auth_required(min_role="owner")
 def delete_competition(request, competition_id):
     """
     Delete a competition and all its related data.
-    This will remove all matches, participants, and the competition itself.
+    This will remove its matches (with their event matches and Elo history),
+    participants, events made up only of its matches, and the competition
+    itself (see cc.competition_deletion).
 
     WARNING: This is a destructive operation that cannot be undone.
 
     Expected request format:
     {
-        "security_key": "confirm-delete-competition-789" // Required security key
+        "security_key": "confirm-delete-competition-789", // Required security key
+        "dry_run": true  // Optional - only report the rows it would delete
     }
     """
     try:
+        dry_run = bool(request.data.get("dry_run", False))
+
         # Verify security key to prevent accidental deletion
         security_key = request.data.get("security_key")
-        if security_key != "confirm-delete-competition-789":
+        if not dry_run and security_key != "confirm-delete-competition-789":
             return Response(
                 {"error": "Invalid security key."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -3606,62 +3609,21 @@ def delete_competition(request, competition_id):
 
         competition_name = competition.name
 
-        # Delete in proper order to avoid foreign key constraint issues
-        # Note: Django's CASCADE should handle most of this automatically, but we'll be explicit
-
-        # 1. Delete EventMatches related to this competition
-        event_matches_deleted = 0
-        for season in Season.objects.filter(
-            participants__competition=competition
-        ).distinct():
-            for event in Event.objects.filter(season=season):
-                event_matches = EventMatch.objects.filter(event=event)
-                event_matches_deleted += event_matches.count()
-                event_matches.delete()
-
-        # 2. Delete Events related to this competition
-        events_deleted = 0
-        for season in Season.objects.filter(
-            participants__competition=competition
-        ).distinct():
-            events = Event.objects.filter(season=season)
-            events_deleted += events.count()
-            events.delete()
-
-        # 3. Delete Matches related to this competition
-        matches = Match.objects.filter(competition=competition)
-        matches_deleted = matches.count()
-        matches.delete()
-
-        # 4. Delete Participants related to this competition
-        participants = Participant.objects.filter(competition=competition)
-        participants_deleted = participants.count()
-        participants.delete()
-
-        # 5. Finally, delete the competition itself
-        competition.delete()
-
-        logger.info(f"Deleted competition '{competition_name}' and all related data")
+        if dry_run:
+            deleted_data = preview_deletion(plan_competition_deletion(competition))
+            message = f"Deleting competition '{competition_name}' would remove the rows below"
+        else:
+            deleted_data = purge_competition(competition)
+            message = f"Successfully deleted competition '{competition_name}' and all related data"
 
         return Response(
             {
-                "message": f"Successfully deleted competition '{competition_name}' and all related data",
+                "message": message,
+                "dry_run": dry_run,
                 "competition_name": competition_name,
                 "competition_id": str(competition_id),
-                "deleted_data": {
-                    "participants": participants_deleted,
-                    "matches": matches_deleted,
-                    "events": events_deleted,
-                    "event_matches": event_matches_deleted,
-                    "competition": 1,
-                },
-                "total_records_deleted": (
-                    participants_deleted
-                    + matches_deleted
-                    + events_deleted
-                    + event_matches_deleted
-                    + 1
-                ),
+                "deleted_data": deleted_data,
+                "total_records_deleted": sum(deleted_data.values()),
             }
         )
 
@@ -3750,7 +3712,7 @@ def proxy_nwes(request):
         nwes_api_url = "https://nwes.gg/api/api-tournament.php"
 
         # Make the request to NWES
-        response = requests.get(
+        response = http_client.get(
             nwes_api_url,
             params=query_params,
             timeout=30,
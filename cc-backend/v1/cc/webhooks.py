@@ -1,9 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-import requests
 from django.conf import settings
 
+from . import http_client
+
 
 class SanityWebhookView(APIView):
     authentication_classes = []
@@ -55,7 +56,7 @@ class SanityWebhookView(APIView):
                     {"error": "Discord webhook URL not configured."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            requests.post(self.webhook, json={"embeds": [embed]})
+            http_client.post(self.webhook, json={"embeds": [embed]})
 
             return Response({"status": "ok"}, status=status.HTTP_200_OK)
 
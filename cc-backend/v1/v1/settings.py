@@ -12,8 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 from dotenv import load_dotenv
 
@@ -35,6 +37,81 @@ DEBUG = os.getenv("DJANGO_DEBUG", "False") == "True"
 
 PLAYFLY_API_KEY = os.getenv("PLAYFLY_API_KEY", "")
 FACEIT_API_KEY = os.getenv("FACEIT_API_KEY", "")
+FACEIT_MAX_WORKERS = int(os.getenv("FACEIT_MAX_WORKERS", "8"))
+FACEIT_REQUESTS_PER_SECOND = float(os.getenv("FACEIT_REQUESTS_PER_SECOND", "10"))
+# How long Faceit player lookups made during imports are reused
+FACEIT_PLAYER_CACHE_SECONDS = int(os.getenv("FACEIT_PLAYER_CACHE_SECONDS", "21600"))
+
+# Concurrent remote fetches per platform when refreshing matches
+MATCH_UPDATE_CONCURRENCY = {
+    "faceit": int(os.getenv("FACEIT_MATCH_CONCURRENCY", "8")),
+    "leaguespot": int(os.getenv("LEAGUESPOT_MATCH_CONCURRENCY", "4")),
+    "regentsleague": int(os.getenv("REGENTSLEAGUE_MATCH_CONCURRENCY", "4")),
+}
+
+# poll_matches daemon: seconds between checks of live, upcoming (next 24h) and
+# far-off matches, and how many due matches are checked per batch
+MATCH_POLL_LIVE_SECONDS = int(os.getenv("MATCH_POLL_LIVE_SECONDS", "60"))
+MATCH_POLL_SOON_SECONDS = int(os.getenv("MATCH_POLL_SOON_SECONDS", "900"))
+MATCH_POLL_IDLE_SECONDS = int(os.getenv("MATCH_POLL_IDLE_SECONDS", "21600"))
+MATCH_POLL_BATCH_SIZE = int(os.getenv("MATCH_POLL_BATCH_SIZE", "50"))
+
+# Outbound HTTP client shared by the platform integrations (see cc.http_client)
+HTTP_TIMEOUT = (
+    float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+)
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+HTTP_CIRCUIT_FAILURES = int(os.getenv("HTTP_CIRCUIT_FAILURES", "5"))
+HTTP_CIRCUIT_RESET_SECONDS = float(os.getenv("HTTP_CIRCUIT_RESET_SECONDS", "30"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+# Hosts that keep a circuit breaker and stats; the least recently used go first
+HTTP_MAX_TRACKED_HOSTS = int(os.getenv("HTTP_MAX_TRACKED_HOSTS", "256"))
+
+# LeagueSpot proxy cache (see cc.proxy_cache): fresh seconds per resource, and
+# how long an expired copy may still be served when LeagueSpot is failing
+LEAGUESPOT_PROXY_TTLS = {
+    "season": int(os.getenv("LEAGUESPOT_SEASON_TTL", "600")),
+    "stage": int(os.getenv("LEAGUESPOT_STAGE_TTL", "300")),
+    "round_matches": int(os.getenv("LEAGUESPOT_ROUND_MATCHES_TTL", "60")),
+    "match": int(os.getenv("LEAGUESPOT_MATCH_TTL", "30")),
+    "participants": int(os.getenv("LEAGUESPOT_PARTICIPANTS_TTL", "30")),
+}
+LEAGUESPOT_PROXY_STALE_SECONDS = int(
+    os.getenv("LEAGUESPOT_PROXY_STALE_SECONDS", "86400")
+)
+
+# On-disk cache for the admin image proxy (see cc.image_cache); shared by the
+# workers of one host, revalidated with the origin after the given seconds
+IMAGE_PROXY_CACHE_DIR = os.getenv("IMAGE_PROXY_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), "cc-image-proxy"
+)
+IMAGE_PROXY_CACHE_MAX_BYTES = int(
+    os.getenv("IMAGE_PROXY_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+IMAGE_PROXY_REVALIDATE_SECONDS = int(
+    os.getenv("IMAGE_PROXY_REVALIDATE_SECONDS", "3600")
+)
+# Larger upstream images are refused rather than streamed and cached
+IMAGE_PROXY_MAX_DOWNLOAD_BYTES = int(
+    os.getenv("IMAGE_PROXY_MAX_DOWNLOAD_BYTES", str(20 * 1024 * 1024))
+)
+
+# Where uploaded pictures and their variants are stored (see cc.image_storage):
+# "firebase", or "local" to write them below IMAGE_STORAGE_LOCAL_DIR instead
+IMAGE_STORAGE_BACKEND = os.getenv("IMAGE_STORAGE_BACKEND", "firebase")
+IMAGE_STORAGE_LOCAL_DIR = os.getenv("IMAGE_STORAGE_LOCAL_DIR") or str(
+    BASE_DIR / "media"
+)
+IMAGE_STORAGE_LOCAL_URL = os.getenv("IMAGE_STORAGE_LOCAL_URL", "/media/")
+
+# Background jobs (see cc.jobs); ADMIN_JOBS_ASYNC makes "async" the default
+ADMIN_JOBS_ASYNC = os.getenv("ADMIN_JOBS_ASYNC", "False") == "True"
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "14"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))
 NWES_API_KEY = os.getenv("NWES_API_KEY", "")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 
@@ -52,6 +129,9 @@ else:
         "https://www.regentsleague.com",
     ]
 
+# Lets the admin UI force a refetch through the LeagueSpot proxy cache
+CORS_ALLOW_HEADERS = (*default_headers, "x-proxy-refresh")
+
 
 # Application definition
 
@@ -129,6 +209,39 @@ WSGI_APPLICATION = "v1.wsgi.application"
 DATABASES = {"default": dj_database_url.config(default=os.getenv("DATABASE_URL"))}
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Local memory is per gunicorn worker; set PUBLIC_API_CACHE_BACKEND=file to
+# share cached public responses between workers. Invalidation is always shared
+# through the DataVersion table.
+PUBLIC_API_CACHE_ENABLED = os.getenv("PUBLIC_API_CACHE_ENABLED", "True") == "True"
+PUBLIC_API_CACHE_TIMEOUT = int(os.getenv("PUBLIC_API_CACHE_TIMEOUT", "300"))
+
+if os.getenv("PUBLIC_API_CACHE_BACKEND", "locmem") == "file":
+    PUBLIC_API_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "PUBLIC_API_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "cc-public-api-cache"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+else:
+    PUBLIC_API_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "cc-public-api",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "public_api": PUBLIC_API_CACHE,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
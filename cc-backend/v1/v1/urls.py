@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
@@ -22,3 +24,9 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("v1/", include("cc.urls")),  # Include the URLs from the cc app
 ]
+
+# Serves pictures stored by the local image storage backend (DEBUG only)
+if settings.IMAGE_STORAGE_BACKEND == "local":
+    urlpatterns += static(
+        settings.IMAGE_STORAGE_LOCAL_URL, document_root=settings.IMAGE_STORAGE_LOCAL_DIR
+    )
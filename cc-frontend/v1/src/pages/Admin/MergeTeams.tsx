@@ -5,7 +5,7 @@ import { Label } from "@/components/ui/label";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription } from "@/components/ui/alert";
 import { SearchSelect } from "@/components/SearchSelect";
-import { useTeams } from "@/services/hooks";
+import { useMergeCandidates, useTeams } from "@/services/hooks";
 import { mergeTeams } from "@/services/api";
 import { AlertTriangle, Users, ArrowRight, CheckCircle } from "lucide-react";
 
@@ -38,6 +38,7 @@ function MergeTeams() {
 
   const { data: teamsData } = useTeams();
   const teams: any[] = teamsData || [];
+  const { data: candidates, refetch: refetchCandidates } = useMergeCandidates();
 
   // Create options for SearchSelect
   const teamOptions = teams.map((team: any) => ({
@@ -78,6 +79,7 @@ function MergeTeams() {
       });
 
       setResult(data);
+      refetchCandidates();
 
       // Reset form
       setPrimaryTeamId("");
@@ -278,6 +280,47 @@ function MergeTeams() {
         </Card>
       </div>
 
+      {/* Suggested merges */}
+      {candidates && candidates.length > 0 && (
+        <Card>
+          <CardHeader>
+            <CardTitle>Possible Duplicates</CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="space-y-2">
+              {candidates.map((candidate) => (
+                <div
+                  key={`${candidate.primary_team.id}-${candidate.secondary_team.id}`}
+                  className="flex items-center justify-between gap-4 rounded border p-3 text-sm"
+                >
+                  <div>
+                    <p className="font-medium">
+                      {candidate.primary_team.name} /{" "}
+                      {candidate.secondary_team.name}
+                    </p>
+                    <p className="text-gray-500">
+                      Score {Math.round(candidate.score * 100)}% (name{" "}
+                      {Math.round(candidate.name_score * 100)}%, roster{" "}
+                      {Math.round(candidate.roster_score * 100)}%)
+                    </p>
+                  </div>
+                  <Button
+                    variant="outline"
+                    size="sm"
+                    onClick={() => {
+                      setPrimaryTeamId(candidate.primary_team.id);
+                      setSecondaryTeamId(candidate.secondary_team.id);
+                    }}
+                  >
+                    Select
+                  </Button>
+                </div>
+              ))}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Merge Button */}
       <div className="flex justify-center">
         <Button
@@ -1,6 +1,5 @@
 import { api } from "./api-config";
 import type { Team, Player } from "./api";
-import { getStorage, ref, uploadBytes, getDownloadURL } from "firebase/storage";
 
 // Team creation from Faceit
 export interface ImportTeamFromFaceitRequest {
@@ -31,6 +30,11 @@ export const importTeamFromFaceit = async (
   return response.data;
 };
 
+export interface PictureUploadResponse {
+  picture_url: string;
+  picture_variants: Record<string, string>;
+}
+
 // Team update and image upload functions
 export const updateTeam = async (
   teamId: string,
@@ -52,29 +56,24 @@ export const uploadTeamPicture = async (
     school_name?: string;
     elo?: number;
   }
-): Promise<{picture_url: string}> => {
+): Promise<PictureUploadResponse> => {
   try {
-    // Upload to Firebase Storage
-    const storage = getStorage();
-    const fileExtension = pictureFile.name.split('.').pop() || 'jpg';
-    const fileName = `teams/${teamId}_${Date.now()}.${fileExtension}`;
-    const storageRef = ref(storage, fileName);
-    
-    // Upload the file
-    await uploadBytes(storageRef, pictureFile);
-    
-    // Get the download URL
-    const downloadURL = await getDownloadURL(storageRef);
-    
-    // Send the URL and any additional data to the backend
-    const updateData = {
-      picture: downloadURL,
-      ...additionalData
+    // The backend stores the picture and generates its size variants
+    const formData = new FormData();
+    formData.append('picture', pictureFile);
+    const response = await api.post(`/teams/${teamId}/picture/`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+
+    // Send any additional data to the backend
+    if (additionalData && Object.keys(additionalData).length > 0) {
+      await api.put(`/teams/${teamId}/`, additionalData);
+    }
+
+    return {
+      picture_url: response.data.picture_url,
+      picture_variants: response.data.picture_variants,
     };
-    
-    await api.put(`/teams/${teamId}/`, updateData);
-    
-    return { picture_url: downloadURL };
   } catch (error) {
     console.error('Error uploading team picture:', error);
     throw error;
@@ -112,29 +111,24 @@ export const uploadPlayerPicture = async (
     benched?: boolean;
     visible?: boolean;
   }
-): Promise<{picture_url: string}> => {
+): Promise<PictureUploadResponse> => {
   try {
-    // Upload to Firebase Storage
-    const storage = getStorage();
-    const fileExtension = pictureFile.name.split('.').pop() || 'jpg';
-    const fileName = `players/${playerId}_${Date.now()}.${fileExtension}`;
-    const storageRef = ref(storage, fileName);
-    
-    // Upload the file
-    await uploadBytes(storageRef, pictureFile);
-    
-    // Get the download URL
-    const downloadURL = await getDownloadURL(storageRef);
-    
-    // Send the URL and any additional data to the backend
-    const updateData = {
-      picture: downloadURL,
-      ...additionalData
+    // The backend stores the picture and generates its size variants
+    const formData = new FormData();
+    formData.append('picture', pictureFile);
+    const response = await api.post(`/players/${playerId}/picture/`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+
+    // Send any additional data to the backend
+    if (additionalData && Object.keys(additionalData).length > 0) {
+      await api.put(`/players/${playerId}/`, additionalData);
+    }
+
+    return {
+      picture_url: response.data.picture_url,
+      picture_variants: response.data.picture_variants,
     };
-    
-    await api.put(`/players/${playerId}/`, updateData);
-    
-    return { picture_url: downloadURL };
   } catch (error) {
     console.error('Error uploading player picture:', error);
     throw error;
@@ -55,6 +55,7 @@ export interface Team {
   id: string;
   name: string;
   picture?: string;
+  picture_variants?: Record<string, string>;
   school_name?: string;
   elo: number;
   captain?: Player;
@@ -64,6 +65,7 @@ export interface Player {
   id: string;
   name: string;
   picture?: string;
+  picture_variants?: Record<string, string>;
   skill_level: number;
   steam_id?: string;
   faceit_id?: string;
@@ -145,6 +147,29 @@ export interface ParticipantMatchRequest {
   team_id: string;
 }
 
+export interface TeamSuggestion {
+  team_id: string;
+  team_name: string;
+  school_name: string | null;
+  picture: string | null;
+  score: number;
+  name_score: number;
+  shared_ids: string[];
+}
+
+export interface ParticipantSuggestions extends Participant {
+  regentsleague_id?: number;
+  suggestions: TeamSuggestion[];
+}
+
+export interface ParticipantSuggestionsParams {
+  competition_id?: string;
+  season_id?: string;
+  limit?: number;
+  page?: number;
+  page_size?: number;
+}
+
 /*
 
 ADMIN API FUNCTIONS
@@ -235,6 +260,13 @@ export const matchParticipant = async (
   return response.data;
 };
 
+export const fetchParticipantSuggestions = async (
+  params: ParticipantSuggestionsParams = {},
+): Promise<PaginatedResponse<ParticipantSuggestions>> => {
+  const response = await api.get(`/participants/suggestions/`, { params });
+  return response.data;
+};
+
 // Database clearing API function
 export const clearDatabase = async (
   securityKey: string,
@@ -261,6 +293,7 @@ export interface CompetitionsResponse {
 
 export interface DeleteCompetitionResponse {
   message: string;
+  dry_run: boolean;
   competition_name: string;
   competition_id: string;
   deleted_data: {
@@ -268,6 +301,8 @@ export interface DeleteCompetitionResponse {
     matches: number;
     events: number;
     event_matches: number;
+    elo_history: number;
+    custom_events: number;
     competition: number;
   };
   total_records_deleted: number;
@@ -297,10 +332,12 @@ export const createCompetition = async (
 export const deleteCompetition = async (
   competitionId: string,
   securityKey: string,
+  dryRun = false,
 ): Promise<DeleteCompetitionResponse> => {
   const response = await api.delete(`/competitions/${competitionId}/`, {
     data: {
       security_key: securityKey,
+      dry_run: dryRun,
     },
   });
   return response.data;
@@ -320,6 +357,12 @@ export interface TeamEloResponse {
   only_default_elo?: boolean;
   default_elo_value?: number;
   total_teams_processed?: number;
+  timings?: {
+    load_seconds: number;
+    compute_seconds: number;
+    write_seconds: number;
+    total_seconds: number;
+  };
 }
 
 export interface RecalculateEloResponse {
@@ -898,10 +941,12 @@ export const fetchAdminMatches = async (): Promise<Match[]> => {
 export interface MergeTeamsRequest {
   primary_team_id: string;
   secondary_team_id: string;
+  dry_run?: boolean;
 }
 
 export interface MergeTeamsResponse {
   message: string;
+  dry_run: boolean;
   primary_team: {
     id: string;
     name: string;
@@ -916,6 +961,14 @@ export interface MergeTeamsResponse {
     players_moved: number;
     participants_merged: number;
     matches_updated: number;
+    participants_moved: number;
+    matches_team1: number;
+    matches_team2: number;
+    matches_won: number;
+    ranking_items_moved: number;
+    ranking_items_dropped: number;
+    elo_history_moved: number;
+    events_won: number;
   };
 }
 
@@ -926,6 +979,30 @@ export const mergeTeams = async (
   return response.data;
 };
 
+export interface MergeCandidateTeam {
+  id: string;
+  name: string;
+  school_name: string | null;
+  elo: number;
+  player_count: number;
+}
+
+export interface MergeCandidate {
+  primary_team: MergeCandidateTeam;
+  secondary_team: MergeCandidateTeam;
+  score: number;
+  name_score: number;
+  school_score: number;
+  roster_score: number;
+}
+
+export const fetchMergeCandidates = async (
+  params: { min_score?: number; limit?: number } = {},
+): Promise<MergeCandidate[]> => {
+  const response = await api.get(`/merge-teams/candidates/`, { params });
+  return response.data.candidates;
+};
+
 // Match management API interfaces
 export interface CreateMatchRequest {
   team1_id: string;
@@ -11,6 +11,7 @@ import {
   fetchAdminTeams,
   fetchAdminPlayers,
   fetchAdminMatches,
+  fetchMergeCandidates,
   fetchPublicTeamRanking,
   fetchAdminCustomEvents,
   fetchAdminCustomEvent,
@@ -198,6 +199,15 @@ export function useAdminMatches(options = {}) {
   });
 }
 
+export function useMergeCandidates(options = {}) {
+  return useQuery({
+    queryKey: ['admin', 'merge-candidates'],
+    queryFn: () => fetchMergeCandidates(),
+    staleTime: DEFAULT_STALE_TIME,
+    ...options,
+  });
+}
+
 // Legacy compatibility
 export const useTeams = useAdminTeams;
 